@@ -1,24 +1,47 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from dotenv import load_dotenv
 
 # RELATIVE IMPORTS
 from . import models, schemas
-from .database import get_db
+from .database import get_async_db
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY", "FALLBACK_DEV_KEY_ONLY_CHANGE_ME_IN_PROD")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
+# how long a user's token_version is trusted before it is re-read (bounds revocation delay)
+TOKEN_VERSION_TTL = float(os.getenv("TOKEN_VERSION_TTL", "60"))
+TOKEN_VERSION_CACHE_SIZE = 10000
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# hashes below BCRYPT_ROUNDS are re-hashed transparently on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+# bcrypt gets its own small pool so a burst of logins cannot take over the request threadpool;
+# callers beyond PASSWORD_HASH_QUEUE waiting verifications are turned away with 503
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+_hash_pending = 0
+_hash_pending_lock = threading.Lock()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
@@ -31,6 +54,33 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+async def _run_hashing(fn, *args):
+    global _hash_pending
+    with _hash_pending_lock:
+        if _hash_pending >= PASSWORD_HASH_QUEUE:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent logins, please retry",
+                headers={"Retry-After": "1"},
+            )
+        _hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        with _hash_pending_lock:
+            _hash_pending -= 1
+
+
+async def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """(valid, replacement hash or None); runs on the hashing pool, off the event loop."""
+    return await _run_hashing(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def dummy_verify():
+    """Spend the same time as a real check so unknown emails are not distinguishable by latency."""
+    await _run_hashing(pwd_context.dummy_verify)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -38,8 +88,74 @@ def create_access_token(data: dict):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# --- PRINCIPAL ---
+class Principal:
+    """
+    The authenticated user as carried by a verified token. Exposes the same
+    attributes the permission helpers read from models.User.
+    """
+    __slots__ = ("id", "email", "role", "lecturer_id", "token_version")
+
+    def __init__(self, id: int, email: str, role: str, lecturer_id: Optional[int], token_version: int):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.lecturer_id = lecturer_id
+        self.token_version = token_version
+
+
+def token_claims(user: models.User) -> dict:
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "ver": user.token_version or 0,
+        "role": user.role,
+        "lecturer_id": user.lecturer_id if user.lecturer_id is not None else 0,
+    }
+
+
+# --- TOKEN VERSION CACHE ---
+_token_versions: Dict[int, Tuple[int, float]] = {}
+_token_versions_lock = threading.Lock()
+
+
+def _remember_version(user_id: int, version: int):
+    with _token_versions_lock:
+        if len(_token_versions) >= TOKEN_VERSION_CACHE_SIZE:
+            # drop the oldest half; entries are cheap to re-read
+            for k, _ in sorted(_token_versions.items(), key=lambda kv: kv[1][1])[: TOKEN_VERSION_CACHE_SIZE // 2]:
+                _token_versions.pop(k, None)
+        _token_versions[user_id] = (version, time.monotonic())
+
+
+async def current_token_version(db: AsyncSession, user_id: int) -> Optional[int]:
+    hit = _token_versions.get(user_id)
+    if hit and time.monotonic() - hit[1] < TOKEN_VERSION_TTL:
+        return hit[0]
+    row = (await db.execute(select(models.User.token_version).where(models.User.id == user_id))).first()
+    if row is None:
+        with _token_versions_lock:
+            _token_versions.pop(user_id, None)
+        return None
+    _remember_version(user_id, row[0] or 0)
+    return row[0] or 0
+
+
+async def revoke_tokens(db: AsyncSession, user_id: int) -> int:
+    """Invalidates every token issued to the user so far; other instances notice within TOKEN_VERSION_TTL."""
+    user = await db.get(models.User, user_id)
+    if user is None:
+        return 0
+    user.token_version = (user.token_version or 0) + 1
+    await db.commit()
+    _remember_version(user.id, user.token_version)
+    return user.token_version
+
+
 # --- DEPENDENCY: Get Current User ---
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    # async so that sync routes do not spend a threadpool slot on authentication;
+    # the session only connects when the token version has to be re-read
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -53,7 +169,21 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(models.User).filter(models.User.email == email).first()
+    # fast path: the signed claims are the principal, only the revocation counter is checked
+    user_id, version = payload.get("uid"), payload.get("ver")
+    if isinstance(user_id, int) and isinstance(version, int):
+        if await current_token_version(db, user_id) != version:
+            raise credentials_exception
+        return Principal(
+            id=user_id,
+            email=email,
+            role=payload.get("role") or "",
+            lecturer_id=payload.get("lecturer_id") or None,
+            token_version=version,
+        )
+
+    # tokens issued before uid/ver claims existed
+    user = (await db.execute(select(models.User).where(models.User.email == email))).scalars().first()
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
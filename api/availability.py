@@ -0,0 +1,126 @@
+# api/availability.py
+"""
+Compiled lecturer availability.
+
+LecturerAvailability.schedule_data ({"Monday": {"is_available", "ranges": [{start, end}]}})
+is compiled once into a WeekMask: a 7 x 96 bit minute-of-week bitmap at 15 minute
+resolution held in a single Python int, so intersect / union / contains are one
+bitwise operation over the whole week instead of re-parsing "HH:MM" strings.
+
+Compiled masks are cached per availability row and version: every UPDATE bumps
+LecturerAvailability.version in SQL, so a read compares two ints instead of the
+schedule, and writes on another instance are picked up on the next read.
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+from . import models
+from .timeutils import DAYS, to_minutes
+
+RESOLUTION = 15
+SLOTS_PER_DAY = 24 * 60 // RESOLUTION
+WEEK_BITS = SLOTS_PER_DAY * len(DAYS)
+
+
+class WeekMask:
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    @classmethod
+    def full(cls) -> "WeekMask":
+        return cls((1 << WEEK_BITS) - 1)
+
+    @classmethod
+    def slot(cls, day: int, start: int, end: int) -> "WeekMask":
+        """Every quarter hour touched by [start, end) on `day` (minutes after midnight)."""
+        first = start // RESOLUTION
+        last = -(-end // RESOLUTION)  # ceil
+        return cls(_span(day, first, last))
+
+    @classmethod
+    def from_schedule(cls, schedule_data) -> "WeekMask":
+        """Only fully covered quarter hours count as available; no data means no restriction."""
+        if not schedule_data or not isinstance(schedule_data, dict):
+            return cls.full()
+        bits = 0
+        for day, name in enumerate(DAYS):
+            day_data = schedule_data.get(name)
+            if not isinstance(day_data, dict) or not day_data.get("is_available"):
+                continue
+            for r in day_data.get("ranges") or []:
+                start, end = to_minutes((r or {}).get("start")), to_minutes((r or {}).get("end"))
+                if start is None or end is None:
+                    continue
+                first = -(-start // RESOLUTION)
+                last = end // RESOLUTION
+                if last > first:
+                    bits |= _span(day, first, last)
+        return cls(bits)
+
+    def __and__(self, other: "WeekMask") -> "WeekMask":
+        return WeekMask(self.bits & other.bits)
+
+    def __or__(self, other: "WeekMask") -> "WeekMask":
+        return WeekMask(self.bits | other.bits)
+
+    def __invert__(self) -> "WeekMask":
+        return WeekMask(~self.bits & ((1 << WEEK_BITS) - 1))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WeekMask) and self.bits == other.bits
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def intersect(self, other: "WeekMask") -> "WeekMask":
+        return self & other
+
+    def union(self, other: "WeekMask") -> "WeekMask":
+        return self | other
+
+    def contains(self, other: "WeekMask") -> bool:
+        return self.bits & other.bits == other.bits
+
+    def overlaps(self, other: "WeekMask") -> bool:
+        return self.bits & other.bits != 0
+
+    def day_bits(self, day: int) -> int:
+        return (self.bits >> (day * SLOTS_PER_DAY)) & ((1 << SLOTS_PER_DAY) - 1)
+
+
+def _span(day: int, first: int, last: int) -> int:
+    first = max(0, min(first, SLOTS_PER_DAY))
+    last = max(first, min(last, SLOTS_PER_DAY))
+    return ((1 << (last - first)) - 1) << (day * SLOTS_PER_DAY + first)
+
+
+# ---------------------------------------------------------
+# Per-row cache
+# ---------------------------------------------------------
+
+_cache: Dict[int, Tuple[int, WeekMask]] = {}
+_cache_lock = threading.Lock()
+
+
+def compile_row(row: models.LecturerAvailability) -> WeekMask:
+    """Compile and cache; called on write (after the refresh that loads the new version) so readers find it ready."""
+    mask = WeekMask.from_schedule(row.schedule_data)
+    with _cache_lock:
+        _cache[row.id] = (row.version, mask)
+    return mask
+
+
+def mask_for(row: Optional[models.LecturerAvailability]) -> WeekMask:
+    if row is None:
+        return WeekMask.full()
+    cached = _cache.get(row.id)
+    if cached and cached[0] == row.version:
+        return cached[1]
+    return compile_row(row)
+
+
+def forget(row_id: int):
+    with _cache_lock:
+        _cache.pop(row_id, None)
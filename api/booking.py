@@ -0,0 +1,157 @@
+# api/booking.py
+"""
+Room / lecturer double-booking checks for schedule writes.
+
+Overlap lookups run against the composite indexes declared on ScheduleEntry and
+OfferedModule, so a check is an index range scan over one room's (or one
+lecturer's) entries on one day rather than a scan of schedule_entries. Times are
+stored as zero-padded "HH:MM", which makes string comparison chronological.
+"""
+import bisect
+import zlib
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import models
+from .timeutils import DAYS, day_index, to_minutes, fmt_minutes
+
+
+def normalize_slot(day_of_week: str, start_time: str, end_time: str) -> Tuple[str, str, str]:
+    day = day_index(day_of_week)
+    if day is None:
+        raise HTTPException(status_code=400, detail=f"Invalid day_of_week: {day_of_week}")
+    start, end = to_minutes(start_time), to_minutes(end_time)
+    if start is None or end is None:
+        raise HTTPException(status_code=400, detail="Times must be given as HH:MM")
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end_time must be after start_time")
+    return DAYS[day], fmt_minutes(start), fmt_minutes(end)
+
+
+def lock_semester(db: Session, semester: str):
+    """
+    Serialise schedule writes of one semester until the transaction ends, so two
+    planners cannot both pass the overlap check for the same slot. Postgres only;
+    the local SQLite fallback already serialises writers.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        key = zlib.crc32(f"schedule:{semester}".encode("utf-8"))
+        db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": key})
+
+
+def find_conflict(
+    db: Session,
+    semester: str,
+    day_of_week: str,
+    start_time: str,
+    end_time: str,
+    room_id: Optional[int] = None,
+    lecturer_id: Optional[int] = None,
+    exclude_id: Optional[int] = None,
+) -> Optional[Tuple[str, models.ScheduleEntry]]:
+    E = models.ScheduleEntry
+
+    def overlapping(query):
+        query = query.filter(
+            E.semester == semester,
+            E.day_of_week == day_of_week,
+            E.start_time < end_time,
+            E.end_time > start_time,
+        )
+        if exclude_id is not None:
+            query = query.filter(E.id != exclude_id)
+        return query.first()
+
+    if room_id is not None:
+        hit = overlapping(db.query(E).filter(E.room_id == room_id))
+        if hit:
+            return "room", hit
+
+    if lecturer_id is not None:
+        hit = overlapping(
+            db.query(E)
+            .join(models.OfferedModule, models.OfferedModule.id == E.offered_module_id)
+            .filter(models.OfferedModule.lecturer_id == lecturer_id, models.OfferedModule.semester == semester)
+        )
+        if hit:
+            return "lecturer", hit
+
+    return None
+
+
+def raise_on_conflict(db: Session, semester: str, day_of_week: str, start_time: str, end_time: str,
+                      room_id: Optional[int] = None, lecturer_id: Optional[int] = None,
+                      exclude_id: Optional[int] = None):
+    conflict = find_conflict(db, semester, day_of_week, start_time, end_time, room_id, lecturer_id, exclude_id)
+    if conflict:
+        kind, hit = conflict
+        raise HTTPException(
+            status_code=409,
+            detail=f"{kind.capitalize()} already booked on {hit.day_of_week} "
+                   f"{hit.start_time}-{hit.end_time} (entry {hit.id})",
+        )
+
+
+class SlotIndex:
+    """
+    In-memory interval index for validating a batch of writes against the stored
+    entries of its semester(s) and against each other without a query per row.
+    Per (resource, semester, day) the booked time is kept as sorted, disjoint
+    intervals (overlapping or touching bookings are merged on add), so the only
+    interval that can overlap [start, end) is the last one starting before end:
+    a lookup is one bisect.
+    """
+
+    def __init__(self):
+        self._intervals = {}
+
+    def _overlaps(self, key, start_time: str, end_time: str) -> bool:
+        intervals = self._intervals.get(key)
+        if not intervals:
+            return False
+        pos = bisect.bisect_left(intervals, (end_time,))
+        return pos > 0 and intervals[pos - 1][1] > start_time
+
+    def _insert(self, key, start_time: str, end_time: str):
+        intervals = self._intervals.setdefault(key, [])
+        lo = bisect.bisect_left(intervals, (start_time,))
+        if lo > 0 and intervals[lo - 1][1] >= start_time:
+            lo -= 1
+            start_time = intervals[lo][0]
+        hi = lo
+        while hi < len(intervals) and intervals[hi][0] <= end_time:
+            end_time = max(end_time, intervals[hi][1])
+            hi += 1
+        intervals[lo:hi] = [(start_time, end_time)]
+
+    def conflict(self, semester: str, day_of_week: str, start_time: str, end_time: str,
+                 room_id: Optional[int] = None, lecturer_id: Optional[int] = None) -> Optional[str]:
+        if room_id is not None and self._overlaps(("room", room_id, semester, day_of_week), start_time, end_time):
+            return "room"
+        if lecturer_id is not None and self._overlaps(("lecturer", lecturer_id, semester, day_of_week), start_time, end_time):
+            return "lecturer"
+        return None
+
+    def add(self, semester: str, day_of_week: str, start_time: str, end_time: str,
+            room_id: Optional[int] = None, lecturer_id: Optional[int] = None):
+        if room_id is not None:
+            self._insert(("room", room_id, semester, day_of_week), start_time, end_time)
+        if lecturer_id is not None:
+            self._insert(("lecturer", lecturer_id, semester, day_of_week), start_time, end_time)
+
+    @classmethod
+    def for_semesters(cls, db: Session, semesters) -> "SlotIndex":
+        index = cls()
+        E = models.ScheduleEntry
+        rows = (
+            db.query(E.semester, E.day_of_week, E.start_time, E.end_time, E.room_id, models.OfferedModule.lecturer_id)
+            .outerjoin(models.OfferedModule, models.OfferedModule.id == E.offered_module_id)
+            .filter(E.semester.in_(list(semesters)))
+            .all()
+        )
+        for semester, day, start, end, room_id, lecturer_id in rows:
+            index.add(semester, day, start, end, room_id, lecturer_id)
+        return index
@@ -0,0 +1,266 @@
+# api/constraint_compiler.py
+"""
+Compiles SchedulerConstraint rows into typed predicate objects.
+
+ConstraintOverview.jsx stores constraints as generated sentences in rule_text
+("The University is open from 08:00 to 20:00.", "Room "A1" is unavailable on
+Fridays.", ...). compile_constraint() parses that text once per (id, updated_at)
+into a CompiledConstraint subclass whose fields carry the structured values and
+whose allows(placement) answers whether a concrete session placement satisfies it.
+Categories without a machine-readable form (Custom, unparseable text) compile to
+Unstructured, which allows everything.
+"""
+import re
+import threading
+from dataclasses import dataclass, asdict
+from datetime import date
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from . import models
+from .timeutils import day_index, to_minutes
+
+# University-scope target ids ConstraintOverview.jsx uses for campuses
+CAMPUS_TARGETS = {"10000": "Berlin", "10001": "Düsseldorf", "10002": "Munich"}
+
+
+@dataclass(frozen=True)
+class Placement:
+    """One session as the predicates see it; unknown fields stay None."""
+    day: int
+    start: int
+    end: int
+    room_id: Optional[int] = None
+    room_location: Optional[str] = None
+    lecturer_id: Optional[int] = None
+    module_code: Optional[str] = None
+    program_id: Optional[int] = None
+    group_id: Optional[int] = None
+    on: Optional[date] = None  # concrete calendar date, for date-bound rules
+
+
+@dataclass(frozen=True)
+class CompiledConstraint:
+    id: int
+    category: str
+    scope: str  # lowercase: university, lecturer, module, group, room, program
+    target: Optional[str]  # None = every target in scope
+    valid_from: Optional[date]
+    valid_to: Optional[date]
+
+    @property
+    def kind(self) -> str:
+        return type(self).__name__
+
+    def is_global(self) -> bool:
+        return self.scope == "university" and self.target is None
+
+    def active_on(self, d: date) -> bool:
+        return (self.valid_from is None or self.valid_from <= d) and (self.valid_to is None or d <= self.valid_to)
+
+    def active_between(self, start: Optional[date], end: Optional[date]) -> bool:
+        if start is not None and self.valid_to is not None and self.valid_to < start:
+            return False
+        if end is not None and self.valid_from is not None and self.valid_from > end:
+            return False
+        return True
+
+    def targets(self, p: Placement) -> bool:
+        if self.target is None:
+            return True
+        if self.scope == "university":
+            campus = CAMPUS_TARGETS.get(self.target, self.target)
+            return bool(p.room_location) and campus.lower() in p.room_location.lower()
+        value = {
+            "lecturer": p.lecturer_id,
+            "module": p.module_code,
+            "room": p.room_id,
+            "program": p.program_id,
+            "group": p.group_id,
+        }.get(self.scope)
+        return value is not None and str(value) == self.target
+
+    def allows(self, p: Placement) -> bool:
+        if not self.targets(p):
+            return True
+        if p.on is not None and not self.active_on(p.on):
+            return True
+        return self.check(p)
+
+    def check(self, p: Placement) -> bool:
+        return True
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["kind"] = self.kind
+        for k, v in data.items():
+            if isinstance(v, frozenset):
+                data[k] = sorted(v)
+        return data
+
+
+@dataclass(frozen=True)
+class OpenDays(CompiledConstraint):
+    days: FrozenSet[int]
+
+    def check(self, p: Placement) -> bool:
+        return p.day in self.days
+
+
+@dataclass(frozen=True)
+class OpeningHours(CompiledConstraint):
+    opens: int
+    closes: int
+
+    def check(self, p: Placement) -> bool:
+        return self.opens <= p.start and p.end <= self.closes
+
+
+@dataclass(frozen=True)
+class SlotGrid(CompiledConstraint):
+    """Shapes candidate generation (slot length + break) rather than rejecting placements."""
+    slot_minutes: int
+    break_minutes: int
+
+
+@dataclass(frozen=True)
+class Holiday(CompiledConstraint):
+    name: str
+
+    def allows(self, p: Placement) -> bool:
+        # the validity window *is* the holiday, so it blocks rather than enables
+        if p.on is None or not self.targets(p):
+            return True
+        return not self.active_on(p.on)
+
+
+@dataclass(frozen=True)
+class FixedDuration(CompiledConstraint):
+    minutes: int
+
+    def check(self, p: Placement) -> bool:
+        return p.end - p.start == self.minutes
+
+
+@dataclass(frozen=True)
+class UnavailableDays(CompiledConstraint):
+    days: FrozenSet[int]
+
+    def check(self, p: Placement) -> bool:
+        return p.day not in self.days
+
+
+@dataclass(frozen=True)
+class DeliveryMode(CompiledConstraint):
+    mode: str  # onsite, online, hybrid
+
+
+@dataclass(frozen=True)
+class Unstructured(CompiledConstraint):
+    rule_text: str
+
+
+# ---------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------
+
+def _norm(s) -> str:
+    return (str(s) if s is not None else "").strip().lower()
+
+
+def _parse(row: models.SchedulerConstraint, base: dict) -> CompiledConstraint:
+    category = _norm(row.category)
+    text = row.rule_text or ""
+
+    if category == "university open days":
+        m = re.search(r"open on:\s*(.*)", text, re.IGNORECASE)
+        if m:
+            days = frozenset(d for d in (day_index(x) for x in m.group(1).rstrip(". ").split(",")) if d is not None)
+            if days:
+                return OpenDays(**base, days=days)
+
+    elif category == "university policy":
+        m = re.search(r"from\s+(\d{1,2}:\d{2})\s+to\s+(\d{1,2}:\d{2})", text, re.IGNORECASE)
+        if m:
+            opens, closes = to_minutes(m.group(1)), to_minutes(m.group(2))
+            if opens is not None and closes is not None and opens < closes:
+                return OpeningHours(**base, opens=opens, closes=closes)
+
+    elif category == "time definition":
+        m = re.search(r"(\d+)\s*minutes long with a\s*(\d+)\s*minute break", text, re.IGNORECASE)
+        if m and int(m.group(1)) > 0:
+            return SlotGrid(**base, slot_minutes=int(m.group(1)), break_minutes=int(m.group(2)))
+
+    elif category == "holiday":
+        m = re.search(r"Holiday\s+'([^']*)'", text, re.IGNORECASE)
+        if row.valid_from or row.valid_to:
+            return Holiday(**base, name=m.group(1) if m else (row.name or "Holiday"))
+
+    elif category == "duration":
+        m = re.search(r"duration of\s*(\d+)\s*minutes", text, re.IGNORECASE)
+        if m and int(m.group(1)) > 0:
+            return FixedDuration(**base, minutes=int(m.group(1)))
+
+    elif category == "unavailable days":
+        m = re.search(r"unavailable on\s+([A-Za-z]+)", text, re.IGNORECASE)
+        day = day_index(m.group(1).rstrip("s")) if m else None
+        if day is not None:
+            return UnavailableDays(**base, days=frozenset([day]))
+
+    elif category == "delivery mode":
+        m = re.search(r"conducted\s+([A-Za-z]+)", text, re.IGNORECASE)
+        if m:
+            return DeliveryMode(**base, mode=m.group(1).lower())
+
+    return Unstructured(**base, rule_text=text)
+
+
+# ---------------------------------------------------------
+# Cache
+# ---------------------------------------------------------
+
+_cache: Dict[Tuple[int, object], Tuple[tuple, CompiledConstraint]] = {}
+_cache_lock = threading.Lock()
+
+
+def _source(row: models.SchedulerConstraint) -> tuple:
+    # updated_at has second resolution on some backends; guard the key with the inputs
+    return (row.category, row.scope, row.target_id, row.rule_text, row.valid_from, row.valid_to)
+
+
+def compile_constraint(row: models.SchedulerConstraint) -> CompiledConstraint:
+    key = (row.id, row.updated_at)
+    source = _source(row)
+    cached = _cache.get(key)
+    if cached and cached[0] == source:
+        return cached[1]
+
+    target = (str(row.target_id).strip() if row.target_id is not None else "")
+    base = dict(
+        id=row.id,
+        category=row.category or "",
+        scope=_norm(row.scope),
+        target=None if target in ("", "0") else target,
+        valid_from=row.valid_from,
+        valid_to=row.valid_to,
+    )
+    compiled = _parse(row, base)
+    with _cache_lock:
+        for stale in [k for k in _cache if k[0] == row.id]:
+            del _cache[stale]
+        _cache[key] = (source, compiled)
+    return compiled
+
+
+def compile_all(rows: List[models.SchedulerConstraint]) -> List[CompiledConstraint]:
+    """Enabled rows only."""
+    return [compile_constraint(r) for r in rows if r.is_enabled]
+
+
+def forget(constraint_id: int):
+    with _cache_lock:
+        for stale in [k for k in _cache if k[0] == constraint_id]:
+            del _cache[stale]
+
+
+def allows(rules: List[CompiledConstraint], p: Placement) -> bool:
+    return all(r.allows(p) for r in rules)
@@ -1,10 +1,13 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from .dbpool import engine_options, instrument  # noqa: E402  (reads DB_POOL* after .env is loaded)
+
 
 raw_url = os.getenv("DATABASE_URL")
 
@@ -18,13 +21,35 @@ else:
     db_url = raw_url.replace("postgres://", "postgresql://", 1)
 
 
-engine = create_engine(
-    db_url,
-    pool_pre_ping=True,
-    connect_args={"sslmode": "require"} if "postgresql" in db_url else {}
-)
+_engine = None
+_SessionLocal = None
+
+
+def get_engine():
+    """Created on first use: importing the app opens no connection and loads no DB driver."""
+    global _engine, _SessionLocal
+    if _engine is None:
+        _engine = create_engine(
+            db_url,
+            **engine_options(db_url, "sync", {"sslmode": "require"} if "postgresql" in db_url else {})
+        )
+        instrument(_engine, "sync")
+        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    return _engine
+
+
+def __getattr__(name):
+    # keeps `from .database import engine` working without building the engine at import
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def SessionLocal():
+    get_engine()
+    return _SessionLocal()
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
@@ -32,4 +57,46 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# --- async stack (asyncpg on Postgres, aiosqlite locally), same database as above ---
+
+def async_db_url(url: str):
+    u = make_url(url)
+    if u.get_backend_name() == "postgresql":
+        # asyncpg takes ssl as a connect argument, not as a libpq sslmode query parameter
+        return u.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+    if u.get_backend_name() == "sqlite":
+        return u.set(drivername="sqlite+aiosqlite")
+    return u
+
+
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def get_async_engine():
+    """Created on first use so the sync-only paths never import the async drivers."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        url = async_db_url(db_url)
+        _async_engine = create_async_engine(
+            url,
+            **engine_options(url, "async", {"ssl": "require"} if "postgresql" in db_url else {})
+        )
+        instrument(_async_engine.sync_engine, "async")
+        # expire_on_commit=False: attributes stay readable after commit without implicit (sync) IO
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _AsyncSessionLocal()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
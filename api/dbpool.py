@@ -0,0 +1,177 @@
+# api/dbpool.py
+"""
+Connection pooling for the sync and async engines, chosen from the environment.
+
+DB_POOL=queue (default) keeps a QueuePool per engine, with DB_POOL_TIMEOUT.
+DB_POOL_SIZE and DB_MAX_OVERFLOW are the budget of the whole instance: the sync
+engine gets the larger half of each and the async engine the rest, so an
+instance never holds more than DB_POOL_SIZE + DB_MAX_OVERFLOW connections
+however its routes are split. Each engine needs one pooled connection, so
+DB_POOL_SIZE must be at least 2 (and DB_MAX_OVERFLOW at least 0); smaller
+values are rejected rather than quietly raised. Instead of pinging the server on every
+checkout (one extra round trip per request), connections are retired after
+DB_POOL_RECYCLE seconds, which should stay below the server's or proxy's idle
+timeout. DB_POOL_PRE_PING=1 brings the ping back.
+
+DB_POOL=null opens a connection per checkout and closes it on check-in. Use it
+behind an external pooler (PgBouncer, the Supabase/Neon poolers) so that many
+short-lived serverless instances share a few server connections. asyncpg's
+prepared statement cache is turned off in this mode because transaction-mode
+poolers don't keep prepared statements across transactions.
+
+Both engines count checkouts, checkout wait time, timeouts and connection churn
+(opened / closed / invalidated) in STATS; pool_stats() adds the live pool size,
+checked-out and overflow figures.
+"""
+import os
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+POOL_MODE = os.getenv("DB_POOL", "queue").strip().lower()
+# per instance, shared by the sync and the async engine (see _share)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0").strip().lower() in ("1", "true", "yes")
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.opened = 0
+        self.closed = 0
+        self.invalidated = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            self.timeouts += timed_out
+
+    def count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                "wait_seconds_max": round(self.max_wait_seconds, 6),
+                "timeouts": self.timeouts,
+                "connections_opened": self.opened,
+                "connections_closed": self.closed,
+                "connections_invalidated": self.invalidated,
+            }
+
+
+STATS: Dict[str, PoolStats] = {"sync": PoolStats(), "async": PoolStats()}
+_pools = {}
+
+
+class _TimedCheckout:
+    """Times Pool._do_get, i.e. waiting for a free slot plus connecting when a new connection is needed."""
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_wait(time.perf_counter() - started)
+        return conn
+
+
+def _timed(base, label: str):
+    # one subclass per engine; pool.recreate() (engine.dispose()) builds the same class again,
+    # so the stats live on the class rather than on the instance
+    return type(f"Timed{base.__name__}", (_TimedCheckout, base), {"stats": STATS[label]})
+
+
+def instrument(engine, label: str):
+    """Connection churn listeners; pass async_engine.sync_engine for the async engine."""
+    stats = STATS[label]
+    event.listen(engine, "connect", lambda *a: stats.count("opened"))
+    event.listen(engine, "close", lambda *a: stats.count("closed"))
+    event.listen(engine, "close_detached", lambda *a: stats.count("closed"))
+    event.listen(engine, "invalidate", lambda *a: stats.count("invalidated"))
+
+
+def _share(total: int, label: str) -> int:
+    """The sync engine's (larger) or the async engine's half of an instance-wide connection budget."""
+    half = total // 2
+    return total - half if label == "sync" else half
+
+
+def engine_options(url, label: str, connect_args: dict) -> dict:
+    """create_engine / create_async_engine keyword arguments for this URL; label is "sync" or "async"."""
+    u = make_url(url)
+    connect_args = dict(connect_args)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        # in-memory SQLite needs its single shared connection; leave SQLAlchemy's default pool
+        return {"connect_args": connect_args}
+
+    if POOL_MODE == "null":
+        if u.get_driver_name() == "asyncpg":
+            connect_args["statement_cache_size"] = 0
+        return {"poolclass": _pool_class(NullPool, label), "connect_args": connect_args}
+    if POOL_MODE != "queue":
+        raise ValueError(f"DB_POOL must be 'queue' or 'null', got {POOL_MODE!r}")
+    if POOL_SIZE < 2 or MAX_OVERFLOW < 0:
+        # one pooled connection per engine; a negative max_overflow would mean no limit at all
+        raise ValueError(f"DB_POOL_SIZE must be at least 2 and DB_MAX_OVERFLOW at least 0, "
+                         f"got {POOL_SIZE} and {MAX_OVERFLOW}")
+
+    base = AsyncAdaptedQueuePool if label == "async" else QueuePool
+    return {
+        "poolclass": _pool_class(base, label),
+        "pool_size": _share(POOL_SIZE, label),
+        "max_overflow": _share(MAX_OVERFLOW, label),
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _pool_class(base, label: str):
+    key = (base, label)
+    if key not in _pools:
+        _pools[key] = _timed(base, label)
+    return _pools[key]
+
+
+def _live(pool) -> dict:
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {"size": pool.size(), "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(), "overflow": max(pool.overflow(), 0)}
+
+
+def pool_stats() -> dict:
+    """Counters per engine plus the live state of engines that have been created."""
+    from . import database
+
+    engines = {"sync": database._engine,
+               "async": database._async_engine.sync_engine if database._async_engine is not None else None}
+    out = {"mode": POOL_MODE}
+    for label, engine in engines.items():
+        entry = STATS[label].snapshot()
+        if engine is not None:
+            entry["pool"] = type(engine.pool).__name__
+            entry.update(_live(engine.pool))
+        out[label] = entry
+    return out
@@ -0,0 +1,183 @@
+# api/free_slots.py
+"""
+Free-slot search for one offered module.
+
+search() answers "where can this session go?" for the planner: every (day,
+start, room) within opening hours where the lecturer is available and not
+teaching, the room is one of the offer's candidate rooms (api/room_index.py),
+open that day and unbooked, and the enabled constraints allow the placement.
+
+A semester's bookings are compiled into occupancy bitmaps (WeekMask bits per
+room, lecturer and cohort) and cached per schedule version (api/versions.py),
+so a request reads the version, the offer and its candidate rooms, and tests
+each start with a few AND operations instead of reading schedule_entries.
+"""
+import heapq
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models, solver, versions
+from . import constraint_compiler as cc
+from .availability import RESOLUTION, WeekMask, mask_for
+from .timeutils import DAYS, day_index, fmt_minutes, to_minutes
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+
+@dataclass
+class Occupancy:
+    version: str
+    # entry id -> (offered_module_id, room_id, lecturer_id, cohort, day, bits)
+    entries: Dict[int, tuple] = field(default_factory=dict)
+    busy: Dict[tuple, int] = field(default_factory=dict)  # ("R", room) | ("L", lecturer) | ("C", cohort) -> bits
+    holders: Dict[tuple, List[int]] = field(default_factory=dict)  # same keys -> entry ids
+    loads: Dict[tuple, int] = field(default_factory=dict)  # (("L", id) | ("C", cohort), day) -> sessions
+
+    def add(self, entry_id, offer_id, room_id, lecturer_id, cohort, day, bits):
+        self.entries[entry_id] = (offer_id, room_id, lecturer_id, cohort, day, bits)
+        for key in (("R", room_id), ("L", lecturer_id), ("C", cohort)):
+            if key[1] is not None:
+                self.busy[key] = self.busy.get(key, 0) | bits
+                self.holders.setdefault(key, []).append(entry_id)
+        for key in (("L", lecturer_id), ("C", cohort)):
+            if key[1] is not None:
+                self.loads[(key, day)] = self.loads.get((key, day), 0) + 1
+
+    def busy_without(self, key, entry_id: Optional[int] = None) -> int:
+        """Bits booked for `key`; without `entry_id`, rebuilt from the other entries holding the key."""
+        if key[1] is None:
+            return 0
+        holders = self.holders.get(key, ())
+        if entry_id is None or entry_id not in holders:
+            return self.busy.get(key, 0)
+        bits = 0
+        for other in holders:
+            if other != entry_id:
+                bits |= self.entries[other][5]
+        return bits
+
+
+_cache: Dict[str, Occupancy] = {}
+_cache_lock = threading.Lock()
+
+
+def occupancy(db: Session, semester: str) -> Occupancy:
+    version = versions.etag(db, semester)
+    cached = _cache.get(semester)
+    if cached and cached.version == version:
+        return cached
+
+    E, O, M = models.ScheduleEntry, models.OfferedModule, models.Module
+    rows = db.execute(
+        select(E.id, E.offered_module_id, E.room_id, O.lecturer_id, M.program_id, M.semester, E.day_of_week,
+               E.start_time, E.end_time)
+        .select_from(E)
+        .outerjoin(O, O.id == E.offered_module_id)
+        .outerjoin(M, M.module_code == O.module_code)
+        .where(E.semester == semester)
+    ).all()
+    occ = Occupancy(version=version)
+    for entry_id, offer_id, room_id, lecturer_id, program_id, study_semester, day_name, start_time, end_time in rows:
+        day, start, end = day_index(day_name), to_minutes(start_time), to_minutes(end_time)
+        if day is None or start is None or end is None:
+            continue
+        cohort = (program_id, study_semester) if program_id is not None else None
+        occ.add(entry_id, offer_id, room_id, lecturer_id, cohort, day, WeekMask.slot(day, start, end).bits)
+    with _cache_lock:
+        _cache[semester] = occ
+    return occ
+
+
+def search(db: Session, offered_module_id: int, semester: Optional[str] = None, duration: Optional[int] = None,
+           exclude_entry_id: Optional[int] = None, limit: int = DEFAULT_LIMIT) -> List[dict]:
+    offer = db.execute(
+        select(models.OfferedModule, models.Module)
+        .outerjoin(models.Module, models.Module.module_code == models.OfferedModule.module_code)
+        .where(models.OfferedModule.id == offered_module_id)
+    ).first()
+    if not offer:
+        raise HTTPException(status_code=404, detail="Offered Module not found")
+    offer, module = offer
+    semester = semester or offer.semester
+
+    rules = solver.active_constraints(db, semester)
+    policy = solver.read_policy(rules)
+    slot_rules = solver.slot_constraints(rules)
+    duration = duration or policy.duration_for(offer.module_code, offer.lecturer_id,
+                                               module.program_id if module else None)
+    if duration > policy.day_end - policy.day_start:
+        raise HTTPException(status_code=400, detail="duration is longer than the opening hours")
+
+    R = models.Room
+    rooms = db.execute(
+        select(R.id, R.name, R.capacity, R.location)
+        .join(models.RoomCandidate, models.RoomCandidate.room_id == R.id)
+        .where(models.RoomCandidate.offered_module_id == offer.id)
+        .order_by(R.capacity, R.id)
+    ).all()
+    if not rooms:
+        return []
+
+    available = WeekMask.full().bits
+    if offer.lecturer_id is not None:
+        available = mask_for(db.query(models.LecturerAvailability).filter(
+            models.LecturerAvailability.lecturer_id == offer.lecturer_id
+        ).first()).bits
+
+    occ = occupancy(db, semester)
+    own = None
+    if exclude_entry_id is not None:
+        own = occ.entries.get(exclude_entry_id)
+        if own is None or own[0] != offer.id:
+            raise HTTPException(status_code=400,
+                                detail="exclude_entry_id is not a session of this offered module in this semester")
+    # the session being moved does not block its own new position: its room's, lecturer's and cohort's
+    # bookings are rebuilt from their other entries, so overlapping bookings elsewhere still count
+    lecturer_busy = occ.busy_without(("L", offer.lecturer_id), exclude_entry_id)
+    program_id = module.program_id if module else None
+    cohort = (program_id, module.semester) if program_id is not None else None
+    cohort_busy = occ.busy_without(("C", cohort), exclude_entry_id)
+    room_busy = {room.id: occ.busy_without(("R", room.id), exclude_entry_id) for room in rooms}
+    policy.locate_rooms({room.id: room.location for room in rooms})
+    room_closed = {room.id: policy.closed_days(room.id) for room in rooms}
+
+    step = policy.slot_minutes + policy.break_minutes
+    results = []
+    for day in policy.open_days:
+        lecturer_load = occ.loads.get((("L", offer.lecturer_id), day), 0)
+        cohort_load = occ.loads.get((("C", cohort), day), 0)
+        if own and own[4] == day:
+            lecturer_load -= own[2] is not None
+            cohort_load -= own[3] is not None
+        # as in the solver: spread a cohort's and a lecturer's sessions over the week
+        load = lecturer_load + 2 * cohort_load
+        for start in range(policy.day_start, policy.day_end - duration + 1, RESOLUTION):
+            bits = WeekMask.slot(day, start, start + duration).bits
+            if available & bits != bits or lecturer_busy & bits:
+                continue
+            if not cc.allows(slot_rules, cc.Placement(
+                day=day, start=start, end=start + duration, lecturer_id=offer.lecturer_id,
+                module_code=offer.module_code, program_id=program_id,
+            )):
+                continue
+            clash = bool(cohort_busy & bits)
+            off_grid = (start - policy.day_start) % step != 0
+            for rank, room in enumerate(rooms):
+                if room_busy[room.id] & bits or day in room_closed[room.id]:
+                    continue
+                # cohort clashes last, then off the slot grid, then busy days, mornings, best-fit rooms
+                results.append(((clash, off_grid, load, start, rank, day), room))
+
+    return [
+        {
+            "day_of_week": DAYS[day], "start_time": fmt_minutes(start), "end_time": fmt_minutes(start + duration),
+            "room_id": room.id, "room_name": room.name, "room_capacity": room.capacity, "cohort_conflict": clash,
+        }
+        for (clash, _, _, start, _, day), room in heapq.nsmallest(limit, results, key=lambda r: r[0])
+    ]
@@ -1,10 +1,12 @@
 # api/index.py
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import datetime
+import os
 
-from .database import engine
-from . import models
+from .dbpool import pool_stats
+from .metrics import MetricsMiddleware
+from .pagination import NEXT_CURSOR_HEADER
 from .routers.dev import router as dev_router
 from .routers.auth_routes import router as auth_router
 from .routers.programs import router as programs_router
@@ -19,13 +21,27 @@ from .routers.semesters import router as semesters_router
 from .routers.offered_modules import router as offered_modules_router
 from .routers.schedule import router as schedule_router
 from .routers.domains import router as domains_router
+from .routers.workspace import router as workspace_router
+from .routers.metrics import router as metrics_router, require_metrics_token
 
 
-try:
-    models.Base.metadata.create_all(bind=engine)
-    print(" DB connected.")
-except Exception as e:
-    print(" DB Startup Error:", e)
+def _schema_on_startup() -> bool:
+    # On Vercel every cold start would pay for a connection plus catalogue introspection;
+    # there the schema is migrated once per deploy with `python -m api.manage migrate`.
+    flag = os.getenv("SCHEMA_ON_STARTUP")
+    if flag is None:
+        return not os.getenv("VERCEL")
+    return flag.strip().lower() in ("1", "true", "yes")
+
+
+if _schema_on_startup():
+    from .database import get_engine
+    from . import migrations
+    try:
+        migrations.ensure_schema(get_engine())
+        print(" DB connected.")
+    except Exception as e:
+        print(" DB Startup Error:", e)
 
 app = FastAPI(title="Study Program Backend", root_path="/api")
 
@@ -35,7 +51,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+# added last = outermost, so CORS preflights and errors are measured too
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 def root():
@@ -48,6 +67,11 @@ def check_version():
         "timestamp": str(datetime.datetime.now())
     }
 
+@app.get("/health/db-pool", dependencies=[Depends(require_metrics_token)])
+def db_pool():
+    """Checkout wait, overflow and connection churn of this instance's pools."""
+    return pool_stats()
+
 app.include_router(dev_router)
 app.include_router(auth_router)
 app.include_router(programs_router)
@@ -65,3 +89,5 @@ app.include_router(semesters_router)
 
 app.include_router(offered_modules_router)
 app.include_router(schedule_router)
+app.include_router(workspace_router)
+app.include_router(metrics_router)
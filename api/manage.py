@@ -0,0 +1,35 @@
+# api/manage.py
+"""
+Management commands, run from the repository root:
+
+    python -m api.manage migrate   # create tables, add missing columns/indexes, run backfills
+
+Schema work used to run on every import of api/index.py, i.e. on every serverless
+cold start. Deployments now run `migrate` once per release instead (see
+SCHEMA_ON_STARTUP in api/index.py).
+"""
+import argparse
+import time
+
+from .database import get_engine
+from . import migrations
+
+
+def migrate():
+    started = time.perf_counter()
+    migrations.ensure_schema(get_engine())
+    print(f"Schema up to date ({(time.perf_counter() - started) * 1000:.0f} ms).")
+
+
+COMMANDS = {"migrate": migrate}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m api.manage")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
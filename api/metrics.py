@@ -0,0 +1,200 @@
+# api/metrics.py
+"""
+Per-route request metrics in the Prometheus text format, served at GET /metrics.
+
+MetricsMiddleware (plain ASGI, no per-request task or body buffering) records for
+each route template (/lecturers/{id}, not /lecturers/7) the request count per
+status code and a latency histogram. SQLAlchemy cursor events, registered on the
+Engine class so they cover the sync engine and the async engine's sync_engine
+alike, count the statements a request runs and the time spent in the driver;
+the running request is found through a ContextVar, which SQLAlchemy's greenlets
+and Starlette's threadpool both inherit.
+
+Counters live in this process only: on serverless each instance reports its own
+share, and Prometheus sums across instances.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import query_budget
+from .dbpool import pool_stats
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED = "<unmatched>"
+
+
+class RequestStats:
+    __slots__ = ("statements", "db_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+class RouteStats:
+    __slots__ = ("statuses", "buckets", "seconds", "count", "statements", "db_seconds")
+
+    def __init__(self):
+        self.statuses: Dict[int, int] = {}
+        self.buckets = [0] * len(BUCKETS)  # non-cumulative; summed when rendered
+        self.seconds = 0.0
+        self.count = 0
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+_routes: Dict[Tuple[str, str], RouteStats] = {}
+_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request.get() is not None:
+        conn.info["metrics_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is None:
+        return
+    started = conn.info.pop("metrics_started", None)
+    stats.statements += 1
+    if started is not None:
+        stats.db_seconds += time.perf_counter() - started
+
+
+def record(method: str, route: str, status: int, seconds: float, stats: RequestStats):
+    with _lock:
+        entry = _routes.get((method, route))
+        if entry is None:
+            entry = _routes[(method, route)] = RouteStats()
+        entry.statuses[status] = entry.statuses.get(status, 0) + 1
+        entry.count += 1
+        entry.seconds += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                entry.buckets[i] += 1
+                break
+        entry.statements += stats.statements
+        entry.db_seconds += stats.db_seconds
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            # the router stores the matched route in the (shared) scope; templates keep label cardinality bounded
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            record(scope["method"], route, status, time.perf_counter() - started, stats)
+        query_budget.check(scope["method"], route, stats.statements)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def render() -> str:
+    with _lock:
+        routes = sorted(_routes.items())
+        snapshot = [(key, dict(r.statuses), list(r.buckets), r.seconds, r.count, r.statements, r.db_seconds)
+                    for key, r in routes]
+
+    lines = [
+        "# HELP http_requests_total Requests served, by route template and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route), statuses, *_ in snapshot:
+        for status, n in sorted(statuses.items()):
+            lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {n}")
+
+    lines += ["# HELP http_request_duration_seconds Request latency, until the last body chunk is sent.",
+              "# TYPE http_request_duration_seconds histogram"]
+    for (method, route), _, buckets, seconds, count, _, _ in snapshot:
+        cumulative = 0
+        for bound, n in zip(BUCKETS, buckets):
+            cumulative += n
+            lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+        lines.append(f"http_request_duration_seconds_bucket{_labels(method=method, route=route, le='+Inf')} {count}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(method=method, route=route)} {seconds:.6f}")
+        lines.append(f"http_request_duration_seconds_count{_labels(method=method, route=route)} {count}")
+
+    lines += ["# HELP db_statements_total SQL statements executed while serving the route.",
+              "# TYPE db_statements_total counter"]
+    for (method, route), *_, statements, _ in snapshot:
+        lines.append(f"db_statements_total{_labels(method=method, route=route)} {statements}")
+
+    lines += ["# HELP db_time_seconds_total Time spent in the database driver while serving the route.",
+              "# TYPE db_time_seconds_total counter"]
+    for (method, route), *_, db_seconds in snapshot:
+        lines.append(f"db_time_seconds_total{_labels(method=method, route=route)} {db_seconds:.6f}")
+
+    with query_budget._lock:
+        exceeded = sorted(query_budget.exceeded.items())
+    lines += ["# HELP db_query_budget_exceeded_total Requests that ran more SQL statements than their budget.",
+              "# TYPE db_query_budget_exceeded_total counter"]
+    for (method, route), n in exceeded:
+        lines.append(f"db_query_budget_exceeded_total{_labels(method=method, route=route)} {n}")
+
+    lines += _pool_lines()
+    return "\n".join(lines) + "\n"
+
+
+_POOL_COUNTERS = [
+    ("checkouts", "db_pool_checkouts_total", "Connection checkouts."),
+    ("wait_seconds_total", "db_pool_checkout_wait_seconds_total", "Time spent waiting for (or opening) a connection."),
+    ("timeouts", "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT."),
+    ("connections_opened", "db_pool_connections_opened_total", "DBAPI connections opened."),
+    ("connections_closed", "db_pool_connections_closed_total", "DBAPI connections closed."),
+    ("connections_invalidated", "db_pool_connections_invalidated_total", "Connections invalidated after errors."),
+]
+_POOL_GAUGES = [
+    ("size", "db_pool_size", "Configured pool size."),
+    ("checked_out", "db_pool_checked_out", "Connections currently in use."),
+    ("overflow", "db_pool_overflow", "Connections open beyond the pool size."),
+]
+
+
+def _pool_lines() -> list:
+    stats = pool_stats()
+    engines = ("sync", "async")
+    lines = []
+    for key, name, help_text in _POOL_COUNTERS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f"{name}{_labels(engine=e)} {stats[e][key]}" for e in engines]
+    for key, name, help_text in _POOL_GAUGES:
+        present = [e for e in engines if key in stats[e]]
+        if present:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{_labels(engine=e)} {stats[e][key]}" for e in present]
+    return lines
+
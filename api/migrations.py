@@ -0,0 +1,168 @@
+# api/migrations.py
+"""
+Schema upkeep for existing databases.
+
+create_all() only creates missing tables; it never touches tables that already
+exist. ensure_schema() additionally adds columns and indexes declared on the
+models but missing in the DB. New columns on existing tables must therefore be
+nullable or carry a server_default.
+
+Data backfills that go with a new column run afterwards and only touch rows
+that have not been migrated yet, so calling ensure_schema() again is cheap.
+"""
+import json
+from typing import List, Optional, Tuple
+
+from sqlalchemy import inspect, func, select, update, bindparam
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn, AddConstraint
+
+from . import models, room_index
+from .timeutils import fmt_minutes, to_minutes
+
+
+def add_missing_columns(engine: Engine):
+    with engine.begin() as conn:
+        insp = inspect(conn)
+        for table in models.Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.exec_driver_sql(f"ALTER TABLE {conn.dialect.identifier_preparer.format_table(table)} ADD COLUMN {ddl}")
+                # SQLite cannot add constraints to an existing table
+                if conn.dialect.name != "sqlite":
+                    for fk in column.foreign_keys:
+                        conn.execute(AddConstraint(fk.constraint))
+                print(f" Added column {table.name}.{column.name}")
+
+
+def add_missing_indexes(engine: Engine):
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def program_lookup(programs) -> dict:
+    """Lowercased name / acronym / stringified id -> program id, as the legacy Group.program text used them."""
+    lookup = {}
+    for pid, name, acronym in programs:
+        for key in ((name or "").strip().lower(), (acronym or "").strip().lower(), str(pid)):
+            if key:
+                lookup.setdefault(key, pid)
+    return lookup
+
+
+def backfill_group_programs(engine: Engine):
+    """Resolve the free-text Group.program of not yet linked groups into Group.program_id."""
+    G, P = models.Group, models.StudyProgram
+    with engine.begin() as conn:
+        pending = conn.execute(
+            select(G.id, G.program).where(G.program_id.is_(None), G.program.isnot(None))
+        ).all()
+        if not pending:
+            return
+        lookup = program_lookup(conn.execute(select(P.id, P.name, P.acronym)).all())
+        rows = [
+            {"gid": gid, "pid": lookup[(label or "").strip().lower()]}
+            for gid, label in pending
+            if (label or "").strip().lower() in lookup
+        ]
+        if rows:
+            conn.execute(
+                update(G.__table__).where(G.__table__.c.id == bindparam("gid")).values(program_id=bindparam("pid")),
+                rows,
+            )
+            print(f" Linked {len(rows)} groups to their study program")
+
+
+def split_legacy_assessment(value: Optional[str]) -> Tuple[Optional[str], List[dict]]:
+    """
+    Legacy Module.assessment_type text -> (assessment_type label, breakdown).
+    The text was either a plain label, a JSON list of {type, weight}, or a JSON
+    object {"assessments": [...], "lecturer_assignments": [...]}. Objects that
+    still carry lecturer assignments keep their text so nothing is lost.
+    """
+    try:
+        parsed = json.loads(value) if value and value.strip() else None
+    except ValueError:
+        parsed = None
+
+    if isinstance(parsed, dict):
+        assessments = parsed.get("assessments") or []
+        if parsed.get("lecturer_assignments"):
+            return value, assessments
+    elif isinstance(parsed, list):
+        assessments = parsed
+    else:
+        return value, []
+
+    assessments = [a for a in assessments if isinstance(a, dict) and a.get("type")]
+    return (assessments[0]["type"] if assessments else None), assessments
+
+
+def backfill_module_assessments(engine: Engine):
+    """Move the assessment breakdown out of the assessment_type text into its JSON column."""
+    M = models.Module
+    with engine.begin() as conn:
+        pending = conn.execute(
+            select(M.module_code, M.assessment_type).where(M.assessment_breakdown.is_(None))
+        ).all()
+        if not pending:
+            return
+        rows = []
+        for code, text in pending:
+            label, breakdown = split_legacy_assessment(text)
+            rows.append({"code": code, "label": label, "breakdown": breakdown})
+        conn.execute(
+            update(M.__table__)
+            .where(M.__table__.c.module_code == bindparam("code"))
+            .values(assessment_type=bindparam("label"), assessment_breakdown=bindparam("breakdown")),
+            rows,
+        )
+        print(f" Migrated assessment breakdown of {len(rows)} modules")
+
+
+def backfill_room_candidates(engine: Engine):
+    """Build the room candidate index once; afterwards api/room_index.py keeps it current."""
+    with engine.begin() as conn:
+        if conn.execute(select(models.RoomCandidate.room_id).limit(1)).first():
+            return
+        built = room_index.rebuild(conn)
+        if built:
+            print(f" Indexed {built} room candidates")
+
+
+def normalize_schedule_times(engine: Engine):
+    """Rewrite legacy schedule times like "9:00" or "09:00:00" as the zero-padded "HH:MM" the queries expect."""
+    E = models.ScheduleEntry
+    with engine.begin() as conn:
+        pending = conn.execute(
+            select(E.id, E.start_time, E.end_time)
+            .where((func.length(E.start_time) != 5) | (func.length(E.end_time) != 5))
+        ).all()
+        rows = []
+        for entry_id, start, end in pending:
+            start, end = to_minutes(start), to_minutes(end)
+            if start is not None and end is not None:
+                rows.append({"eid": entry_id, "start": fmt_minutes(start), "end": fmt_minutes(end)})
+        if rows:
+            conn.execute(
+                update(E.__table__).where(E.__table__.c.id == bindparam("eid"))
+                .values(start_time=bindparam("start"), end_time=bindparam("end")),
+                rows,
+            )
+            print(f" Normalised the times of {len(rows)} schedule entries")
+
+
+def ensure_schema(engine: Engine):
+    models.Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    add_missing_indexes(engine)
+    backfill_group_programs(engine)
+    backfill_module_assessments(engine)
+    backfill_room_candidates(engine)
+    normalize_schedule_times(engine)
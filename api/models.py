@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, Text, JSON, TIMESTAMP, Table
+from sqlalchemy import Column, Integer, String, Boolean, Date, ForeignKey, Text, JSON, TIMESTAMP, Table, Index, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 
@@ -33,6 +34,8 @@ class User(Base):
     password_hash = Column(String(255), nullable=False)
     role = Column(String(20), nullable=False)  # admin, pm, hosp, lecturer, student
     lecturer_id = Column(Integer, ForeignKey("lecturers.ID"), nullable=True)
+    # carried in the JWT as "ver"; bumping it revokes every token issued before
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     lecturer_profile = relationship("Lecturer")
 
@@ -60,7 +63,7 @@ class Lecturer(Base):
     teaching_load = Column(String(100), nullable=True)
 
     # ✅ keep existing single-domain fields for now OR remove later
-    domain_id = Column(Integer, ForeignKey("domains.id"), nullable=True)
+    domain_id = Column(Integer, ForeignKey("domains.id"), nullable=True, index=True)
     domain_rel = relationship("Domain")
 
     # ✅ NEW multi-domain relation
@@ -92,14 +95,23 @@ class StudyProgram(Base):
 
 class Module(Base):
     __tablename__ = "modules"
+    __table_args__ = (
+        # filter + keyset order of GET /modules/?program_id=
+        Index("ix_modules_program_code", "program_id", "module_code"),
+    )
+
     module_code = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
     ects = Column(Integer, nullable=False)
     room_type = Column(String, nullable=False)
     assessment_type = Column(String, nullable=True)
+    # [{"type": ..., "weight": ...}], weights summing to 100; NULL only on rows not yet backfilled
+    assessment_breakdown = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     semester = Column(Integer, nullable=False)
     category = Column(String, nullable=True)
     program_id = Column(Integer, ForeignKey("study_programs.id", ondelete="CASCADE"), nullable=True)
+    # equipment the room must have, free text like Room.equipment ("Projector, PC")
+    equipment = Column(String, nullable=True)
 
     specializations = relationship("Specialization", secondary=module_specializations, back_populates="modules")
     lecturers = relationship("Lecturer", secondary=lecturer_modules, back_populates="modules")
@@ -107,6 +119,10 @@ class Module(Base):
 
 class Specialization(Base):
     __tablename__ = "specializations"
+    __table_args__ = (
+        Index("ix_specializations_program_id", "program_id", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     program_id = Column(Integer, ForeignKey("study_programs.id", ondelete="CASCADE"))
     name = Column(String, nullable=False)
@@ -125,12 +141,17 @@ class Group(Base):
     size = Column("Size", Integer, nullable=False)
     description = Column("Brief description", String(250), nullable=True)
     email = Column("Email", String(200), nullable=True)
-    program = Column("Program", String, nullable=True)
+    program = Column("Program", String, nullable=True)  # display label; program_id is authoritative
+    program_id = Column(Integer, ForeignKey("study_programs.id", ondelete="SET NULL"), nullable=True, index=True)
     parent_group = Column("Parent_Group", String, nullable=True)
 
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        Index("ix_rooms_type_id", "type", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, nullable=False)
     capacity = Column(Integer, nullable=False)
@@ -145,10 +166,16 @@ class LecturerAvailability(Base):
     id = Column(Integer, primary_key=True, index=True)
     lecturer_id = Column(Integer, ForeignKey("lecturers.ID", ondelete="CASCADE"), unique=True, nullable=False)
     schedule_data = Column(JSON, default={}, nullable=False)
+    # bumped by every UPDATE; keys the compiled WeekMask cache (api/availability.py)
+    version = Column(Integer, default=1, server_default="1", onupdate=literal_column("version") + 1, nullable=False)
 
 
 class SchedulerConstraint(Base):
     __tablename__ = "scheduler_constraints"
+    __table_args__ = (
+        Index("ix_scheduler_constraints_scope_id", "scope", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     category = Column(String, default="General")
@@ -173,6 +200,10 @@ class Semester(Base):
 
 class OfferedModule(Base):
     __tablename__ = "offered_modules"
+    __table_args__ = (
+        Index("ix_offered_modules_lecturer_semester", "lecturer_id", "semester"),
+        Index("ix_offered_modules_semester_id", "semester", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -188,8 +219,21 @@ class OfferedModule(Base):
     lecturer = relationship("Lecturer")
 
 
+class RoomCandidate(Base):
+    """Rooms that can host an offered module; maintained by api/room_index.py."""
+    __tablename__ = "room_candidates"
+
+    offered_module_id = Column(Integer, ForeignKey("offered_modules.id", ondelete="CASCADE"), primary_key=True)
+    room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
 class ScheduleEntry(Base):
     __tablename__ = "schedule_entries"
+    # double-booking checks (api/booking.py) range-scan these
+    __table_args__ = (
+        Index("ix_schedule_entries_room_slot", "semester", "room_id", "day_of_week", "start_time"),
+        Index("ix_schedule_entries_offer_slot", "offered_module_id", "day_of_week", "start_time"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -205,3 +249,10 @@ class ScheduleEntry(Base):
 
     offered_module = relationship("OfferedModule")
     room = relationship("Room")
+
+
+class ScheduleVersion(Base):
+    __tablename__ = "schedule_versions"
+    # one row per semester name, plus "*" for catalogue data shown in every schedule (rooms, lecturers, modules)
+    semester = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
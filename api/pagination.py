@@ -0,0 +1,66 @@
+# api/pagination.py
+"""
+Keyset pagination for list endpoints.
+
+List endpoints accept ?limit=&after=. Rows are ordered by the resource's primary
+key and `after` is the last key of the previous page, so every page is an index
+range scan (WHERE key > :after ORDER BY key LIMIT :limit) no matter how deep the
+client pages. When more rows follow, the key to pass as the next `after` is sent
+in the X-Next-Cursor response header; bodies stay plain JSON arrays. Without
+`limit` the whole (filtered) list is returned, as before.
+
+paginate() takes an ORM Query; paginate_async() the equivalent select() for an
+AsyncSession.
+"""
+from typing import Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_LIMIT = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class Page:
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT, description="Page size"),
+        after: Optional[str] = Query(None, description="Key of the last row of the previous page"),
+    ):
+        self.limit = limit
+        self.after = after
+
+
+def _cursor_value(key, after: str):
+    try:
+        return key.type.python_type(after)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {after}")
+
+
+def _window(query, key, page: Page):
+    query = query.order_by(key)
+    if page.after is not None:
+        query = query.filter(key > _cursor_value(key, page.after))
+    if page.limit is not None:
+        query = query.limit(page.limit + 1)
+    return query
+
+
+def _trim(rows: list, key, page: Page, response: Response) -> list:
+    if page.limit is not None and len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(getattr(rows[-1], key.key))
+    return rows
+
+
+def paginate(query, key, page: Page, response: Response) -> list:
+    """`key` is the unique ORM attribute the page is ordered by (usually the primary key)."""
+    return _trim(_window(query, key, page).all(), key, page, response)
+
+
+async def paginate_async(db: AsyncSession, stmt, key, page: Page, response: Response, entities: bool = True) -> list:
+    """entities=False for column selects (rows instead of ORM instances)."""
+    result = await db.execute(_window(stmt, key, page))
+    rows = result.scalars().all() if entities else result.all()
+    return _trim(list(rows), key, page, response)
@@ -1,9 +1,12 @@
 # api/permissions.py
-from fastapi import HTTPException
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional, Set
 
-from . import models
+from . import models, auth
+from .database import get_db, get_async_db
 
 
 def role_of(user: models.User) -> str:
@@ -24,18 +27,6 @@ def require_lecturer_link(user: models.User) -> int:
         raise HTTPException(status_code=403, detail="User is not linked to a lecturer profile")
     return int(user.lecturer_id)
 
-def hosp_programs(db: Session, user: models.User) -> List[models.StudyProgram]:
-    lec_id = require_lecturer_link(user)
-    return (
-        db.query(models.StudyProgram)
-        .filter(models.StudyProgram.head_of_program_id == lec_id)
-        .all()
-    )
-
-
-def hosp_program_ids(db: Session, user: models.User) -> List[int]:
-    return [p.id for p in hosp_programs(db, user)]
-
 
 def check_is_hosp_for_program(user: models.User, program: models.StudyProgram):
     r = role_of(user)
@@ -47,22 +38,70 @@ def check_is_hosp_for_program(user: models.User, program: models.StudyProgram):
         return True
     raise HTTPException(status_code=403, detail="Access denied")
 
-def group_payload_in_hosp_domain(db: Session, user: models.User, program_field: Optional[str]) -> bool:
-    progs = hosp_programs(db, user)
-    val = (program_field or "").strip().lower()
-    allowed = set()
-    for p in progs:
-        allowed.add((p.name or "").strip().lower())
-        allowed.add((p.acronym or "").strip().lower())
-        allowed.add(str(p.id))
-    return val in allowed
-
-
-def group_is_in_hosp_domain(db: Session, user: models.User, group: models.Group) -> bool:
-    return group_payload_in_hosp_domain(db, user, group.program)
-
-def hosp_can_manage_constraint(db: Session, user: models.User, scope: str, target_id: Optional[int]) -> bool:
-    scope_norm = (scope or "").strip().lower()
-    if scope_norm == "program" and target_id is not None:
-        return target_id in hosp_program_ids(db, user)
-    return False
+
+class PermissionContext:
+    """
+    Request-scoped view of the caller's permissions. HoSP program ownership is
+    loaded on first use and then reused for every check in the same request.
+    """
+
+    def __init__(self, db: Session, user: models.User):
+        self.db = db
+        self.user = user
+        self.role = role_of(user)
+        self.lecturer_id = user.lecturer_id
+        self._program_ids: Optional[Set[int]] = None
+
+    @property
+    def is_admin_or_pm(self) -> bool:
+        return self.role in ["admin", "pm"]
+
+    @property
+    def is_hosp(self) -> bool:
+        return self.role == "hosp"
+
+    def require_lecturer_link(self) -> int:
+        return require_lecturer_link(self.user)
+
+    @property
+    def program_ids(self) -> Set[int]:
+        """Ids of every program the caller heads."""
+        if self._program_ids is None:
+            lec_id = self.require_lecturer_link()
+            self._program_ids = {
+                pid for (pid,) in self.db.query(models.StudyProgram.id)
+                .filter(models.StudyProgram.head_of_program_id == lec_id).all()
+            }
+        return self._program_ids
+
+    def owns_program(self, program_id: Optional[int]) -> bool:
+        return program_id is not None and program_id in self.program_ids
+
+    def can_manage_constraint(self, scope: Optional[str], target_id) -> bool:
+        if (scope or "").strip().lower() != "program" or target_id is None:
+            return False
+        try:
+            return int(target_id) in self.program_ids
+        except (TypeError, ValueError):
+            return False
+
+
+def get_permission_context(
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+) -> PermissionContext:
+    return PermissionContext(db, current_user)
+
+
+async def get_async_permission_context(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user),
+) -> PermissionContext:
+    """For async routes: program ownership cannot be lazy-loaded there, so HoSP ids are read up front."""
+    perm = PermissionContext(None, current_user)
+    if perm.is_hosp:
+        lec_id = perm.require_lecturer_link()
+        perm._program_ids = set((await db.execute(
+            select(models.StudyProgram.id).where(models.StudyProgram.head_of_program_id == lec_id)
+        )).scalars())
+    return perm
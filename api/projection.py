@@ -0,0 +1,114 @@
+# api/projection.py
+"""
+Sparse fieldsets for list endpoints.
+
+?fields=id,first_name,last_name selects only those columns into plain row
+tuples and serialises them straight to JSON, skipping ORM instances, eager
+loads and response-model validation. Collection fields (a lecturer's modules,
+...) are read with one extra query per collection for the whole page instead
+of a joined load. The resource key is always returned, and paging
+(?limit=&after=) works the same as for full reads.
+"""
+from typing import Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .pagination import NEXT_CURSOR_HEADER
+
+FIELDS_QUERY = Query(None, description="Comma-separated list of fields to return")
+
+
+class Projection:
+    def __init__(
+        self,
+        key,
+        columns: Dict[str, object],
+        joins: Optional[Dict[str, tuple]] = None,
+        collections: Optional[Dict[str, Callable[[Session, list], dict]]] = None,
+    ):
+        """
+        key:         unique ORM attribute the rows are keyed and paged by
+        columns:     field -> column expression
+        joins:       field -> (target, onclause) outer join that field's column needs
+        collections: field -> loader(db, keys) returning {key: [items]}
+        """
+        self.key = key
+        self.columns = columns
+        self.joins = joins or {}
+        self.collections = collections or {}
+
+    @property
+    def key_name(self) -> str:
+        return self.key.key
+
+    def parse(self, fields: Optional[str]) -> Optional[List[str]]:
+        """None when no projection was asked for."""
+        if fields is None:
+            return None
+        names = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [n for n in names if n not in self.columns and n not in self.collections and n != self.key_name]
+        if unknown:
+            allowed = sorted({self.key_name, *self.columns, *self.collections})
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+        return list(dict.fromkeys(names))
+
+    def query(self, db: Session, names: List[str]):
+        return self._joined(db.query(*self._labels(names)), names)
+
+    def statement(self, names: List[str]):
+        """select() form of query(), for an AsyncSession."""
+        return self._joined(select(*self._labels(names)), names)
+
+    def _labels(self, names: List[str]) -> list:
+        return [self.key.label(self.key_name)] + [
+            self.columns[n].label(n) for n in names if n in self.columns and n != self.key_name
+        ]
+
+    def _joined(self, query, names: List[str]):
+        columns = [n for n in names if n in self.columns and n != self.key_name]
+        joined = set()
+        for n in columns:
+            if n in self.joins and id(self.joins[n]) not in joined:
+                target, onclause = self.joins[n]
+                query = query.outerjoin(target, onclause)
+                joined.add(id(self.joins[n]))
+        return query
+
+    def respond(self, db: Session, rows, names: List[str], response: Optional[Response] = None) -> JSONResponse:
+        items = [dict(row._mapping) for row in rows]
+        keys = [item[self.key_name] for item in items]
+        for n in names:
+            if n in self.collections:
+                self._attach(items, n, self.collections[n](db, keys) if keys else {})
+        return self._response(items, response)
+
+    async def respond_async(self, db: AsyncSession, rows, names: List[str],
+                            response: Optional[Response] = None) -> JSONResponse:
+        items = [dict(row._mapping) for row in rows]
+        keys = [item[self.key_name] for item in items]
+        for n in names:
+            if n in self.collections:
+                self._attach(items, n, await db.run_sync(self.collections[n], keys) if keys else {})
+        return self._response(items, response)
+
+    def _attach(self, items: List[dict], name: str, loaded: dict):
+        for item in items:
+            item[name] = loaded.get(item[self.key_name], [])
+
+    def _response(self, items: List[dict], response: Optional[Response]) -> JSONResponse:
+        out = JSONResponse(content=items)
+        if response is not None and NEXT_CURSOR_HEADER in response.headers:
+            out.headers[NEXT_CURSOR_HEADER] = response.headers[NEXT_CURSOR_HEADER]
+        return out
+
+
+def group_pairs(pairs) -> dict:
+    """[(key, item), ...] -> {key: [item, ...]}"""
+    grouped: dict = {}
+    for key, item in pairs:
+        grouped.setdefault(key, []).append(item)
+    return grouped
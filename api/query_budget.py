@@ -0,0 +1,134 @@
+# api/query_budget.py
+"""
+SQL statement budgets per endpoint, to catch N+1 regressions.
+
+BUDGETS maps (method, route template) to the most statements one request may run.
+A budget does not depend on how many rows the request returns: list endpoints
+load relations in a fixed number of queries (joinedload / selectinload), so an
+attribute access that starts lazy-loading per row pushes the count over budget as
+soon as the data set has a few rows. Budgets include the token-version check of
+auth.get_current_user (cached, but one statement on a cold cache) and one spare
+statement for dialect differences such as the Postgres advisory lock.
+
+MetricsMiddleware counts the statements of each request (api/metrics.py) and calls
+check() after the response is sent. QUERY_BUDGET_MODE=log (default) logs requests
+over budget, =enforce raises QueryBudgetExceeded so the test client fails loudly
+(benchmarks/query_budget_check.py runs every route this way against generated data
+of two sizes), =off skips the check.
+
+The budgets are absolute ceilings. The growth rule (a route may run at most one
+more statement on the medium data set than on the small one) lives in
+benchmarks/query_budget_check.py, not here. tests/test_query_budgets.py runs the
+ceilings and route coverage on the small data set under pytest.
+"""
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+MODE = os.getenv("QUERY_BUDGET_MODE", "log").strip().lower()
+
+BUDGETS: Dict[Tuple[str, str], int] = {
+    ("GET", "/"): 0,
+    ("GET", "/version"): 0,
+    ("GET", "/health/db-pool"): 0,
+    ("GET", "/seed"): 9,
+
+    ("GET", "/auth/me"): 2,
+    ("POST", "/auth/login"): 2,
+    ("POST", "/auth/logout-all"): 4,
+
+    ("GET", "/availabilities/"): 3,
+    ("POST", "/availabilities/update"): 5,
+    ("DELETE", "/availabilities/lecturer/{lecturer_id}"): 4,
+
+    ("GET", "/domains/"): 3,
+    ("POST", "/domains/"): 5,
+
+    ("GET", "/groups/"): 2,
+    ("POST", "/groups/"): 10,
+    ("PUT", "/groups/{id}"): 10,
+    ("DELETE", "/groups/{id}"): 9,
+
+    ("GET", "/lecturers/"): 5,
+    ("GET", "/lecturers/me"): 5,
+    ("GET", "/lecturers/workload"): 3,
+    ("GET", "/lecturers/{id}/modules"): 4,
+    ("POST", "/lecturers/"): 9,
+    ("PUT", "/lecturers/{id}"): 11,
+    ("PUT", "/lecturers/{id}/modules"): 11,
+    ("PATCH", "/lecturers/me"): 8,
+    ("DELETE", "/lecturers/{id}"): 8,
+
+    ("GET", "/modules/"): 4,
+    ("POST", "/modules/"): 6,
+    ("PUT", "/modules/{module_code}"): 10,
+    ("DELETE", "/modules/{module_code}"): 9,
+
+    ("GET", "/offered-modules/"): 3,
+    ("GET", "/offered-modules/{id}/candidate-rooms"): 4,
+    ("POST", "/offered-modules/"): 10,
+    ("PUT", "/offered-modules/{id}"): 7,
+    ("DELETE", "/offered-modules/{id}"): 5,
+
+    ("GET", "/rooms/"): 3,
+    ("POST", "/rooms/"): 9,
+    ("PUT", "/rooms/{id}"): 10,
+    ("DELETE", "/rooms/{id}"): 9,
+
+    ("GET", "/schedule/"): 3,
+    ("GET", "/schedule/export"): 4,
+    ("GET", "/schedule/free-slots"): 9,
+    ("GET", "/schedule/invalid"): 6,
+    ("POST", "/schedule/"): 6,
+    ("POST", "/schedule/bulk"): 7,
+    ("POST", "/schedule/solve"): 13,
+    ("POST", "/schedule/repair"): 10,
+    ("DELETE", "/schedule/{id}"): 4,
+
+    ("GET", "/scheduler-constraints/"): 3,
+    ("GET", "/scheduler-constraints/compiled"): 3,
+    ("POST", "/scheduler-constraints/"): 4,
+    ("PUT", "/scheduler-constraints/{id}"): 5,
+    ("DELETE", "/scheduler-constraints/{id}"): 4,
+
+    ("GET", "/semesters/"): 2,
+    ("POST", "/semesters/"): 5,
+    ("DELETE", "/semesters/{semester_id}"): 4,
+
+    ("GET", "/specializations/"): 3,
+    ("POST", "/specializations/"): 4,
+    ("PUT", "/specializations/{id}"): 5,
+    ("DELETE", "/specializations/{id}"): 5,
+
+    ("GET", "/study-programs/"): 5,
+    ("POST", "/study-programs/"): 4,
+    ("PUT", "/study-programs/{program_id}"): 5,
+    ("DELETE", "/study-programs/{program_id}"): 4,
+
+    ("GET", "/workspace/"): 8,
+}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+exceeded: Dict[Tuple[str, str], int] = {}
+_lock = threading.Lock()
+
+
+def check(method: str, route: str, statements: int):
+    if MODE == "off":
+        return
+    budget = BUDGETS.get((method, route))
+    if budget is None or statements <= budget:
+        return
+    with _lock:
+        exceeded[(method, route)] = exceeded.get((method, route), 0) + 1
+    message = f"{method} {route} ran {statements} SQL statements (budget {budget})"
+    if MODE == "enforce":
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
@@ -0,0 +1,231 @@
+# api/repair.py
+"""
+Incremental schedule repair.
+
+Editing a lecturer's availability or a SchedulerConstraint can leave stored
+entries in places that are no longer allowed. check() re-validates the entries
+of a semester that such a change can reach (one lecturer's entries, or those
+the constraint targets; everything for university-wide rules) against the
+opening days and hours, room closures, lecturer availability and the slot-level
+constraints, and reports the ones that fail with a reason.
+
+repair() re-places only those: every other entry of the semester is pinned on
+the solver board (api/solver.py) and each invalid entry becomes one task that
+keeps its length and prefers its current room. A local change is a handful of
+tasks against pinned intervals, so the search runs in-process and stops as
+soon as everything is placed. Nothing in here writes to the DB.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models, room_index, solver
+from . import constraint_compiler as cc
+from .availability import WeekMask, mask_for
+from .timeutils import day_index, to_minutes
+
+DEFAULT_TIME_LIMIT = 0.5
+MAX_TIME_LIMIT = 30.0
+
+# constraint scopes whose target narrows the entries a change can affect (university: a campus)
+_TARGETED_SCOPES = ("lecturer", "module", "program", "room", "university")
+
+
+@dataclass
+class Check:
+    semester: str
+    policy: solver.Policy
+    slot_rules: List[cc.CompiledConstraint]
+    availability: Dict[int, WeekMask]  # only the checked lecturer's when check() was given one
+    rows: list  # every entry of the semester, see _rows()
+    invalid: Dict[int, str] = field(default_factory=dict)  # entry id -> reason
+
+
+def _rows(db: Session, semester: str) -> list:
+    E, O, M, R = models.ScheduleEntry, models.OfferedModule, models.Module, models.Room
+    return db.execute(
+        select(E.id, E.offered_module_id, E.room_id, E.day_of_week, E.start_time, E.end_time,
+               O.lecturer_id, O.module_code, M.program_id, M.semester.label("study_semester"),
+               R.location.label("room_location"))
+        .select_from(E)
+        .outerjoin(O, O.id == E.offered_module_id)
+        .outerjoin(M, M.module_code == O.module_code)
+        .outerjoin(R, R.id == E.room_id)
+        .where(E.semester == semester)
+        .order_by(E.id)
+    ).all()
+
+
+def _slot(row):
+    day, start, end = day_index(row.day_of_week), to_minutes(row.start_time), to_minutes(row.end_time)
+    if day is None or start is None or end is None or end <= start:
+        return None
+    return day, start, end
+
+
+def _placement(row, day, start, end) -> cc.Placement:
+    return cc.Placement(day=day, start=start, end=end, room_id=row.room_id, room_location=row.room_location,
+                        lecturer_id=row.lecturer_id, module_code=row.module_code, program_id=row.program_id)
+
+
+def _violation(found: Check, p: cc.Placement) -> Optional[str]:
+    policy = found.policy
+    if p.day not in policy.open_days or p.start < policy.day_start or p.end > policy.day_end:
+        return "Outside the opening days or hours"
+    if p.room_id is not None and p.day in policy.closed_days(p.room_id):
+        return "Room is closed on that day"
+    available = found.availability.get(p.lecturer_id)
+    if available is not None and not available.contains(WeekMask.slot(p.day, p.start, p.end)):
+        return "Lecturer is not available at that time"
+    broken = next((r for r in found.slot_rules if not r.allows(p)), None)
+    if broken is not None:
+        return f"Violates constraint #{broken.id} ({broken.category or broken.kind})"
+    return None
+
+
+def check(db: Session, semester: str, lecturer_id: Optional[int] = None,
+          constraint_id: Optional[int] = None) -> Check:
+    """Entries of the semester invalidated by a change to `lecturer_id`'s availability or to `constraint_id`."""
+    changed = None
+    if constraint_id is not None:
+        row = db.get(models.SchedulerConstraint, constraint_id)
+        if not row:
+            raise HTTPException(status_code=404, detail="Constraint not found")
+        changed = cc.compile_constraint(row)
+
+    rules = solver.active_constraints(db, semester)
+    query = db.query(models.LecturerAvailability)
+    if lecturer_id is not None:
+        query = query.filter(models.LecturerAvailability.lecturer_id == lecturer_id)
+    found = Check(
+        semester=semester,
+        policy=solver.read_policy(rules),
+        slot_rules=solver.slot_constraints(rules),
+        availability={a.lecturer_id: mask_for(a) for a in query.all()},
+        rows=_rows(db, semester),
+    )
+    # same room closures as the solver: room rules, all-rooms rules and closed campuses
+    found.policy.locate_rooms({row.room_id: row.room_location for row in found.rows if row.room_id is not None})
+
+    for row in found.rows:
+        slot = _slot(row)
+        if slot is None or (lecturer_id is not None and row.lecturer_id != lecturer_id):
+            continue
+        p = _placement(row, *slot)
+        if changed is not None and changed.scope in _TARGETED_SCOPES and not changed.targets(p):
+            continue
+        reason = _violation(found, p)
+        if reason:
+            found.invalid[row.id] = reason
+    return found
+
+
+def _clear_of(placements: Dict[int, tuple], rows: Dict[int, tuple], unplaced: Dict[int, str]) -> Dict[int, tuple]:
+    """
+    Placements that do not collide with an unplaced entry's old position. Dropping one leaves that
+    entry where it was too, so repeat until nothing else collides.
+    """
+    placements = dict(placements)
+    while True:
+        held = {}
+        for entry_id in unplaced:
+            if entry_id in rows:
+                row, cohort, (day, start, end) = rows[entry_id]
+                for key in (("L", row.lecturer_id), ("C", cohort), ("R", row.room_id)):
+                    if key[1] is not None:
+                        held.setdefault((key, day), []).append((start, end))
+        dropped = []
+        for entry_id, (day, start, end, room_id) in placements.items():
+            row, cohort, _ = rows[entry_id]
+            if any(s < end and start < e
+                   for key in (("L", row.lecturer_id), ("C", cohort), ("R", room_id)) if key[1] is not None
+                   for s, e in held.get((key, day), ())):
+                dropped.append(entry_id)
+        if not dropped:
+            return placements
+        for entry_id in dropped:
+            del placements[entry_id]
+            unplaced[entry_id] = "No conflict-free slot found within the time limit"
+
+
+def repair(db: Session, found: Check,
+           time_limit: float = DEFAULT_TIME_LIMIT) -> Tuple[Dict[int, Tuple[int, int, int, int]], Dict[int, str]]:
+    """
+    Re-place the invalid entries of `found` around the pinned rest. Returns entry id -> (day, start, end,
+    room) for the moved entries and entry id -> reason for those that found no valid place.
+    """
+    if not found.invalid:
+        return {}, {}
+    time_limit = max(0.1, min(float(time_limit), MAX_TIME_LIMIT))
+    problem = solver.Problem(semester=found.semester, day_start=found.policy.day_start)
+    broken = []
+    for row in found.rows:
+        slot = _slot(row)
+        if slot is None:
+            continue
+        cohort = (row.program_id, row.study_semester) if row.program_id is not None else None
+        if row.id in found.invalid:
+            broken.append((row, cohort, slot))
+        else:
+            problem.pinned.append((row.lecturer_id, cohort, row.room_id, *slot))
+
+    candidates = room_index.candidates(db, found.semester, {row.offered_module_id for row, _, _ in broken})
+    if found.policy.campus_closures:
+        room_ids = {room_id for rooms in candidates.values() for room_id in rooms}
+        found.policy.locate_rooms(dict(
+            db.query(models.Room.id, models.Room.location).filter(models.Room.id.in_(room_ids))
+        ))
+
+    policy = found.policy
+    unrestricted = WeekMask.full()
+    masks: Dict[solver.Slot, WeekMask] = {}
+    for row, cohort, (day, start, end) in broken:
+        rooms = candidates.get(row.offered_module_id, ())
+        if row.room_id in rooms:
+            # moving the session in time is less disruptive than also changing its room
+            rooms = (row.room_id,) + tuple(r for r in rooms if r != row.room_id)
+        for room_id in rooms:
+            closed = policy.closed_days(room_id)
+            if closed:
+                problem.room_closed_days[room_id] = closed
+        slots = solver.candidate_slots(
+            policy, end - start, found.availability.get(row.lecturer_id, unrestricted), found.slot_rules,
+            row.lecturer_id, row.module_code, row.program_id, masks,
+        )
+        if not slots:
+            problem.unplaceable[row.id] = "No time slot within opening hours and lecturer availability"
+        elif not rooms:
+            problem.unplaceable[row.id] = "No active room of the required type, capacity and equipment"
+        else:
+            problem.tasks.append(solver.Task(
+                offer_id=row.offered_module_id, entry_id=row.id, lecturer_id=row.lecturer_id,
+                cohort=cohort, slots=tuple(slots), rooms=rooms,
+            ))
+
+    # an entry without a new place keeps its old one, so it must block the others: pin it and search again
+    deadline = time.monotonic() + time_limit
+    unplaced = dict(problem.unplaceable)
+    rows = {row.id: (row, cohort, slot) for row, cohort, slot in broken}
+    pending = dict(rows)
+    placements: Dict[int, tuple] = {}
+    while True:
+        if time.monotonic() >= deadline:
+            # solve() would still spend its 0.1 s minimum on every further round: keep what the last
+            # round placed clear of the entries that stay where they are, and leave the rest
+            unplaced.update({entry_id: "No conflict-free slot found within the time limit"
+                             for entry_id in pending if entry_id not in unplaced and entry_id not in placements})
+            return _clear_of(placements, rows, unplaced), unplaced
+        for entry_id in unplaced:
+            if entry_id in pending:
+                row, cohort, slot = pending.pop(entry_id)
+                problem.pinned.append((row.lecturer_id, cohort, row.room_id, *slot))
+        problem.tasks = [t for t in problem.tasks if t.entry_id in pending]
+        result = solver.solve(problem, time_limit=deadline - time.monotonic(), workers=1)
+        placements = result.placements
+        if not result.unplaced:
+            return placements, unplaced
+        unplaced.update({entry_id: "No conflict-free slot found within the time limit" for entry_id in result.unplaced})
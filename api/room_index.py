@@ -0,0 +1,202 @@
+# api/room_index.py
+"""
+Room-suitability candidate index.
+
+RoomCandidate rows list, per offered module, every room that can host it: an
+active room of the module's room_type, large enough for the program's largest
+group, and carrying all of the module's equipment. Readers (GET
+/offered-modules/{id}/candidate-rooms, the solver) join the rows with rooms and
+order them best fit first (smallest capacity, then id) instead of scanning
+every room.
+
+The free-text equipment lists ("Projector, PC") are parsed into bitmasks, so a
+room fits when `room_mask & need == need`. Bits are assigned per process and
+never stored; only the resulting (offer, room) pairs are.
+
+The index is kept current from Session.after_flush: a changed room is re-checked
+against every offer, a changed module, group or offer only re-checks the offers
+it affects against every room. Core-level bulk inserts bypass the ORM events, so
+their callers (and ensure_schema on first run) call rebuild().
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, or_, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from . import models
+
+# fixed low bits for the equipment the room form suggests; anything else is assigned on first sight
+EQUIPMENT = ("projector", "pc", "whiteboard", "smartboard", "microphone", "camera")
+_SYNONYMS = {"beamer": "projector", "computer": "pc", "computers": "pc", "pcs": "pc",
+             "mic": "microphone", "webcam": "camera"}
+
+_bits: Dict[str, int] = {name: i for i, name in enumerate(EQUIPMENT)}
+_bits_lock = threading.Lock()
+
+RC, R, O, M, G = models.RoomCandidate, models.Room, models.OfferedModule, models.Module, models.Group
+
+
+def _norm(s) -> str:
+    return " ".join((str(s) if s is not None else "").split()).lower()
+
+
+def equipment_items(text: Optional[str]) -> List[str]:
+    items = (_norm(part) for part in re.split(r"[,;/\n]+", text or ""))
+    return [_SYNONYMS.get(item, item) for item in items if item]
+
+
+def equipment_mask(text: Optional[str]) -> int:
+    mask = 0
+    for item in equipment_items(text):
+        bit = _bits.get(item)
+        if bit is None:
+            with _bits_lock:
+                bit = _bits.setdefault(item, len(_bits))
+        mask |= 1 << bit
+    return mask
+
+
+def _demand(conn: Connection, program_ids: Iterable[int]) -> Dict[int, int]:
+    """Largest student group per program."""
+    program_ids = {p for p in program_ids if p is not None}
+    if not program_ids:
+        return {}
+    rows = conn.execute(
+        select(G.program_id, func.max(G.size)).where(G.program_id.in_(program_ids)).group_by(G.program_id)
+    ).all()
+    return {pid: size or 0 for pid, size in rows}
+
+
+def _pairs(conn: Connection, offer_filter, room_ids: Optional[Iterable[int]] = None) -> List[dict]:
+    stmt = select(O.id, M.room_type, M.equipment, M.program_id).join(M, M.module_code == O.module_code)
+    if offer_filter is not None:
+        stmt = stmt.where(offer_filter)
+    offers = conn.execute(stmt).all()
+    if not offers:
+        return []
+
+    stmt = select(R.id, R.type, R.capacity, R.equipment).where(R.status == True)  # noqa: E712
+    if room_ids is not None:
+        stmt = stmt.where(R.id.in_(list(room_ids)))
+    by_type: Dict[str, List[Tuple[int, int, int]]] = {}
+    for room_id, room_type, capacity, equipment in conn.execute(stmt):
+        by_type.setdefault(_norm(room_type), []).append((room_id, capacity or 0, equipment_mask(equipment)))
+
+    demand = _demand(conn, (program_id for *_, program_id in offers))
+    # offers with the same requirements share one scan of the rooms of their type
+    fitting: Dict[tuple, List[int]] = {}
+    pairs = []
+    for offer_id, room_type, equipment, program_id in offers:
+        need = (_norm(room_type), equipment_mask(equipment), demand.get(program_id, 0))
+        if need not in fitting:
+            fitting[need] = [
+                room_id for room_id, capacity, mask in by_type.get(need[0], ())
+                if capacity >= need[2] and mask & need[1] == need[1]
+            ]
+        pairs += [{"offered_module_id": offer_id, "room_id": room_id} for room_id in fitting[need]]
+    return pairs
+
+
+def _write(conn: Connection, stale, pairs: List[dict]):
+    conn.execute(delete(RC).where(stale) if stale is not None else delete(RC))
+    if pairs:
+        conn.execute(insert(RC), pairs)
+
+
+def refresh_rooms(conn: Connection, room_ids: Iterable[int]):
+    """Re-check these rooms against every offer (deleted or deactivated rooms drop out)."""
+    room_ids = sorted(set(room_ids))
+    if room_ids:
+        _write(conn, RC.room_id.in_(room_ids), _pairs(conn, None, room_ids))
+
+
+def refresh_offers(conn: Connection, offer_filter):
+    """Re-check the offers matching `offer_filter` (a where clause on OfferedModule / Module) against every room."""
+    offer_ids = select(O.id).join(M, M.module_code == O.module_code, isouter=True).where(offer_filter)
+    _write(conn, RC.offered_module_id.in_(offer_ids), _pairs(conn, offer_filter))
+
+
+def rebuild(conn: Connection) -> int:
+    pairs = _pairs(conn, None)
+    _write(conn, None, pairs)
+    return len(pairs)
+
+
+def candidates(db: Session, semester: str, offer_ids: Optional[Iterable[int]] = None) -> Dict[int, Tuple[int, ...]]:
+    """Offer id -> candidate room ids, best fit first, for every offer of the semester (or just `offer_ids`)."""
+    stmt = (
+        select(RC.offered_module_id, RC.room_id)
+        .join(R, R.id == RC.room_id)
+        .join(O, O.id == RC.offered_module_id)
+        .where(O.semester == semester)
+        .order_by(RC.offered_module_id, R.capacity, R.id)
+    )
+    if offer_ids is not None:
+        stmt = stmt.where(RC.offered_module_id.in_(sorted(set(offer_ids))))
+    rows = db.execute(stmt).all()
+    out: Dict[int, List[int]] = {}
+    for offer_id, room_id in rows:
+        out.setdefault(offer_id, []).append(room_id)
+    return {offer_id: tuple(room_ids) for offer_id, room_ids in out.items()}
+
+
+# ---------------------------------------------------------
+# Incremental upkeep
+# ---------------------------------------------------------
+
+_ROOM_FIELDS = ("type", "capacity", "status", "equipment")
+_MODULE_FIELDS = ("room_type", "equipment", "program_id")
+_GROUP_FIELDS = ("size", "program_id")
+
+
+def _changed(obj, names) -> bool:
+    attrs = inspect(obj).attrs
+    return any(getattr(attrs, name).history.has_changes() for name in names)
+
+
+def _old_and_new(obj, name) -> set:
+    history = getattr(inspect(obj).attrs, name).history
+    return {v for v in (*history.added, *history.unchanged, *history.deleted) if v is not None}
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session: Session, flush_context):
+    rooms, modules, programs, offers, dropped = set(), set(), set(), set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        is_new_or_deleted = obj in session.new or obj in session.deleted
+        if isinstance(obj, models.Room):
+            if is_new_or_deleted or _changed(obj, _ROOM_FIELDS):
+                rooms.add(obj.id)
+        elif isinstance(obj, models.Module):
+            if is_new_or_deleted or _changed(obj, _MODULE_FIELDS):
+                modules.add(obj.module_code)
+        elif isinstance(obj, models.Group):
+            if is_new_or_deleted or _changed(obj, _GROUP_FIELDS):
+                programs |= _old_and_new(obj, "program_id")
+        elif isinstance(obj, models.OfferedModule):
+            if obj in session.deleted:
+                dropped.add(obj.id)
+            elif obj in session.new or _changed(obj, ("module_code",)):
+                offers.add(obj.id)
+
+    clauses = []
+    if offers:
+        clauses.append(O.id.in_(offers))
+    if modules:
+        clauses.append(O.module_code.in_(modules))
+    if programs:
+        clauses.append(M.program_id.in_(programs))
+    if not (rooms or clauses or dropped):
+        return
+
+    conn = session.connection()
+    if dropped:
+        # SQLite does not enforce the ON DELETE CASCADE
+        conn.execute(delete(RC).where(RC.offered_module_id.in_(dropped)))
+    if rooms:
+        refresh_rooms(conn, rooms)
+    if clauses:
+        refresh_offers(conn, or_(*clauses))
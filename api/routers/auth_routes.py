@@ -1,35 +1,51 @@
 # api/routers/auth_routes.py
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from .. import models, schemas, auth
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+
+async def _find_user(db: AsyncSession, email: str):
+    return (await db.execute(select(models.User).where(models.User.email == email))).scalars().first()
+
+
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: schemas.LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.email == form_data.email).first()
-    if not user or not auth.verify_password(form_data.password, user.password_hash):
+async def login(form_data: schemas.LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    # DB work is awaited on the async engine, bcrypt runs on its own pool; the event loop never blocks
+    user = await _find_user(db, form_data.email)
+    if not user:
+        await auth.dummy_verify()
         raise HTTPException(status_code=400, detail="Incorrect email/password")
 
-    safe_lec_id = user.lecturer_id if user.lecturer_id is not None else 0
-
-    access_token = auth.create_access_token(data={
-        "sub": user.email,
-        "role": user.role,
-        "lecturer_id": safe_lec_id
-    })
+    valid, new_hash = await auth.verify_and_update_password(form_data.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Incorrect email/password")
 
-    return {
-        "access_token": access_token,
+    claims = auth.token_claims(user)
+    response = {
+        "access_token": auth.create_access_token(data=claims),
         "token_type": "bearer",
         "role": user.role,
         "lecturer_id": user.lecturer_id
     }
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    return response
+
+@router.post("/logout-all")
+async def logout_all(db: AsyncSession = Depends(get_async_db),
+                     current_user: models.User = Depends(auth.get_current_user)):
+    """Revokes every token of the current user, including the one used for this call."""
+    await auth.revoke_tokens(db, current_user.id)
+    return {"ok": True}
 
 @router.get("/me")
-def me(current_user: models.User = Depends(auth.get_current_user)):
+async def me(current_user: models.User = Depends(auth.get_current_user)):
     return {
         "email": current_user.email,
         "role": current_user.role,
@@ -1,25 +1,30 @@
 # api/routers/availabilities.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from .. import models, schemas, auth
+from ..availability import compile_row, forget
+from ..pagination import Page, paginate
 from ..permissions import role_of, is_admin_or_pm, require_lecturer_link
 
 router = APIRouter(prefix="/availabilities", tags=["availabilities"])
 
 @router.get("/", response_model=List[schemas.AvailabilityResponse])
-def read_availabilities(db: Session = Depends(get_db),
+def read_availabilities(response: Response, lecturer_id: Optional[int] = None, page: Page = Depends(),
+                        db: Session = Depends(get_db),
                         current_user: models.User = Depends(auth.get_current_user)):
     r = role_of(current_user)
+    query = db.query(models.LecturerAvailability)
     if is_admin_or_pm(current_user):
-        return db.query(models.LecturerAvailability).all()
+        if lecturer_id is not None:
+            query = query.filter(models.LecturerAvailability.lecturer_id == lecturer_id)
+        return paginate(query, models.LecturerAvailability.id, page, response)
     if r == "lecturer":
         lec_id = require_lecturer_link(current_user)
-        return db.query(models.LecturerAvailability).filter(
-            models.LecturerAvailability.lecturer_id == lec_id
-        ).all()
+        query = query.filter(models.LecturerAvailability.lecturer_id == lec_id)
+        return paginate(query, models.LecturerAvailability.id, page, response)
     raise HTTPException(status_code=403, detail="Not allowed")
 
 @router.post("/update", response_model=schemas.AvailabilityResponse)
@@ -44,12 +49,14 @@ def update_availability(payload: schemas.AvailabilityUpdate, db: Session = Depen
         existing.schedule_data = payload.schedule_data
         db.commit()
         db.refresh(existing)
+        compile_row(existing)
         return existing
 
     row = models.LecturerAvailability(**payload.model_dump())
     db.add(row)
     db.commit()
     db.refresh(row)
+    compile_row(row)
     return row
 
 @router.delete("/lecturer/{lecturer_id}")
@@ -71,4 +78,5 @@ def delete_availability(lecturer_id: int, db: Session = Depends(get_db),
     if row:
         db.delete(row)
         db.commit()
+        forget(row.id)
     return {"ok": True}
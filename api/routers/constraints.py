@@ -1,11 +1,13 @@
 # api/routers/constraints.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from .. import models, schemas, auth
-from ..permissions import role_of, is_admin_or_pm, hosp_can_manage_constraint
+from ..constraint_compiler import compile_all, forget
+from ..pagination import Page, paginate
+from ..permissions import PermissionContext, get_permission_context
 
 router = APIRouter(tags=["constraints"])
 
@@ -15,20 +17,30 @@ router = APIRouter(tags=["constraints"])
 
 # ---- scheduler constraints ----
 @router.get("/scheduler-constraints/", response_model=List[schemas.SchedulerConstraintResponse])
-def read_scheduler_constraints(db: Session = Depends(get_db),
-                               current_user: models.User = Depends(auth.get_current_user)):
-    return db.query(models.SchedulerConstraint).all()
+def read_scheduler_constraints(response: Response, scope: Optional[str] = None, page: Page = Depends(),
+                               db: Session = Depends(get_db),
+                               perm: PermissionContext = Depends(get_permission_context)):
+    query = db.query(models.SchedulerConstraint)
+    if scope:
+        query = query.filter(models.SchedulerConstraint.scope == scope)
+    return paginate(query, models.SchedulerConstraint.id, page, response)
+
+@router.get("/scheduler-constraints/compiled")
+def read_compiled_constraints(db: Session = Depends(get_db),
+                              perm: PermissionContext = Depends(get_permission_context)):
+    """Structured form of every enabled constraint, as the scheduler evaluates it."""
+    rows = db.query(models.SchedulerConstraint).filter(models.SchedulerConstraint.is_enabled == True).all()  # noqa: E712
+    return [c.to_dict() for c in compile_all(rows)]
 
 @router.post("/scheduler-constraints/", response_model=schemas.SchedulerConstraintResponse)
 def create_scheduler_constraint(p: schemas.SchedulerConstraintCreate, db: Session = Depends(get_db),
-                                current_user: models.User = Depends(auth.get_current_user)):
+                                perm: PermissionContext = Depends(get_permission_context)):
     # Permission Check
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
+    elif perm.is_hosp:
         # logic relies on scope/target_id which exist in the new schema
-        if not hosp_can_manage_constraint(db, current_user, p.scope, p.target_id):
+        if not perm.can_manage_constraint(p.scope, p.target_id):
             raise HTTPException(status_code=403, detail="HoSP can only manage Program-scoped constraints for their program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
@@ -42,23 +54,22 @@ def create_scheduler_constraint(p: schemas.SchedulerConstraintCreate, db: Sessio
 
 @router.put("/scheduler-constraints/{id}", response_model=schemas.SchedulerConstraintResponse)
 def update_scheduler_constraint(id: int, p: schemas.SchedulerConstraintUpdate, db: Session = Depends(get_db),
-                                current_user: models.User = Depends(auth.get_current_user)):
+                                perm: PermissionContext = Depends(get_permission_context)):
     row = db.query(models.SchedulerConstraint).filter(models.SchedulerConstraint.id == id).first()
     if not row:
         raise HTTPException(status_code=404, detail="Constraint not found")
 
     # Permission Check
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
-        if not hosp_can_manage_constraint(db, current_user, row.scope, row.target_id):
+    elif perm.is_hosp:
+        if not perm.can_manage_constraint(row.scope, row.target_id):
             raise HTTPException(status_code=403, detail="Unauthorized")
 
         # Check if they are trying to move it out of their scope
         new_scope = p.scope if p.scope is not None else row.scope
         new_target = p.target_id if p.target_id is not None else row.target_id
-        if not hosp_can_manage_constraint(db, current_user, new_scope, new_target):
+        if not perm.can_manage_constraint(new_scope, new_target):
             raise HTTPException(status_code=403, detail="Cannot move constraint out of program scope")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
@@ -74,21 +85,21 @@ def update_scheduler_constraint(id: int, p: schemas.SchedulerConstraintUpdate, d
 
 @router.delete("/scheduler-constraints/{id}")
 def delete_scheduler_constraint(id: int, db: Session = Depends(get_db),
-                                current_user: models.User = Depends(auth.get_current_user)):
+                                perm: PermissionContext = Depends(get_permission_context)):
     row = db.query(models.SchedulerConstraint).filter(models.SchedulerConstraint.id == id).first()
     if not row:
         return {"ok": True}
 
     # Permission Check
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
-        if not hosp_can_manage_constraint(db, current_user, row.scope, row.target_id):
+    elif perm.is_hosp:
+        if not perm.can_manage_constraint(row.scope, row.target_id):
             raise HTTPException(status_code=403, detail="Unauthorized")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
 
     db.delete(row)
     db.commit()
+    forget(id)
     return {"ok": True}
\ No newline at end of file
@@ -1,11 +1,13 @@
 # api/routers/groups.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from .. import models, schemas, auth
-from ..permissions import role_of, is_admin_or_pm, group_payload_in_hosp_domain
+from ..migrations import program_lookup
+from ..pagination import Page, paginate
+from ..permissions import PermissionContext, get_permission_context
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
@@ -14,8 +16,26 @@ router = APIRouter(prefix="/groups", tags=["groups"])
 # Al borrar "current_user = Depends(...)", eliminamos al portero.
 # No hay chequeo de rol -> No hay error 403.
 @router.get("/", response_model=List[schemas.GroupResponse])
-def read_groups(db: Session = Depends(get_db)):
-    return db.query(models.Group).all()
+def read_groups(response: Response, program_id: Optional[int] = None, page: Page = Depends(),
+                db: Session = Depends(get_db)):
+    query = db.query(models.Group)
+    if program_id is not None:
+        query = query.filter(models.Group.program_id == program_id)
+    return paginate(query, models.Group.id, page, response)
+
+
+def _link_program(db: Session, data: dict):
+    """Keep program_id and the program label in step; program_id wins when both are sent."""
+    if data.get("program_id") is not None:
+        program = db.query(models.StudyProgram.name).filter(models.StudyProgram.id == data["program_id"]).first()
+        if not program:
+            raise HTTPException(status_code=400, detail="Unknown program_id")
+        if not data.get("program"):
+            data["program"] = program.name
+    elif "program" in data:
+        label = (data["program"] or "").strip().lower()
+        programs = db.query(models.StudyProgram.id, models.StudyProgram.name, models.StudyProgram.acronym).all()
+        data["program_id"] = program_lookup(programs).get(label) if label else None
 
 
 # --- ESCRITURA (POST/PUT/DELETE) ---
@@ -24,13 +44,15 @@ def read_groups(db: Session = Depends(get_db)):
 
 @router.post("/", response_model=schemas.GroupResponse)
 def create_group(p: schemas.GroupCreate, db: Session = Depends(get_db),
-                 current_user: models.User = Depends(auth.get_current_user)):
+                 perm: PermissionContext = Depends(get_permission_context)):
     # Solo Admin, PM o HoSP
-    if is_admin_or_pm(current_user) or role_of(current_user) == "hosp":
-        if role_of(current_user) == "hosp" and not group_payload_in_hosp_domain(db, current_user, p.program):
+    if perm.is_admin_or_pm or perm.is_hosp:
+        data = p.model_dump()
+        _link_program(db, data)
+        if perm.is_hosp and not perm.owns_program(data["program_id"]):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
 
-        row = models.Group(**p.model_dump())
+        row = models.Group(**data)
         db.add(row)
         db.commit()
         db.refresh(row)
@@ -40,18 +62,22 @@ def create_group(p: schemas.GroupCreate, db: Session = Depends(get_db),
 
 @router.put("/{id}", response_model=schemas.GroupResponse)
 def update_group(id: int, p: schemas.GroupUpdate, db: Session = Depends(get_db),
-                 current_user: models.User = Depends(auth.get_current_user)):
+                 perm: PermissionContext = Depends(get_permission_context)):
     # Solo Admin, PM o HoSP
-    if is_admin_or_pm(current_user) or role_of(current_user) == "hosp":
+    if perm.is_admin_or_pm or perm.is_hosp:
         row = db.query(models.Group).filter(models.Group.id == id).first()
         if not row:
             raise HTTPException(status_code=404, detail="Group not found")
 
-        if role_of(current_user) == "hosp":
-            if not group_is_in_hosp_domain(db, current_user, row):
+        if perm.is_hosp:
+            if not perm.owns_program(row.program_id):
                 raise HTTPException(status_code=403, detail="Unauthorized")
 
         data = p.model_dump(exclude_unset=True)
+        if "program" in data or "program_id" in data:
+            _link_program(db, data)
+            if perm.is_hosp and not perm.owns_program(data.get("program_id", row.program_id)):
+                raise HTTPException(status_code=403, detail="Cannot move group to another program")
         for k, v in data.items():
             setattr(row, k, v)
         db.commit()
@@ -62,9 +88,9 @@ def update_group(id: int, p: schemas.GroupUpdate, db: Session = Depends(get_db),
 
 @router.delete("/{id}")
 def delete_group(id: int, db: Session = Depends(get_db),
-                 current_user: models.User = Depends(auth.get_current_user)):
+                 perm: PermissionContext = Depends(get_permission_context)):
     # Solo Admin/PM
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         row = db.query(models.Group).filter(models.Group.id == id).first()
         if row:
             db.delete(row)
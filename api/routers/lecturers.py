@@ -1,30 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List
-
-from ..database import get_db
-from .. import models, schemas, auth
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional
+
+from ..database import get_async_db
+from .. import models, schemas, auth, workload
+from ..pagination import Page, paginate_async
+from ..projection import FIELDS_QUERY, Projection, group_pairs
 from ..permissions import role_of, is_admin_or_pm, require_admin_or_pm, require_lecturer_link
 
 router = APIRouter(prefix="/lecturers", tags=["lecturers"])
 
 
-def _load_lecturer_with_relations(db: Session, lecturer_id: int):
+def _with_relations(stmt):
     # keep your old domain_rel joinedload for backward compatibility,
     # but also load the new many-to-many domains
-    return (
-        db.query(models.Lecturer)
-        .options(
-            joinedload(models.Lecturer.modules),
-            joinedload(models.Lecturer.domain_rel),
-            joinedload(models.Lecturer.domains),
-        )
-        .filter(models.Lecturer.id == lecturer_id)
-        .first()
+    return stmt.options(
+        selectinload(models.Lecturer.modules),
+        joinedload(models.Lecturer.domain_rel),
+        selectinload(models.Lecturer.domains),
     )
 
 
-def _validate_and_fetch_domains(db: Session, domain_ids: List[int]) -> List[models.Domain]:
+async def _load_lecturer_with_relations(db: AsyncSession, lecturer_id: int):
+    # populate_existing: refresh collections of an instance this session already holds
+    return (await db.execute(
+        _with_relations(select(models.Lecturer))
+        .where(models.Lecturer.id == lecturer_id)
+        .execution_options(populate_existing=True)
+    )).scalars().first()
+
+
+async def _validate_and_fetch_domains(db: AsyncSession, domain_ids: List[int]) -> List[models.Domain]:
     if not domain_ids:
         return []
 
@@ -36,7 +44,7 @@ def _validate_and_fetch_domains(db: Session, domain_ids: List[int]) -> List[mode
             seen.add(d)
             unique_ids.append(d)
 
-    found = db.query(models.Domain).filter(models.Domain.id.in_(unique_ids)).all()
+    found = list((await db.execute(select(models.Domain).where(models.Domain.id.in_(unique_ids)))).scalars())
     found_ids = {d.id for d in found}
     missing = [d for d in unique_ids if d not in found_ids]
     if missing:
@@ -56,68 +64,129 @@ def _sync_single_domain_fk(row: models.Lecturer):
         row.domain_id = None
 
 
+def _lecturer_modules(db: Session, ids: list) -> dict:
+    lm = models.lecturer_modules
+    rows = (
+        db.query(lm.c.lecturer_id, models.Module.module_code, models.Module.name)
+        .join(models.Module, models.Module.module_code == lm.c.module_code)
+        .filter(lm.c.lecturer_id.in_(ids))
+        .all()
+    )
+    return group_pairs((lid, {"module_code": code, "name": name}) for lid, code, name in rows)
+
+
+def _lecturer_domains(db: Session, ids: list) -> dict:
+    ld = models.lecturer_domains
+    rows = (
+        db.query(ld.c.lecturer_id, models.Domain.id, models.Domain.name)
+        .join(models.Domain, models.Domain.id == ld.c.domain_id)
+        .filter(ld.c.lecturer_id.in_(ids))
+        .all()
+    )
+    return group_pairs((lid, {"id": did, "name": name}) for lid, did, name in rows)
+
+
+def _lecturer_domain_ids(db: Session, ids: list) -> dict:
+    ld = models.lecturer_domains
+    rows = db.query(ld.c.lecturer_id, ld.c.domain_id).filter(ld.c.lecturer_id.in_(ids)).all()
+    return group_pairs(rows)
+
+
+L = models.Lecturer
+LECTURER_FIELDS = Projection(
+    key=L.id,
+    columns={
+        "first_name": L.first_name, "last_name": L.last_name, "title": L.title,
+        "employment_type": L.employment_type, "personal_email": L.personal_email, "mdh_email": L.mdh_email,
+        "phone": L.phone, "location": L.location, "teaching_load": L.teaching_load,
+        "domain_id": L.domain_id, "domain": models.Domain.name,
+    },
+    joins={"domain": (models.Domain, models.Domain.id == L.domain_id)},
+    collections={"modules": _lecturer_modules, "domains": _lecturer_domains, "domain_ids": _lecturer_domain_ids},
+)
+
+
 @router.get("/", response_model=List[schemas.LecturerResponse])
-def read_lecturers(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+async def read_lecturers(response: Response, domain_id: Optional[int] = None, fields: Optional[str] = FIELDS_QUERY,
+                         page: Page = Depends(),
+                         db: AsyncSession = Depends(get_async_db),
+                         current_user: models.User = Depends(auth.get_current_user)):
     r = role_of(current_user)
+    names = LECTURER_FIELDS.parse(fields)
+
+    if names is not None and (r == "hosp" or is_admin_or_pm(current_user) or r == "lecturer"):
+        stmt = LECTURER_FIELDS.statement(names)
+        if r == "lecturer":
+            stmt = stmt.where(models.Lecturer.id == require_lecturer_link(current_user))
+        if domain_id is not None:
+            stmt = stmt.where(models.Lecturer.domain_id == domain_id)
+        rows = await paginate_async(db, stmt, models.Lecturer.id, page, response, entities=False)
+        return await LECTURER_FIELDS.respond_async(db, rows, names, response)
 
     if r == "hosp" or is_admin_or_pm(current_user):
-        return (
-            db.query(models.Lecturer)
-            .options(
-                joinedload(models.Lecturer.modules),
-                joinedload(models.Lecturer.domain_rel),
-                joinedload(models.Lecturer.domains),
-            )
-            .all()
-        )
+        stmt = _with_relations(select(models.Lecturer))
+        if domain_id is not None:
+            stmt = stmt.where(models.Lecturer.domain_id == domain_id)
+        return await paginate_async(db, stmt, models.Lecturer.id, page, response)
 
     if r == "lecturer":
         lec_id = require_lecturer_link(current_user)
-        lec = (
-            db.query(models.Lecturer)
-            .options(
-                joinedload(models.Lecturer.modules),
-                joinedload(models.Lecturer.domain_rel),
-                joinedload(models.Lecturer.domains),
-            )
-            .filter(models.Lecturer.id == lec_id)
-            .first()
-        )
+        lec = await _load_lecturer_with_relations(db, lec_id)
         return [lec] if lec else []
 
     raise HTTPException(status_code=403, detail="Not allowed")
 
 
+@router.get("/workload", response_model=List[schemas.LecturerWorkload])
+async def read_workload(semester: str, status: Optional[str] = Query(None, pattern="^(over|under|ok|unknown)$"),
+                        tolerance: float = Query(workload.DEFAULT_TOLERANCE, ge=0, le=1),
+                        db: AsyncSession = Depends(get_async_db),
+                        current_user: models.User = Depends(auth.get_current_user)):
+    """Weekly minutes scheduled per lecturer in the semester against their teaching_load, in one query."""
+    r = role_of(current_user)
+    stmt = workload.statement(semester)
+    if r == "lecturer":
+        stmt = stmt.where(models.Lecturer.id == require_lecturer_link(current_user))
+    elif not (r == "hosp" or is_admin_or_pm(current_user)):
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    out = []
+    for lecturer_id, first_name, last_name, teaching_load, minutes, sessions in (await db.execute(stmt)).all():
+        target = workload.parse_teaching_load(teaching_load)
+        row_status = workload.status(minutes, target, tolerance)
+        if status and row_status != status:
+            continue
+        out.append({
+            "lecturer_id": lecturer_id, "first_name": first_name, "last_name": last_name,
+            "teaching_load": teaching_load,
+            "target_min_minutes": target[0] if target else None, "target_max_minutes": target[1] if target else None,
+            "scheduled_minutes": minutes, "sessions": sessions, "status": row_status,
+        })
+    return out
+
+
 @router.get("/me", response_model=schemas.LecturerResponse)
-def get_my_lecturer_profile(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+async def get_my_lecturer_profile(db: AsyncSession = Depends(get_async_db),
+                                  current_user: models.User = Depends(auth.get_current_user)):
     if role_of(current_user) != "lecturer":
         raise HTTPException(status_code=403, detail="Not allowed")
     lec_id = require_lecturer_link(current_user)
-    lec = (
-        db.query(models.Lecturer)
-        .options(
-            joinedload(models.Lecturer.modules),
-            joinedload(models.Lecturer.domain_rel),
-            joinedload(models.Lecturer.domains),
-        )
-        .filter(models.Lecturer.id == lec_id)
-        .first()
-    )
+    lec = await _load_lecturer_with_relations(db, lec_id)
     if not lec:
         raise HTTPException(status_code=404, detail="Lecturer profile not found")
     return lec
 
 
 @router.patch("/me", response_model=schemas.LecturerResponse)
-def update_my_lecturer_profile(
+async def update_my_lecturer_profile(
     p: schemas.LecturerSelfUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
     if role_of(current_user) != "lecturer":
         raise HTTPException(status_code=403, detail="Not allowed")
     lec_id = require_lecturer_link(current_user)
-    lec = db.query(models.Lecturer).filter(models.Lecturer.id == lec_id).first()
+    lec = await db.get(models.Lecturer, lec_id)
     if not lec:
         raise HTTPException(status_code=404, detail="Lecturer profile not found")
 
@@ -130,25 +199,15 @@ def update_my_lecturer_profile(
     for k, v in data.items():
         setattr(lec, k, v)
 
-    db.commit()
-
-    lec = (
-        db.query(models.Lecturer)
-        .options(
-            joinedload(models.Lecturer.modules),
-            joinedload(models.Lecturer.domain_rel),
-            joinedload(models.Lecturer.domains),
-        )
-        .filter(models.Lecturer.id == lec_id)
-        .first()
-    )
-    return lec
+    await db.commit()
+
+    return await _load_lecturer_with_relations(db, lec_id)
 
 
 @router.post("/", response_model=schemas.LecturerResponse)
-def create_lecturer(
+async def create_lecturer(
     p: schemas.LecturerCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
     require_admin_or_pm(current_user)
@@ -161,27 +220,27 @@ def create_lecturer(
     row = models.Lecturer(**data)
 
     # ✅ NEW: set many-to-many domains
-    row.domains = _validate_and_fetch_domains(db, domain_ids)
+    row.domains = await _validate_and_fetch_domains(db, domain_ids)
 
     # ✅ OPTIONAL: keep old single FK synced
     _sync_single_domain_fk(row)
 
     db.add(row)
-    db.commit()
+    await db.commit()
 
-    row = _load_lecturer_with_relations(db, row.id)
+    row = await _load_lecturer_with_relations(db, row.id)
     return row
 
 
 @router.put("/{id}", response_model=schemas.LecturerResponse)
-def update_lecturer(
+async def update_lecturer(
     id: int,
     p: schemas.LecturerUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
     require_admin_or_pm(current_user)
-    row = db.query(models.Lecturer).filter(models.Lecturer.id == id).first()
+    row = await _load_lecturer_with_relations(db, id)
     if not row:
         raise HTTPException(status_code=404, detail="Lecturer not found")
 
@@ -194,49 +253,48 @@ def update_lecturer(
         if domain_ids is None:
             pass
         else:
-            row.domains = _validate_and_fetch_domains(db, domain_ids)
+            row.domains = await _validate_and_fetch_domains(db, domain_ids)
             _sync_single_domain_fk(row)
 
     # keep old behavior for all other fields
     for k, v in data.items():
         setattr(row, k, v)
 
-    db.commit()
+    await db.commit()
 
-    row = _load_lecturer_with_relations(db, id)
+    row = await _load_lecturer_with_relations(db, id)
     return row
 
 
 @router.delete("/{id}")
-def delete_lecturer(
+async def delete_lecturer(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
     require_admin_or_pm(current_user)
-    row = db.query(models.Lecturer).filter(models.Lecturer.id == id).first()
+    row = await db.get(models.Lecturer, id)
     if row:
-        db.delete(row)
-        db.commit()
+        await db.delete(row)
+        await db.commit()
     return {"ok": True}
 
 
 @router.get("/{id}/modules", response_model=List[schemas.ModuleMini])
-def get_lecturer_modules(
+async def get_lecturer_modules(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
     r = role_of(current_user)
     if not (r == "hosp" or is_admin_or_pm(current_user)):
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    lec = (
-        db.query(models.Lecturer)
-        .options(joinedload(models.Lecturer.modules))
-        .filter(models.Lecturer.id == id)
-        .first()
-    )
+    lec = (await db.execute(
+        select(models.Lecturer)
+        .options(selectinload(models.Lecturer.modules))
+        .where(models.Lecturer.id == id)
+    )).scalars().first()
     if not lec:
         raise HTTPException(status_code=404, detail="Lecturer not found")
 
@@ -244,47 +302,30 @@ def get_lecturer_modules(
 
 
 @router.put("/{id}/modules", response_model=schemas.LecturerResponse)
-def set_lecturer_modules(
+async def set_lecturer_modules(
     id: int,
     p: schemas.LecturerModulesUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
     require_admin_or_pm(current_user)
 
-    lec = (
-        db.query(models.Lecturer)
-        .options(
-            joinedload(models.Lecturer.modules),
-            joinedload(models.Lecturer.domain_rel),
-            joinedload(models.Lecturer.domains),
-        )
-        .filter(models.Lecturer.id == id)
-        .first()
-    )
+    lec = await _load_lecturer_with_relations(db, id)
     if not lec:
         raise HTTPException(status_code=404, detail="Lecturer not found")
 
     if not p.module_codes:
         lec.modules = []
     else:
-        mods = db.query(models.Module).filter(models.Module.module_code.in_(p.module_codes)).all()
+        mods = list((await db.execute(
+            select(models.Module).where(models.Module.module_code.in_(p.module_codes))
+        )).scalars())
         found = {m.module_code for m in mods}
         missing = [c for c in p.module_codes if c not in found]
         if missing:
             raise HTTPException(status_code=400, detail=f"Unknown module_code(s): {missing}")
         lec.modules = mods
 
-    db.commit()
-
-    lec = (
-        db.query(models.Lecturer)
-        .options(
-            joinedload(models.Lecturer.modules),
-            joinedload(models.Lecturer.domain_rel),
-            joinedload(models.Lecturer.domains),
-        )
-        .filter(models.Lecturer.id == id)
-        .first()
-    )
-    return lec
+    await db.commit()
+
+    return await _load_lecturer_with_relations(db, id)
@@ -0,0 +1,24 @@
+# api/routers/metrics.py
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from .. import metrics as collected
+
+router = APIRouter(tags=["metrics"])
+
+# when set, scrapers must send "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def require_metrics_token(request: Request):
+    """Also guards /health/db-pool, which exposes the same pool internals."""
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics(request: Request):
+    require_metrics_token(request)
+    return PlainTextResponse(collected.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
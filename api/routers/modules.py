@@ -1,45 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional, Any
-import json
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
 
-from ..database import get_db
+from ..database import get_async_db
 from .. import models, schemas, auth
-from ..permissions import role_of, is_admin_or_pm, hosp_program_ids
+from ..pagination import Page, paginate_async
+from ..projection import FIELDS_QUERY, Projection
+from ..permissions import PermissionContext, get_async_permission_context
 
 router = APIRouter(prefix="/modules", tags=["modules"])
 
 
 
-def _safe_json_load(s: Optional[str]) -> Optional[Any]:
-    if not s or not isinstance(s, str):
-        return None
-    s = s.strip()
-    if not s:
-        return None
-    try:
-        return json.loads(s)
-    except Exception:
-        return None
-
-
-def _parse_module_payload(assessment_type_value: Optional[str]) -> dict:
-    parsed = _safe_json_load(assessment_type_value)
-
-    if isinstance(parsed, list):
-        return {"assessments": parsed, "lecturer_assignments": []}
-
-    if isinstance(parsed, dict):
-        return {
-            "assessments": parsed.get("assessments") or [],
-            "lecturer_assignments": parsed.get("lecturer_assignments") or []
-        }
-
-    if assessment_type_value and isinstance(assessment_type_value, str):
-        return {"assessments": [], "lecturer_assignments": [], "legacy": assessment_type_value}
-
-    return {"assessments": [], "lecturer_assignments": []}
-
 def _normalize_assessments(breakdown) -> List[dict]:
     items = []
     seen = set()
@@ -112,53 +86,85 @@ def _normalize_assessments(breakdown) -> List[dict]:
 
 
 
-def _make_response(row: models.Module) -> schemas.ModuleResponse:
-    payload = _parse_module_payload(row.assessment_type)
-    assessments = payload.get("assessments") or []
+def _make_response(row: models.Module) -> dict:
+    # validated once by the route's response_model
+    return {
+        "module_code": row.module_code,
+        "name": row.name,
+        "ects": row.ects,
+        "room_type": row.room_type,
+        "assessment_type": row.assessment_type,
+        "semester": row.semester,
+        "category": row.category,
+        "program_id": row.program_id,
+        "equipment": row.equipment,
+        "specializations": row.specializations or [],
+        "assessment_breakdown": row.assessment_breakdown or [],
+    }
+
+
+M = models.Module
+MODULE_FIELDS = Projection(
+    key=M.module_code,
+    columns={
+        "name": M.name, "ects": M.ects, "room_type": M.room_type, "assessment_type": M.assessment_type,
+        "semester": M.semester, "category": M.category, "program_id": M.program_id,
+        "equipment": M.equipment, "assessment_breakdown": M.assessment_breakdown,
+    },
+)
 
-    legacy = payload.get("legacy")
-    assessment_type_out = legacy if legacy else row.assessment_type
 
-    return schemas.ModuleResponse(
-        module_code=row.module_code,
-        name=row.name,
-        ects=row.ects,
-        room_type=row.room_type,
-        assessment_type=assessment_type_out,
-        semester=row.semester,
-        category=row.category,
-        program_id=row.program_id,
-        specializations=row.specializations or [],
-        assessment_breakdown=assessments
-    )
+async def _specializations(db: AsyncSession, spec_ids: List[int]) -> List[models.Specialization]:
+    return list((await db.execute(
+        select(models.Specialization).where(models.Specialization.id.in_(spec_ids))
+    )).scalars())
+
+
+async def _module_with_specializations(db: AsyncSession, module_code: str) -> Optional[models.Module]:
+    return (await db.execute(
+        select(models.Module)
+        .where(models.Module.module_code == module_code)
+        .options(selectinload(models.Module.specializations))
+    )).scalars().first()
 
 
 @router.get("/", response_model=List[schemas.ModuleResponse])
-def read_modules(
-    db: Session = Depends(get_db),
+async def read_modules(
+    response: Response,
+    program_id: Optional[int] = None,
+    semester: Optional[int] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user)
 ):
-    rows = (
-        db.query(models.Module)
-        .options(joinedload(models.Module.specializations))
-        .all()
-    )
+    names = MODULE_FIELDS.parse(fields)
+    if names is not None:
+        stmt = MODULE_FIELDS.statement(names)
+    else:
+        stmt = select(models.Module).options(selectinload(models.Module.specializations))
+    if program_id is not None:
+        stmt = stmt.where(models.Module.program_id == program_id)
+    if semester is not None:
+        stmt = stmt.where(models.Module.semester == semester)
+    rows = await paginate_async(db, stmt, models.Module.module_code, page, response, entities=names is None)
+    if names is not None:
+        return await MODULE_FIELDS.respond_async(db, rows, names, response)
     return [_make_response(r) for r in rows]
 
 
 @router.post("/", response_model=schemas.ModuleResponse)
-def create_module(
+async def create_module(
     p: schemas.ModuleCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    perm: PermissionContext = Depends(get_async_permission_context)
 ):
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
+    elif perm.is_hosp:
         if p.program_id is None:
             raise HTTPException(status_code=400, detail="program_id is required")
-        if p.program_id not in hosp_program_ids(db, current_user):
+        if not perm.owns_program(p.program_id):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
@@ -167,52 +173,36 @@ def create_module(
     spec_ids = data.pop("specialization_ids", None)
     assessment_breakdown = data.pop("assessment_breakdown", None)
 
-    if assessment_breakdown is not None:
-        normalized = _normalize_assessments(assessment_breakdown)
-        data["assessment_type"] = json.dumps({"assessments": normalized, "lecturer_assignments": []})
+    normalized = _normalize_assessments(assessment_breakdown)
+    data["assessment_breakdown"] = normalized
+    if normalized and not data.get("assessment_type"):
+        data["assessment_type"] = normalized[0]["type"]
 
     row = models.Module(**data)
-
-    if spec_ids:
-        specs = db.query(models.Specialization).filter(models.Specialization.id.in_(spec_ids)).all()
-        row.specializations = specs
+    row.specializations = await _specializations(db, spec_ids) if spec_ids else []
 
     db.add(row)
-    db.commit()
-    db.refresh(row)
-
-    row = (
-        db.query(models.Module)
-        .filter(models.Module.module_code == row.module_code)
-        .options(joinedload(models.Module.specializations))
-        .first()
-    )
+    await db.commit()
     return _make_response(row)
 
 
 @router.put("/{module_code}", response_model=schemas.ModuleResponse)
-def update_module(
+async def update_module(
     module_code: str,
     p: schemas.ModuleUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    perm: PermissionContext = Depends(get_async_permission_context)
 ):
-    row = (
-        db.query(models.Module)
-        .filter(models.Module.module_code == module_code)
-        .options(joinedload(models.Module.specializations))
-        .first()
-    )
+    row = await _module_with_specializations(db, module_code)
     if not row:
         raise HTTPException(status_code=404, detail="Module not found")
 
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
-        if row.program_id not in hosp_program_ids(db, current_user):
+    elif perm.is_hosp:
+        if not perm.owns_program(row.program_id):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
-        if p.program_id is not None and p.program_id not in hosp_program_ids(db, current_user):
+        if p.program_id is not None and not perm.owns_program(p.program_id):
             raise HTTPException(status_code=403, detail="Cannot move module to another program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
@@ -222,41 +212,40 @@ def update_module(
     if "specialization_ids" in data:
         spec_ids = data.pop("specialization_ids")
         if spec_ids is not None:
-            specs = db.query(models.Specialization).filter(models.Specialization.id.in_(spec_ids)).all()
-            row.specializations = specs
+            row.specializations = await _specializations(db, spec_ids)
 
     assessment_breakdown = data.pop("assessment_breakdown", None)
     if assessment_breakdown is not None:
         normalized = _normalize_assessments(assessment_breakdown)
-        row.assessment_type = json.dumps({"assessments": normalized, "lecturer_assignments": []})
+        row.assessment_breakdown = normalized
+        if normalized and "assessment_type" not in data:
+            row.assessment_type = normalized[0]["type"]
 
     for k, v in data.items():
         setattr(row, k, v)
 
-    db.commit()
-    db.refresh(row)
+    await db.commit()
     return _make_response(row)
 
 
 @router.delete("/{module_code}")
-def delete_module(
+async def delete_module(
     module_code: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(auth.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    perm: PermissionContext = Depends(get_async_permission_context)
 ):
-    row = db.query(models.Module).filter(models.Module.module_code == module_code).first()
+    row = await db.get(models.Module, module_code)
     if not row:
         return {"ok": True}
 
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
-        if row.program_id not in hosp_program_ids(db, current_user):
+    elif perm.is_hosp:
+        if not perm.owns_program(row.program_id):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    db.delete(row)
-    db.commit()
+    await db.delete(row)
+    await db.commit()
     return {"ok": True}
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from typing import List, Optional
 from pydantic import BaseModel
 
-from ..database import get_db
+from ..database import get_async_db
 from .. import models, auth
+from ..pagination import Page, paginate_async
+from ..projection import FIELDS_QUERY, Projection
 
 router = APIRouter(prefix="/offered-modules", tags=["offered-modules"])
 
@@ -33,20 +37,61 @@ class OfferResponse(BaseModel):
         orm_mode = True
 
 
+class CandidateRoom(BaseModel):
+    id: int
+    name: str
+    capacity: int
+    type: str
+    equipment: Optional[str] = None
+    location: Optional[str] = None
+
+
+O, Lec = models.OfferedModule, models.Lecturer
+_module_join = (models.Module, models.Module.module_code == O.module_code)
+_lecturer_join = (Lec, Lec.id == O.lecturer_id)
+OFFER_FIELDS = Projection(
+    key=O.id,
+    columns={
+        "module_code": O.module_code,
+        "module_name": func.coalesce(models.Module.name, "Unknown Module"),
+        "lecturer_id": O.lecturer_id,
+        "lecturer_name": case(
+            (Lec.id.is_(None), "Unassigned"),
+            else_=Lec.first_name + " " + func.coalesce(Lec.last_name, ""),
+        ),
+        "semester": O.semester,
+        "status": O.status,
+    },
+    joins={"module_name": _module_join, "lecturer_name": _lecturer_join},
+)
+
+
 @router.get("/", response_model=List[OfferResponse])
-def get_offers(
+async def get_offers(
+    response: Response,
     semester: str = None,
-    db: Session = Depends(get_db),
+    lecturer_id: Optional[int] = None,
+    fields: Optional[str] = FIELDS_QUERY,
+    page: Page = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    query = db.query(models.OfferedModule).options(
-        joinedload(models.OfferedModule.module),
-        joinedload(models.OfferedModule.lecturer),
-    )
+    names = OFFER_FIELDS.parse(fields)
+    if names is not None:
+        stmt = OFFER_FIELDS.statement(names)
+    else:
+        stmt = select(models.OfferedModule).options(
+            joinedload(models.OfferedModule.module),
+            joinedload(models.OfferedModule.lecturer),
+        )
     if semester:
-        query = query.filter(models.OfferedModule.semester == semester)
+        stmt = stmt.where(models.OfferedModule.semester == semester)
+    if lecturer_id is not None:
+        stmt = stmt.where(models.OfferedModule.lecturer_id == lecturer_id)
 
-    results = query.all()
+    results = await paginate_async(db, stmt, models.OfferedModule.id, page, response, entities=names is None)
+    if names is not None:
+        return await OFFER_FIELDS.respond_async(db, results, names, response)
 
     mapped = []
     for r in results:
@@ -63,25 +108,43 @@ def get_offers(
     return mapped
 
 
+@router.get("/{id}/candidate-rooms", response_model=List[CandidateRoom])
+async def get_candidate_rooms(
+    id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """Rooms that can host the offer (type, capacity for the largest group, equipment), best fit first."""
+    if not await db.get(models.OfferedModule, id):
+        raise HTTPException(status_code=404, detail="Not found")
+
+    R = models.Room
+    rows = (await db.execute(
+        select(R.id, R.name, R.capacity, R.type, R.equipment, R.location)
+        .join(models.RoomCandidate, models.RoomCandidate.room_id == R.id)
+        .where(models.RoomCandidate.offered_module_id == id)
+        .order_by(R.capacity, R.id)
+    )).all()
+    return [dict(r._mapping) for r in rows]
+
+
 @router.post("/", response_model=OfferResponse)
-def create_offer(
+async def create_offer(
     offer: OfferCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    exists = (
-        db.query(models.OfferedModule)
-        .filter(models.OfferedModule.module_code == offer.module_code, models.OfferedModule.semester == offer.semester)
-        .first()
-    )
+    exists = (await db.execute(
+        select(models.OfferedModule.id)
+        .where(models.OfferedModule.module_code == offer.module_code, models.OfferedModule.semester == offer.semester)
+    )).first()
 
     if exists:
         raise HTTPException(status_code=400, detail="This module is already offered in this semester")
 
     new_offer = models.OfferedModule(**offer.dict())
     db.add(new_offer)
-    db.commit()
-    db.refresh(new_offer)
+    await db.commit()
 
     return {
         "id": new_offer.id,
@@ -95,32 +158,32 @@ def create_offer(
 
 # ✅ NEW: update lecturer assignment (supports null => Unassigned)
 @router.put("/{id}", response_model=OfferResponse)
-def update_offer(
+async def update_offer(
     id: int,
     p: OfferUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    item = db.query(models.OfferedModule).filter(models.OfferedModule.id == id).first()
+    item = await db.get(models.OfferedModule, id)
     if not item:
         raise HTTPException(status_code=404, detail="Not found")
 
     # validate lecturer_id if provided
     if p.lecturer_id is not None:
-        lec = db.query(models.Lecturer).filter(models.Lecturer.id == p.lecturer_id).first()
+        lec = await db.get(models.Lecturer, p.lecturer_id)
         if not lec:
             raise HTTPException(status_code=400, detail="Invalid lecturer_id")
 
     item.lecturer_id = p.lecturer_id
-    db.commit()
+    await db.commit()
 
     # reload for correct names
-    item = (
-        db.query(models.OfferedModule)
+    item = (await db.execute(
+        select(models.OfferedModule)
         .options(joinedload(models.OfferedModule.module), joinedload(models.OfferedModule.lecturer))
-        .filter(models.OfferedModule.id == id)
-        .first()
-    )
+        .where(models.OfferedModule.id == id)
+        .execution_options(populate_existing=True)
+    )).scalars().first()
 
     return {
         "id": item.id,
@@ -133,15 +196,15 @@ def update_offer(
 
 
 @router.delete("/{id}")
-def delete_offer(
+async def delete_offer(
     id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(auth.get_current_user),
 ):
-    item = db.query(models.OfferedModule).filter(models.OfferedModule.id == id).first()
+    item = await db.get(models.OfferedModule, id)
     if not item:
         raise HTTPException(status_code=404, detail="Not found")
 
-    db.delete(item)
-    db.commit()
+    await db.delete(item)
+    await db.commit()
     return {"ok": True}
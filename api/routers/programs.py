@@ -1,28 +1,51 @@
 # api/routers/programs.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from .. import models, schemas, auth
+from ..pagination import Page, paginate
 from ..permissions import role_of, is_admin_or_pm
+from ..projection import FIELDS_QUERY, Projection
 
 router = APIRouter(prefix="/study-programs", tags=["study-programs"])
 
 
+P = models.StudyProgram
+PROGRAM_FIELDS = Projection(
+    key=P.id,
+    columns={
+        "name": P.name, "acronym": P.acronym, "status": P.status, "start_date": P.start_date,
+        "total_ects": P.total_ects, "location": P.location, "level": P.level, "degree_type": P.degree_type,
+        "head_of_program_id": P.head_of_program_id,
+    },
+)
+
+
 # ✅ SOLUCIÓN: Permitimos lectura a TODOS los usuarios autenticados
 # Antes tenía un bloqueo si eras estudiante. Ahora lo quitamos.
 @router.get("/", response_model=List[schemas.StudyProgramResponse])
 def read_programs(
+        response: Response,
+        fields: Optional[str] = FIELDS_QUERY,
+        page: Page = Depends(),
         db: Session = Depends(get_db),
         current_user: models.User = Depends(auth.get_current_user),
 ):
     # Students can read programs (read-only in UI)
-    return (
-        db.query(models.StudyProgram)
-        .options(joinedload(models.StudyProgram.head_lecturer))
-        .all()
+    names = PROGRAM_FIELDS.parse(fields)
+    if names is not None:
+        rows = paginate(PROGRAM_FIELDS.query(db, names), models.StudyProgram.id, page, response)
+        return PROGRAM_FIELDS.respond(db, rows, names, response)
+    head = joinedload(models.StudyProgram.head_lecturer)
+    query = db.query(models.StudyProgram).options(
+        # LecturerResponse serialises the head's domains and modules; load them per page, not per row
+        head.selectinload(models.Lecturer.domains),
+        head.selectinload(models.Lecturer.modules),
+        head.joinedload(models.Lecturer.domain_rel),
     )
+    return paginate(query, models.StudyProgram.id, page, response)
 
 
 # --- POST / PUT / DELETE: Mantenemos el bloqueo para estudiantes ---
@@ -1,17 +1,22 @@
 # api/routers/rooms.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from .. import models, schemas, auth
+from ..pagination import Page, paginate
 from ..permissions import require_admin_or_pm
 
 router = APIRouter(prefix="/rooms", tags=["rooms"])
 
 @router.get("/", response_model=List[schemas.RoomResponse])
-def read_rooms(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
-    return db.query(models.Room).all()
+def read_rooms(response: Response, room_type: Optional[str] = Query(None, alias="type"), page: Page = Depends(),
+               db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
+    query = db.query(models.Room)
+    if room_type:
+        query = query.filter(models.Room.type == room_type)
+    return paginate(query, models.Room.id, page, response)
 
 @router.post("/", response_model=schemas.RoomResponse)
 def create_room(p: schemas.RoomCreate, db: Session = Depends(get_db),
@@ -1,12 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+import csv
+import io
+import json
+import time
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
-from pydantic import BaseModel
-from ..database import get_db
-from .. import models, auth
+from typing import List, Optional, Any, Tuple
+from pydantic import BaseModel, ValidationError
+from ..database import get_db, get_async_db, SessionLocal
+from .. import models, auth, free_slots, repair, solver, versions
+from .. import constraint_compiler as cc
+from ..booking import normalize_slot, lock_semester, raise_on_conflict, SlotIndex
+from ..permissions import require_admin_or_pm
+from ..availability import RESOLUTION
+from ..timeutils import DAYS, fmt_minutes, day_index, to_minutes
 
 router = APIRouter(prefix="/schedule", tags=["schedule"])
 
+MAX_BULK_ROWS = 20000
+IN_CHUNK = 500
+EXPORT_BATCH = 500
+
 
 
 class ScheduleCreate(BaseModel):
@@ -33,66 +51,300 @@ class ScheduleResponse(BaseModel):
         orm_mode = True
 
 
+class UnplacedOffer(BaseModel):
+    offered_module_id: int
+    reason: str
 
-@router.get("/", response_model=List[ScheduleResponse])
-def get_schedule(semester: str, db: Session = Depends(get_db)):
 
-    query = db.query(models.ScheduleEntry).filter(
-        models.ScheduleEntry.semester == semester
-    ).options(
+class SolveResponse(BaseModel):
+    semester: str
+    created: int
+    entries: List[ScheduleResponse]
+    unplaced: List[UnplacedOffer]
+    workers: int
+    elapsed_ms: int
+
+
+class InvalidEntry(BaseModel):
+    id: int
+    offered_module_id: int
+    room_id: Optional[int] = None
+    day_of_week: str
+    start_time: str
+    end_time: str
+    reason: str
+
+
+class RepairResponse(BaseModel):
+    semester: str
+    invalid: int
+    moved: List[ScheduleResponse]
+    unplaced: List[InvalidEntry]
+    elapsed_ms: int
+
+
+class FreeSlot(BaseModel):
+    day_of_week: str
+    start_time: str
+    end_time: str
+    room_id: int
+    room_name: str
+    room_capacity: int
+    cohort_conflict: bool
+
+
+class BulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkResult(BaseModel):
+    created: int
+    errors: List[BulkError]
+
+
+def _to_response(r: models.ScheduleEntry) -> dict:
+    mod_name = r.offered_module.module.name if (r.offered_module and r.offered_module.module) else "Unknown"
+    lec_name = "Unassigned"
+    if r.offered_module and r.offered_module.lecturer:
+        lec_name = f"{r.offered_module.lecturer.first_name} {r.offered_module.lecturer.last_name}"
+
+    room_name = r.room.name if r.room else "No Room"
+
+    return {
+        "id": r.id,
+        "offered_module_id": r.offered_module_id,
+        "module_name": mod_name,
+        "lecturer_name": lec_name,
+        "room_name": room_name,
+        "day_of_week": r.day_of_week,
+        "start_time": r.start_time,
+        "end_time": r.end_time,
+        "semester": r.semester
+    }
+
+
+def _with_names(query):
+    return query.options(
         joinedload(models.ScheduleEntry.offered_module).joinedload(models.OfferedModule.module),
         joinedload(models.ScheduleEntry.offered_module).joinedload(models.OfferedModule.lecturer),
         joinedload(models.ScheduleEntry.room)
     )
 
-    results = query.all()
 
-    mapped = []
-    for r in results:
+@router.get("/", response_model=List[ScheduleResponse])
+async def get_schedule(semester: str, request: Request, response: Response,
+                       db: AsyncSession = Depends(get_async_db)):
+    # version is read before the data, so a concurrent write can only make the tag too old, never too new
+    tag = await db.run_sync(versions.etag, semester)
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if versions.matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    stmt = _with_names(select(models.ScheduleEntry).where(
+        models.ScheduleEntry.semester == semester
+    ))
 
-        mod_name = r.offered_module.module.name if (r.offered_module and r.offered_module.module) else "Unknown"
-        lec_name = "Unassigned"
-        if r.offered_module and r.offered_module.lecturer:
-            lec_name = f"{r.offered_module.lecturer.first_name} {r.offered_module.lecturer.last_name}"
+    return [_to_response(r) for r in (await db.execute(stmt)).scalars()]
 
-        room_name = r.room.name if r.room else "No Room"
 
-        mapped.append({
-            "id": r.id,
-            "offered_module_id": r.offered_module_id,
-            "module_name": mod_name,
-            "lecturer_name": lec_name,
-            "room_name": room_name,
-            "day_of_week": r.day_of_week,
-            "start_time": r.start_time,
-            "end_time": r.end_time,
-            "semester": r.semester
-        })
-    return mapped
+@router.get("/free-slots", response_model=List[FreeSlot])
+async def get_free_slots(
+    offered_module_id: int,
+    semester: Optional[str] = None,
+    duration: Optional[int] = Query(None, ge=RESOLUTION, description="Minutes; defaults to the module's session length"),
+    exclude_entry_id: Optional[int] = Query(None, description="Entry being moved; its own booking does not block"),
+    limit: int = Query(free_slots.DEFAULT_LIMIT, ge=1, le=free_slots.MAX_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """
+    Ranked (day, start, room) placements for the offer: lecturer available and free,
+    candidate room free and open, constraints satisfied. Slots that clash with the
+    cohort's other sessions come last, flagged with cohort_conflict.
+    """
+    return await db.run_sync(free_slots.search, offered_module_id, semester, duration, exclude_entry_id, limit)
+
+
+def _export_rows(semester: str):
+    """Yields plain row tuples from a server-side cursor; owns its session because it outlives the request scope."""
+    E, O, M, L, R = models.ScheduleEntry, models.OfferedModule, models.Module, models.Lecturer, models.Room
+    stmt = (
+        select(E.id, E.day_of_week, E.start_time, E.end_time, E.semester,
+               O.module_code, M.name, L.first_name, L.last_name, R.name, R.location)
+        .select_from(E)
+        .outerjoin(O, O.id == E.offered_module_id)
+        .outerjoin(M, M.module_code == O.module_code)
+        .outerjoin(L, L.id == O.lecturer_id)
+        .outerjoin(R, R.id == E.room_id)
+        .where(E.semester == semester)
+        .order_by(E.id)
+        .execution_options(yield_per=EXPORT_BATCH)
+    )
+    db = SessionLocal()
+    try:
+        for row in db.execute(stmt):
+            yield row
+    finally:
+        db.close()
+
+
+def _lecturer_label(first, last) -> str:
+    return " ".join(x for x in (first, last) if x) or "Unassigned"
+
+
+def _csv_stream(semester: str):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["id", "semester", "day_of_week", "start_time", "end_time",
+                     "module_code", "module_name", "lecturer", "room", "location"])
+    for (id_, day, start, end, sem, code, mod_name, first, last, room, location) in _export_rows(semester):
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        writer.writerow([id_, sem, day, start, end, code or "", mod_name or "Unknown",
+                         _lecturer_label(first, last), room or "No Room", location or ""])
+    yield buf.getvalue()
+
+
+def _ics_escape(value: str) -> str:
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ics_line(line: str) -> str:
+    # RFC 5545: fold lines longer than 75 octets
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line + "\r\n"
+    parts, chunk = [], b""
+    for ch in line:
+        b = ch.encode("utf-8")
+        if len(chunk) + len(b) > (75 if not parts else 74):
+            parts.append(chunk.decode("utf-8"))
+            chunk = b""
+        chunk += b
+    parts.append(chunk.decode("utf-8"))
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_time(d: date, minutes: int) -> str:
+    return f"{d.strftime('%Y%m%d')}T{minutes // 60:02d}{minutes % 60:02d}00"
+
+
+def _ics_stream(semester: str, start_date: date, end_date: date, holidays: List[cc.Holiday]):
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    until = end_date.strftime("%Y%m%d") + "T235959"
+    yield "".join(_ics_line(x) for x in [
+        "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//ICSS//Study Program Backend//EN",
+        "CALSCALE:GREGORIAN", f"X-WR-CALNAME:{_ics_escape(semester)}",
+    ])
+
+    for (id_, day, start, end, sem, code, mod_name, first, last, room, location) in _export_rows(semester):
+        weekday, start_min, end_min = day_index(day), to_minutes(start), to_minutes(end)
+        if weekday is None or start_min is None or end_min is None:
+            continue
+        first_day = start_date + timedelta(days=(weekday - start_date.weekday()) % 7)
+        if first_day > end_date:
+            continue
+
+        exdates = []
+        for h in holidays:
+            d = max(h.valid_from or start_date, first_day)
+            d += timedelta(days=(weekday - d.weekday()) % 7)
+            while d <= min(h.valid_to or end_date, end_date):
+                exdates.append(_ics_time(d, start_min))
+                d += timedelta(days=7)
+
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:schedule-{id_}@icss",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_ics_time(first_day, start_min)}",
+            f"DTEND:{_ics_time(first_day, end_min)}",
+            f"RRULE:FREQ=WEEKLY;UNTIL={until}",
+        ]
+        if exdates:
+            lines.append("EXDATE:" + ",".join(sorted(set(exdates))))
+        description = f"{code or ''} - {_lecturer_label(first, last)}"
+        lines += [
+            f"SUMMARY:{_ics_escape(mod_name or code or 'Class')}",
+            f"LOCATION:{_ics_escape(', '.join(x for x in (room, location) if x))}",
+            f"DESCRIPTION:{_ics_escape(description)}",
+            "END:VEVENT",
+        ]
+        yield "".join(_ics_line(x) for x in lines)
+
+    yield _ics_line("END:VCALENDAR")
+
+
+@router.get("/export")
+def export_schedule(
+    semester: str,
+    fmt: str = Query("csv", alias="format"),
+    db: Session = Depends(get_db),
+):
+    """Streams the semester as CSV rows or as weekly-recurring iCalendar events."""
+    fmt = fmt.lower()
+    safe_name = "".join(ch if ch.isalnum() else "_" for ch in semester)
+
+    if fmt == "csv":
+        return StreamingResponse(
+            _csv_stream(semester),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="schedule_{safe_name}.csv"'},
+        )
+
+    if fmt == "ics":
+        sem = db.query(models.Semester).filter(models.Semester.name == semester).first()
+        if not sem:
+            raise HTTPException(status_code=404, detail="Semester not found")
+        rules = cc.compile_all(db.query(models.SchedulerConstraint).filter(
+            models.SchedulerConstraint.is_enabled == True  # noqa: E712
+        ).all())
+        holidays = [r for r in rules if isinstance(r, cc.Holiday) and r.target is None
+                    and r.active_between(sem.start_date, sem.end_date)]
+        return StreamingResponse(
+            _ics_stream(semester, sem.start_date, sem.end_date, holidays),
+            media_type="text/calendar; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="schedule_{safe_name}.ics"'},
+        )
+
+    raise HTTPException(status_code=400, detail="format must be 'ics' or 'csv'")
+
+
+def _check_slot(db: Session, entry: ScheduleCreate, day_of_week: str, start_time: str, end_time: str,
+                lecturer_id: Optional[int]):
+    lock_semester(db, entry.semester)
+    raise_on_conflict(db, entry.semester, day_of_week, start_time, end_time,
+                      room_id=entry.room_id, lecturer_id=lecturer_id)
 
 
 @router.post("/", response_model=ScheduleResponse)
-def create_schedule_entry(entry: ScheduleCreate, db: Session = Depends(get_db)):
+async def create_schedule_entry(entry: ScheduleCreate, db: AsyncSession = Depends(get_async_db)):
     """Crea una nueva clase en el calendario."""
 
 
-    offer = db.query(models.OfferedModule).filter(models.OfferedModule.id == entry.offered_module_id).first()
+    offer = await db.get(models.OfferedModule, entry.offered_module_id)
     if not offer:
         raise HTTPException(status_code=404, detail="Offered Module not found")
 
+    day_of_week, start_time, end_time = normalize_slot(entry.day_of_week, entry.start_time, entry.end_time)
+
+    # the booking checks are shared with the sync bulk/solve paths
+    await db.run_sync(_check_slot, entry, day_of_week, start_time, end_time, offer.lecturer_id)
 
     new_entry = models.ScheduleEntry(
         offered_module_id=entry.offered_module_id,
         room_id=entry.room_id,
-        day_of_week=entry.day_of_week,
-        start_time=entry.start_time,
-        end_time=entry.end_time,
+        day_of_week=day_of_week,
+        start_time=start_time,
+        end_time=end_time,
         semester=entry.semester
     )
 
     db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
+    await db.commit()
 
 
     return {
@@ -108,12 +360,279 @@ def create_schedule_entry(entry: ScheduleCreate, db: Session = Depends(get_db)):
     }
 
 
+@router.post("/solve", response_model=SolveResponse)
+def solve_schedule(
+    semester: str,
+    time_limit: float = solver.DEFAULT_TIME_LIMIT,
+    workers: Optional[int] = None,
+    replace: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """
+    Places every offered module of the semester that has no entry yet.
+    Existing entries stay pinned; replace=true clears the semester and re-plans it.
+    """
+    require_admin_or_pm(current_user)
+    started = time.monotonic()
+
+    # hold the semester for the whole run so manual placements cannot collide with the result
+    lock_semester(db, semester)
+    if replace:
+        db.query(models.ScheduleEntry).filter(
+            models.ScheduleEntry.semester == semester
+        ).delete(synchronize_session=False)
+        versions.bump(db, semester)
+        db.flush()
+
+    problem = solver.load_problem(db, semester)
+    result = solver.solve(problem, time_limit=time_limit, workers=workers)
+
+    rows = [
+        models.ScheduleEntry(
+            offered_module_id=offer_id,
+            room_id=room_id,
+            day_of_week=DAYS[day],
+            start_time=fmt_minutes(start),
+            end_time=fmt_minutes(end),
+            semester=semester,
+        )
+        for offer_id, (day, start, end, room_id) in sorted(result.placements.items())
+    ]
+    db.add_all(rows)
+    db.commit()
+
+    created = []
+    if rows:
+        created = _with_names(db.query(models.ScheduleEntry).filter(
+            models.ScheduleEntry.id.in_([r.id for r in rows])
+        )).all()
+
+    unplaced = [{"offered_module_id": oid, "reason": reason} for oid, reason in problem.unplaceable.items()]
+    unplaced += [
+        {"offered_module_id": oid, "reason": "No conflict-free slot found within the time limit"}
+        for oid in result.unplaced
+    ]
+
+    return {
+        "semester": semester,
+        "created": len(rows),
+        "entries": [_to_response(r) for r in created],
+        "unplaced": sorted(unplaced, key=lambda u: u["offered_module_id"]),
+        "workers": result.workers,
+        "elapsed_ms": int((time.monotonic() - started) * 1000),
+    }
+
+
+def _invalid_entries(found: repair.Check, reasons: dict) -> List[dict]:
+    return [
+        {"id": row.id, "offered_module_id": row.offered_module_id, "room_id": row.room_id,
+         "day_of_week": row.day_of_week, "start_time": row.start_time, "end_time": row.end_time,
+         "reason": reasons[row.id]}
+        for row in found.rows if row.id in reasons
+    ]
+
+
+@router.get("/invalid", response_model=List[InvalidEntry])
+def invalid_entries(
+    semester: str,
+    lecturer_id: Optional[int] = None,
+    constraint_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """
+    Entries that break the current availability or constraints. lecturer_id / constraint_id
+    narrow the check to the entries a change of that availability or constraint can affect.
+    """
+    found = repair.check(db, semester, lecturer_id=lecturer_id, constraint_id=constraint_id)
+    return _invalid_entries(found, found.invalid)
+
+
+@router.post("/repair", response_model=RepairResponse)
+def repair_schedule(
+    semester: str,
+    lecturer_id: Optional[int] = None,
+    constraint_id: Optional[int] = None,
+    time_limit: float = repair.DEFAULT_TIME_LIMIT,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """
+    Moves only the entries GET /schedule/invalid reports to valid places; every other
+    entry of the semester stays where it is. Entries without a valid place are left
+    untouched and listed under unplaced.
+    """
+    require_admin_or_pm(current_user)
+    started = time.monotonic()
+
+    lock_semester(db, semester)
+    found = repair.check(db, semester, lecturer_id=lecturer_id, constraint_id=constraint_id)
+    placements, unplaced = repair.repair(db, found, time_limit=time_limit)
+
+    moved = []
+    if placements:
+        # one executemany by primary key; it bypasses the flush events, so bump the version here
+        db.execute(update(models.ScheduleEntry), [
+            {"id": entry_id, "day_of_week": DAYS[day], "start_time": fmt_minutes(start),
+             "end_time": fmt_minutes(end), "room_id": room_id}
+            for entry_id, (day, start, end, room_id) in sorted(placements.items())
+        ])
+        versions.bump(db, semester)
+        db.commit()
+        moved = _with_names(db.query(models.ScheduleEntry).filter(
+            models.ScheduleEntry.id.in_(list(placements))
+        ).order_by(models.ScheduleEntry.id)).all()
+
+    return {
+        "semester": semester,
+        "invalid": len(found.invalid),
+        "moved": [_to_response(r) for r in moved],
+        "unplaced": _invalid_entries(found, unplaced),
+        "elapsed_ms": int((time.monotonic() - started) * 1000),
+    }
+
+
+async def _read_bulk_items(request: Request) -> List[Tuple[Any, Optional[str]]]:
+    """
+    JSON array (or {"entries": [...]}) by default; one object per line for application/x-ndjson.
+    Returns (row, error) pairs, error set for an NDJSON line that is not valid JSON.
+    """
+    content_type = request.headers.get("content-type", "")
+    items: List[Tuple[Any, Optional[str]]] = []
+
+    if "ndjson" in content_type or "jsonl" in content_type:
+        buf = b""
+        async for chunk in request.stream():
+            buf += chunk
+            *lines, buf = buf.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    items.append(_json_line(line))
+            if len(items) > MAX_BULK_ROWS:
+                raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ROWS} entries per request")
+        if buf.strip():
+            items.append(_json_line(buf))
+    else:
+        try:
+            data = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of schedule entries")
+        if isinstance(data, dict):
+            data = data.get("entries")
+        if not isinstance(data, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of schedule entries")
+        items = [(row, None) for row in data]
+
+    if len(items) > MAX_BULK_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_ROWS} entries per request")
+    return items
+
+
+def _json_line(line: bytes) -> Tuple[Any, Optional[str]]:
+    try:
+        return json.loads(line), None
+    except ValueError:
+        return None, "Invalid JSON line"
+
+
+def _existing_ids(db: Session, column, ids) -> dict:
+    """{id: row} for the ids that exist, queried in IN-list chunks."""
+    ids = list(ids)
+    found = {}
+    for i in range(0, len(ids), IN_CHUNK):
+        for row in db.query(column.class_).filter(column.in_(ids[i:i + IN_CHUNK])).all():
+            found[row.id] = row
+    return found
+
+
+def _bulk_import(db: Session, items: List[Tuple[Any, Optional[str]]], atomic: bool) -> dict:
+    errors = []
+    valid = []
+    for i, (raw, error) in enumerate(items):
+        if error:
+            errors.append({"index": i, "detail": error})
+            continue
+        try:
+            entry = ScheduleCreate.model_validate(raw)
+            slot = normalize_slot(entry.day_of_week, entry.start_time, entry.end_time)
+        except ValidationError as e:
+            errors.append({"index": i, "detail": "; ".join(f"{'.'.join(map(str, x['loc']))}: {x['msg']}" for x in e.errors())})
+            continue
+        except HTTPException as e:
+            errors.append({"index": i, "detail": e.detail})
+            continue
+        except ValueError as e:
+            errors.append({"index": i, "detail": str(e)})
+            continue
+        valid.append((i, entry, slot))
+
+    offers = _existing_ids(db, models.OfferedModule.id, {e.offered_module_id for _, e, _ in valid})
+    rooms = _existing_ids(db, models.Room.id, {e.room_id for _, e, _ in valid if e.room_id is not None})
+
+    semesters = sorted({e.semester for _, e, _ in valid})
+    for semester in semesters:
+        lock_semester(db, semester)
+    index = SlotIndex.for_semesters(db, semesters) if semesters else SlotIndex()
+
+    rows = []
+    for i, entry, (day_of_week, start_time, end_time) in valid:
+        offer = offers.get(entry.offered_module_id)
+        if offer is None:
+            errors.append({"index": i, "detail": "Offered Module not found"})
+            continue
+        if entry.room_id is not None and entry.room_id not in rooms:
+            errors.append({"index": i, "detail": "Room not found"})
+            continue
+        kind = index.conflict(entry.semester, day_of_week, start_time, end_time, entry.room_id, offer.lecturer_id)
+        if kind:
+            errors.append({"index": i, "detail": f"{kind.capitalize()} already booked on {day_of_week} at an overlapping time"})
+            continue
+        index.add(entry.semester, day_of_week, start_time, end_time, entry.room_id, offer.lecturer_id)
+        rows.append({
+            "offered_module_id": entry.offered_module_id,
+            "room_id": entry.room_id,
+            "day_of_week": day_of_week,
+            "start_time": start_time,
+            "end_time": end_time,
+            "semester": entry.semester,
+        })
+
+    errors.sort(key=lambda e: e["index"])
+    if atomic and errors:
+        db.rollback()
+        return {"created": 0, "errors": errors}
+
+    if rows:
+        # executemany; batched into multi-row INSERTs by the driver dialect
+        db.execute(insert(models.ScheduleEntry), rows)
+        versions.bump(db, *semesters)
+    db.commit()
+    return {"created": len(rows), "errors": errors}
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_import_schedule(
+    request: Request,
+    atomic: bool = False,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """
+    Imports many entries in one transaction. Invalid rows are reported by index and
+    skipped; atomic=true imports nothing if any row is invalid.
+    """
+    require_admin_or_pm(current_user)
+    items = await _read_bulk_items(request)
+    return await run_in_threadpool(_bulk_import, db, items, atomic)
+
+
 @router.delete("/{id}")
-def delete_schedule_entry(id: int, db: Session = Depends(get_db)):
-    entry = db.query(models.ScheduleEntry).filter(models.ScheduleEntry.id == id).first()
+async def delete_schedule_entry(id: int, db: AsyncSession = Depends(get_async_db)):
+    entry = await db.get(models.ScheduleEntry, id)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
 
-    db.delete(entry)
-    db.commit()
+    await db.delete(entry)
+    await db.commit()
     return {"ok": True}
\ No newline at end of file
@@ -1,28 +1,32 @@
 # api/routers/specializations.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ..database import get_db
 from .. import models, schemas, auth
-from ..permissions import role_of, is_admin_or_pm, hosp_program_ids
+from ..pagination import Page, paginate
+from ..permissions import PermissionContext, get_permission_context
 
 router = APIRouter(prefix="/specializations", tags=["specializations"])
 
 @router.get("/", response_model=List[schemas.SpecializationResponse])
-def read_specializations(db: Session = Depends(get_db), current_user: models.User = Depends(auth.get_current_user)):
-    return db.query(models.Specialization).all()
+def read_specializations(response: Response, program_id: Optional[int] = None, page: Page = Depends(),
+                         db: Session = Depends(get_db), perm: PermissionContext = Depends(get_permission_context)):
+    query = db.query(models.Specialization)
+    if program_id is not None:
+        query = query.filter(models.Specialization.program_id == program_id)
+    return paginate(query, models.Specialization.id, page, response)
 
 @router.post("/", response_model=schemas.SpecializationResponse)
 def create_specialization(p: schemas.SpecializationCreate, db: Session = Depends(get_db),
-                          current_user: models.User = Depends(auth.get_current_user)):
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+                          perm: PermissionContext = Depends(get_permission_context)):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
+    elif perm.is_hosp:
         if p.program_id is None:
             raise HTTPException(status_code=400, detail="program_id is required")
-        if p.program_id not in hosp_program_ids(db, current_user):
+        if not perm.owns_program(p.program_id):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
@@ -35,18 +39,17 @@ def create_specialization(p: schemas.SpecializationCreate, db: Session = Depends
 
 @router.put("/{id}", response_model=schemas.SpecializationResponse)
 def update_specialization(id: int, p: schemas.SpecializationUpdate, db: Session = Depends(get_db),
-                          current_user: models.User = Depends(auth.get_current_user)):
+                          perm: PermissionContext = Depends(get_permission_context)):
     row = db.query(models.Specialization).filter(models.Specialization.id == id).first()
     if not row:
         raise HTTPException(status_code=404, detail="Specialization not found")
 
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
-        if row.program_id not in hosp_program_ids(db, current_user):
+    elif perm.is_hosp:
+        if not perm.owns_program(row.program_id):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
-        if p.program_id is not None and p.program_id not in hosp_program_ids(db, current_user):
+        if p.program_id is not None and not perm.owns_program(p.program_id):
             raise HTTPException(status_code=403, detail="Cannot move specialization to another program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
@@ -61,16 +64,15 @@ def update_specialization(id: int, p: schemas.SpecializationUpdate, db: Session
 
 @router.delete("/{id}")
 def delete_specialization(id: int, db: Session = Depends(get_db),
-                          current_user: models.User = Depends(auth.get_current_user)):
+                          perm: PermissionContext = Depends(get_permission_context)):
     row = db.query(models.Specialization).filter(models.Specialization.id == id).first()
     if not row:
         return {"ok": True}
 
-    r = role_of(current_user)
-    if is_admin_or_pm(current_user):
+    if perm.is_admin_or_pm:
         pass
-    elif r == "hosp":
-        if row.program_id not in hosp_program_ids(db, current_user):
+    elif perm.is_hosp:
+        if not perm.owns_program(row.program_id):
             raise HTTPException(status_code=403, detail="Unauthorized for this program")
     else:
         raise HTTPException(status_code=403, detail="Not allowed")
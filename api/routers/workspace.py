@@ -0,0 +1,175 @@
+# api/routers/workspace.py
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import date
+
+from ..database import get_async_db
+from .. import models, auth
+from ..permissions import role_of, is_admin_or_pm, require_lecturer_link
+
+router = APIRouter(prefix="/workspace", tags=["workspace"])
+
+
+class WorkspaceSemester(BaseModel):
+    id: int
+    name: str
+    start_date: date
+    end_date: date
+
+
+class WorkspaceEntry(BaseModel):
+    # same shape as GET /schedule/ entries
+    id: int
+    offered_module_id: int
+    module_name: str
+    lecturer_name: str
+    room_name: str
+    day_of_week: str
+    start_time: str
+    end_time: str
+    semester: str
+
+
+class WorkspaceOffer(BaseModel):
+    id: int
+    module_code: str
+    module_name: str
+    lecturer_id: Optional[int] = None
+    lecturer_name: str
+    status: Optional[str] = None
+
+
+class WorkspaceRoom(BaseModel):
+    id: int
+    name: str
+    capacity: int
+    type: str
+
+
+class WorkspaceLecturer(BaseModel):
+    id: int
+    first_name: str
+    last_name: Optional[str] = None
+
+
+class WorkspaceGroup(BaseModel):
+    id: int
+    name: str
+    size: int
+    program_id: Optional[int] = None
+
+
+class WorkspaceResponse(BaseModel):
+    semester: Optional[str] = None
+    semesters: List[WorkspaceSemester]
+    schedule: List[WorkspaceEntry]
+    offered_modules: List[WorkspaceOffer]
+    rooms: List[WorkspaceRoom]
+    lecturers: List[WorkspaceLecturer]
+    groups: List[WorkspaceGroup]
+
+
+E, O, M, L, R = models.ScheduleEntry, models.OfferedModule, models.Module, models.Lecturer, models.Room
+
+
+async def _rows(db: AsyncSession, stmt) -> list:
+    return (await db.execute(stmt)).all()
+
+
+async def _schedule(db: AsyncSession, semester: str) -> List[dict]:
+    rows = await _rows(db, (
+        select(E.id, E.offered_module_id, M.name, L.first_name, L.last_name, R.name,
+               E.day_of_week, E.start_time, E.end_time, E.semester)
+        .select_from(E)
+        .outerjoin(O, O.id == E.offered_module_id)
+        .outerjoin(M, M.module_code == O.module_code)
+        .outerjoin(L, L.id == O.lecturer_id)
+        .outerjoin(R, R.id == E.room_id)
+        .where(E.semester == semester)
+        .order_by(E.id)
+    ))
+    return [
+        {
+            "id": id, "offered_module_id": offer_id,
+            "module_name": module_name or "Unknown",
+            "lecturer_name": f"{first} {last}" if first is not None else "Unassigned",
+            "room_name": room_name or "No Room",
+            "day_of_week": day, "start_time": start, "end_time": end, "semester": sem,
+        }
+        for id, offer_id, module_name, first, last, room_name, day, start, end, sem in rows
+    ]
+
+
+async def _offers(db: AsyncSession, semester: str) -> List[dict]:
+    rows = await _rows(db, (
+        select(O.id, O.module_code, M.name, O.lecturer_id, L.first_name, L.last_name, O.status)
+        .select_from(O)
+        .outerjoin(M, M.module_code == O.module_code)
+        .outerjoin(L, L.id == O.lecturer_id)
+        .where(O.semester == semester)
+        .order_by(O.id)
+    ))
+    return [
+        {
+            "id": id, "module_code": code, "module_name": module_name or "Unknown Module",
+            "lecturer_id": lecturer_id,
+            "lecturer_name": f"{first} {last}" if first is not None else "Unassigned",
+            "status": status,
+        }
+        for id, code, module_name, lecturer_id, first, last, status in rows
+    ]
+
+
+async def _lecturers(db: AsyncSession, current_user: models.User) -> List[dict]:
+    # same visibility as GET /lecturers/: planners see everyone, a lecturer only themselves
+    stmt = select(L.id, L.first_name, L.last_name).order_by(L.id)
+    r = role_of(current_user)
+    if r == "lecturer":
+        stmt = stmt.where(L.id == require_lecturer_link(current_user))
+    elif not (r == "hosp" or is_admin_or_pm(current_user)):
+        return []
+    return [dict(row._mapping) for row in await _rows(db, stmt)]
+
+
+async def _groups(db: AsyncSession, current_user: models.User) -> List[dict]:
+    if not (role_of(current_user) == "hosp" or is_admin_or_pm(current_user)):
+        return []
+    return [dict(row._mapping) for row in await _rows(db, (
+        select(models.Group.id, models.Group.name, models.Group.size, models.Group.program_id)
+        .order_by(models.Group.id)
+    ))]
+
+
+@router.get("/", response_model=WorkspaceResponse)
+async def get_workspace(
+    semester: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(auth.get_current_user),
+):
+    """
+    Everything the timetable planner shows, in one request and one DB session:
+    semesters, the semester's schedule and offered modules, rooms, lecturers and
+    groups, reduced to the fields the planner uses. Without `semester` the newest
+    semester is opened (the planner's default). Lecturers follow GET /lecturers/
+    (a lecturer gets only their own entry); lecturers and groups are empty for
+    roles that cannot plan.
+    """
+    semesters = [dict(r._mapping) for r in await _rows(db, (
+        select(models.Semester.id, models.Semester.name, models.Semester.start_date, models.Semester.end_date)
+        .order_by(models.Semester.start_date.desc())
+    ))]
+    if semester is None and semesters:
+        semester = semesters[0]["name"]
+
+    return {
+        "semester": semester,
+        "semesters": semesters,
+        "schedule": await _schedule(db, semester) if semester else [],
+        "offered_modules": await _offers(db, semester) if semester else [],
+        "rooms": [dict(r._mapping) for r in await _rows(db, select(R.id, R.name, R.capacity, R.type).order_by(R.id))],
+        "lecturers": await _lecturers(db, current_user),
+        "groups": await _groups(db, current_user),
+    }
@@ -60,6 +60,17 @@ class LecturerUpdate(BaseModel):
     teaching_load: Optional[str] = None
     domain_ids: Optional[List[int]] = None  # None = not provided, [] = clear all
 
+class LecturerWorkload(BaseModel):
+    lecturer_id: int
+    first_name: str
+    last_name: Optional[str] = None
+    teaching_load: Optional[str] = None
+    target_min_minutes: Optional[int] = None  # weekly, parsed from teaching_load
+    target_max_minutes: Optional[int] = None
+    scheduled_minutes: int
+    sessions: int
+    status: str  # over | under | ok | unknown (teaching_load not parseable)
+
 class LecturerSelfUpdate(BaseModel):
     personal_email: Optional[str] = None
     phone: Optional[str] = None
@@ -156,6 +167,7 @@ class ModuleBase(BaseModel):
     semester: int
     category: Optional[str] = None
     program_id: Optional[int] = None
+    equipment: Optional[str] = None
 
 class ModuleCreate(ModuleBase):
     specialization_ids: Optional[List[int]] = []
@@ -170,6 +182,7 @@ class ModuleUpdate(BaseModel):
     semester: Optional[int] = None
     category: Optional[str] = None
     program_id: Optional[int] = None
+    equipment: Optional[str] = None
     specialization_ids: Optional[List[int]] = None
 
 class ModuleResponse(ModuleBase):
@@ -185,6 +198,7 @@ class GroupBase(BaseModel):
     description: Optional[str] = None
     email: Optional[str] = None
     program: Optional[str] = None
+    program_id: Optional[int] = None
     parent_group: Optional[str] = None
 
 class GroupCreate(GroupBase):
@@ -196,6 +210,7 @@ class GroupUpdate(BaseModel):
     description: Optional[str] = None
     email: Optional[str] = None
     program: Optional[str] = None
+    program_id: Optional[int] = None
     parent_group: Optional[str] = None
 
 class GroupResponse(GroupBase):
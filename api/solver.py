@@ -0,0 +1,465 @@
+# api/solver.py
+"""
+Automatic timetable solver.
+
+load_problem() reads everything the solver needs for one semester out of the DB
+into plain, picklable Task objects (every candidate slot and room is computed up
+front), and solve() searches placements in parallel worker processes within a
+time budget. Nothing in here writes to the DB; the router persists the result.
+"""
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session, joinedload
+
+from . import models
+from . import constraint_compiler as cc
+from . import room_index
+from .availability import WeekMask, mask_for
+from .timeutils import day_index, to_minutes
+
+DEFAULT_TIME_LIMIT = 10.0
+MAX_TIME_LIMIT = 300.0
+MAX_WORKERS = 32
+
+DEFAULT_OPEN_DAYS = [0, 1, 2, 3, 4]
+DEFAULT_DAY_START = 8 * 60
+DEFAULT_DAY_END = 20 * 60
+DEFAULT_SLOT_MINUTES = 90
+DEFAULT_BREAK_MINUTES = 15
+
+# how many displaced sessions the repair step may try to move per unplaced one
+REPAIR_ATTEMPTS = 20
+
+Slot = Tuple[int, int, int]  # (day index, start minute, end minute)
+
+
+@dataclass
+class Policy:
+    open_days: List[int] = field(default_factory=lambda: list(DEFAULT_OPEN_DAYS))
+    day_start: int = DEFAULT_DAY_START
+    day_end: int = DEFAULT_DAY_END
+    slot_minutes: int = DEFAULT_SLOT_MINUTES
+    break_minutes: int = DEFAULT_BREAK_MINUTES
+    default_duration: Optional[int] = None
+    module_durations: Dict[str, int] = field(default_factory=dict)
+    lecturer_durations: Dict[str, int] = field(default_factory=dict)  # FixedDuration targets are strings
+    program_durations: Dict[str, int] = field(default_factory=dict)
+    room_closed_days: Dict[int, Set[int]] = field(default_factory=dict)
+    all_rooms_closed_days: Set[int] = field(default_factory=set)
+    # "The Berlin Campus is unavailable on ..." rules; locate_rooms() folds them into room_closed_days
+    campus_closures: List[cc.UnavailableDays] = field(default_factory=list)
+
+    def duration_for(self, module_code: str, lecturer_id: Optional[int] = None,
+                     program_id: Optional[int] = None) -> int:
+        """The most specific FixedDuration wins: module, then lecturer, then program, then the default."""
+        return (
+            self.module_durations.get(module_code)
+            or (lecturer_id is not None and self.lecturer_durations.get(str(lecturer_id)))
+            or (program_id is not None and self.program_durations.get(str(program_id)))
+            or self.default_duration
+            or self.slot_minutes
+        )
+
+    def closed_days(self, room_id: int) -> Set[int]:
+        return set(self.all_rooms_closed_days) | self.room_closed_days.get(room_id, set())
+
+    def locate_rooms(self, locations: Dict[int, Optional[str]]):
+        """Close the rooms (id -> location) on the days their campus is unavailable; callers may skip
+        reading locations when there are no campus_closures."""
+        for c in self.campus_closures:
+            for room_id, location in locations.items():
+                if c.targets(cc.Placement(day=0, start=0, end=0, room_id=room_id, room_location=location)):
+                    self.room_closed_days.setdefault(room_id, set()).update(c.days)
+
+
+@dataclass(frozen=True)
+class Task:
+    offer_id: int
+    lecturer_id: Optional[int]
+    cohort: Optional[Tuple[int, int]]  # (program_id, study semester)
+    slots: Tuple[Slot, ...]
+    rooms: Tuple[int, ...]  # best fit first
+    entry_id: Optional[int] = None  # set when re-placing a stored entry (api/repair.py)
+
+    @property
+    def key(self) -> int:
+        return self.entry_id if self.entry_id is not None else self.offer_id
+
+
+@dataclass
+class Problem:
+    semester: str
+    tasks: List[Task] = field(default_factory=list)
+    # already stored entries: (lecturer_id, cohort, room_id, day, start, end)
+    pinned: List[tuple] = field(default_factory=list)
+    room_closed_days: Dict[int, Set[int]] = field(default_factory=dict)
+    unplaceable: Dict[int, str] = field(default_factory=dict)
+    day_start: int = DEFAULT_DAY_START  # Policy.day_start, for the early-slot preference
+
+
+@dataclass
+class Solution:
+    placements: Dict[int, Tuple[int, int, int, int]] = field(default_factory=dict)  # task key -> (day, start, end, room)
+    unplaced: List[int] = field(default_factory=list)
+    penalty: float = 0.0
+    workers: int = 0  # search processes solve() actually ran; 0 when there was nothing to place
+
+    def rank(self):
+        return (len(self.unplaced), self.penalty)
+
+
+# ---------------------------------------------------------
+# Loading
+# ---------------------------------------------------------
+
+def read_policy(rules: List[cc.CompiledConstraint]) -> Policy:
+    policy = Policy()
+    for c in rules:
+        if isinstance(c, cc.OpenDays) and c.is_global():
+            policy.open_days = sorted(c.days)
+        elif isinstance(c, cc.OpeningHours) and c.is_global():
+            policy.day_start, policy.day_end = c.opens, c.closes
+        elif isinstance(c, cc.SlotGrid):
+            policy.slot_minutes, policy.break_minutes = c.slot_minutes, c.break_minutes
+        elif isinstance(c, cc.FixedDuration) and c.scope == "module":
+            if c.target is None:
+                policy.default_duration = c.minutes
+            else:
+                policy.module_durations[c.target] = c.minutes
+        elif isinstance(c, cc.FixedDuration) and c.scope in ("lecturer", "program"):
+            durations = policy.lecturer_durations if c.scope == "lecturer" else policy.program_durations
+            if c.target is None:
+                # "every lecturer" / "every program" covers every offer, like a module-wide default
+                policy.default_duration = c.minutes
+            else:
+                durations[c.target] = c.minutes
+        elif isinstance(c, cc.UnavailableDays) and c.scope == "university":
+            if c.target is None:
+                policy.all_rooms_closed_days |= c.days
+            else:
+                policy.campus_closures.append(c)
+        elif isinstance(c, cc.UnavailableDays) and c.scope == "room":
+            if c.target is None:
+                policy.all_rooms_closed_days |= c.days
+            else:
+                try:
+                    room_id = int(c.target)
+                except ValueError:
+                    continue
+                policy.room_closed_days.setdefault(room_id, set()).update(c.days)
+    return policy
+
+
+def active_constraints(db: Session, semester: str) -> List[cc.CompiledConstraint]:
+    rules = cc.compile_all(
+        db.query(models.SchedulerConstraint).filter(models.SchedulerConstraint.is_enabled == True).all()  # noqa: E712
+    )
+    sem = db.query(models.Semester).filter(models.Semester.name == semester).first()
+    if not sem:
+        return rules
+    # keep constraints whose validity window overlaps the semester
+    return [c for c in rules if c.active_between(sem.start_date, sem.end_date)]
+
+
+def slot_constraints(rules: List[cc.CompiledConstraint]) -> List[cc.CompiledConstraint]:
+    """
+    Rules bound to a lecturer/module/program, checked per candidate slot. FixedDuration is left
+    out: Policy.duration_for() already picks the most specific one, and checking them all would
+    let a general rule reject the length an override asks for.
+    """
+    return [r for r in rules if r.scope in ("lecturer", "module", "program") and not isinstance(r, cc.FixedDuration)]
+
+
+def candidate_slots(policy: Policy, duration: int, available: WeekMask, slot_rules: List[cc.CompiledConstraint],
+                    lecturer_id: Optional[int], module_code: Optional[str], program_id: Optional[int],
+                    masks: Optional[Dict[Slot, WeekMask]] = None) -> List[Slot]:
+    """Slots on the policy's grid within the lecturer's availability that the slot-level rules allow."""
+    masks = {} if masks is None else masks
+    step = policy.slot_minutes + policy.break_minutes
+    slots = []
+    for day in policy.open_days:
+        start = policy.day_start
+        while start + duration <= policy.day_end:
+            slot = (day, start, start + duration)
+            if slot not in masks:
+                masks[slot] = WeekMask.slot(*slot)
+            if available.contains(masks[slot]) and cc.allows(slot_rules, cc.Placement(
+                day=day, start=start, end=start + duration, lecturer_id=lecturer_id,
+                module_code=module_code, program_id=program_id,
+            )):
+                slots.append(slot)
+            start += step
+    return slots
+
+
+def load_problem(db: Session, semester: str) -> Problem:
+    rules = active_constraints(db, semester)
+    policy = read_policy(rules)
+    slot_rules = slot_constraints(rules)
+    problem = Problem(semester=semester, day_start=policy.day_start)
+
+    locations = dict(db.query(models.Room.id, models.Room.location).filter(models.Room.status == True))  # noqa: E712
+    policy.locate_rooms(locations)
+    for room_id in locations:
+        closed = policy.closed_days(room_id)
+        if closed:
+            problem.room_closed_days[room_id] = closed
+
+    availability = {
+        a.lecturer_id: mask_for(a)
+        for a in db.query(models.LecturerAvailability).all()
+    }
+    candidates = room_index.candidates(db, semester)
+
+    existing = (
+        db.query(models.ScheduleEntry)
+        .options(joinedload(models.ScheduleEntry.offered_module).joinedload(models.OfferedModule.module))
+        .filter(models.ScheduleEntry.semester == semester)
+        .all()
+    )
+    scheduled_offers = set()
+    for e in existing:
+        day, start, end = day_index(e.day_of_week), to_minutes(e.start_time), to_minutes(e.end_time)
+        if day is None or start is None or end is None:
+            continue
+        offer = e.offered_module
+        module = offer.module if offer else None
+        cohort = (module.program_id, module.semester) if module and module.program_id is not None else None
+        problem.pinned.append((offer.lecturer_id if offer else None, cohort, e.room_id, day, start, end))
+        scheduled_offers.add(e.offered_module_id)
+
+    offers = (
+        db.query(models.OfferedModule)
+        .options(joinedload(models.OfferedModule.module))
+        .filter(models.OfferedModule.semester == semester)
+        .order_by(models.OfferedModule.id)
+        .all()
+    )
+    unrestricted = WeekMask.full()
+    slot_masks: Dict[Slot, WeekMask] = {}
+    for o in offers:
+        if o.id in scheduled_offers:
+            continue
+        module = o.module
+        program_id = module.program_id if module else None
+        slots = candidate_slots(
+            policy, policy.duration_for(o.module_code, o.lecturer_id, program_id),
+            availability.get(o.lecturer_id, unrestricted), slot_rules, o.lecturer_id, o.module_code, program_id,
+            slot_masks,
+        )
+        if not slots:
+            problem.unplaceable[o.id] = "No time slot within opening hours and lecturer availability"
+            continue
+
+        room_ids = candidates.get(o.id)
+        if not room_ids:
+            problem.unplaceable[o.id] = "No active room of the required type, capacity and equipment"
+            continue
+
+        problem.tasks.append(Task(
+            offer_id=o.id,
+            lecturer_id=o.lecturer_id,
+            cohort=(program_id, module.semester) if program_id is not None else None,
+            slots=tuple(slots),
+            rooms=room_ids,
+        ))
+    return problem
+
+
+# ---------------------------------------------------------
+# Search
+# ---------------------------------------------------------
+
+class _Board:
+    """Occupied intervals per resource key and day; owner None marks a pinned entry."""
+
+    def __init__(self):
+        self.busy: Dict[tuple, Dict[int, List[Tuple[int, int, Optional[int]]]]] = {}
+
+    def owners(self, key, day, start, end) -> List[Optional[int]]:
+        if key is None:
+            return []
+        return [o for s, e, o in self.busy.get(key, {}).get(day, ()) if s < end and start < e]
+
+    def is_free(self, key, day, start, end) -> bool:
+        if key is None:
+            return True
+        for s, e, _ in self.busy.get(key, {}).get(day, ()):
+            if s < end and start < e:
+                return False
+        return True
+
+    def load(self, key, day) -> int:
+        if key is None:
+            return 0
+        return len(self.busy.get(key, {}).get(day, ()))
+
+    def add(self, key, day, start, end, owner):
+        if key is not None:
+            self.busy.setdefault(key, {}).setdefault(day, []).append((start, end, owner))
+
+    def remove(self, key, day, owner):
+        if key is not None:
+            intervals = self.busy[key][day]
+            intervals[:] = [iv for iv in intervals if iv[2] != owner]
+
+
+def _keys(task: Task):
+    lect = ("L", task.lecturer_id) if task.lecturer_id is not None else None
+    cohort = ("C", task.cohort) if task.cohort is not None else None
+    return lect, cohort
+
+
+class _Attempt:
+    def __init__(self, problem: Problem, rng: random.Random):
+        self.problem = problem
+        self.rng = rng
+        self.board = _Board()
+        self.placed: Dict[int, Tuple[int, int, int, int, float]] = {}
+        for lecturer_id, cohort, room_id, day, start, end in problem.pinned:
+            if lecturer_id is not None:
+                self.board.add(("L", lecturer_id), day, start, end, None)
+            if cohort is not None:
+                self.board.add(("C", cohort), day, start, end, None)
+            if room_id is not None:
+                self.board.add(("R", room_id), day, start, end, None)
+
+    def _free_room(self, task: Task, day, start, end) -> Optional[int]:
+        closed = self.problem.room_closed_days
+        for room_id in task.rooms:
+            if day in closed.get(room_id, ()):
+                continue
+            if self.board.is_free(("R", room_id), day, start, end):
+                return room_id
+        return None
+
+    def _commit(self, task: Task, day, start, end, room_id, cost):
+        lect, cohort = _keys(task)
+        self.board.add(lect, day, start, end, task.key)
+        self.board.add(cohort, day, start, end, task.key)
+        self.board.add(("R", room_id), day, start, end, task.key)
+        self.placed[task.key] = (day, start, end, room_id, cost)
+
+    def _uncommit(self, task: Task):
+        day, start, end, room_id, _ = self.placed.pop(task.key)
+        lect, cohort = _keys(task)
+        self.board.remove(lect, day, task.key)
+        self.board.remove(cohort, day, task.key)
+        self.board.remove(("R", room_id), day, task.key)
+
+    def place(self, task: Task) -> bool:
+        lect, cohort = _keys(task)
+        best = None
+        for day, start, end in task.slots:
+            if not self.board.is_free(lect, day, start, end) or not self.board.is_free(cohort, day, start, end):
+                continue
+            room_id = self._free_room(task, day, start, end)
+            if room_id is None:
+                continue
+            # spread a cohort's and a lecturer's sessions over the week, mildly prefer mornings
+            cost = (
+                2.0 * self.board.load(cohort, day)
+                + self.board.load(lect, day)
+                + (start - self.problem.day_start) / 600.0
+                + self.rng.random() * 0.5
+            )
+            if best is None or cost < best[0]:
+                best = (cost, day, start, end, room_id)
+        if best is None:
+            return False
+        cost, day, start, end, room_id = best
+        self._commit(task, day, start, end, room_id, cost)
+        return True
+
+    def repair(self, task: Task, by_id: Dict[int, Task]) -> bool:
+        """Displace one movable session so that `task` fits, if the displaced one fits elsewhere."""
+        lect, cohort = _keys(task)
+        slots = list(task.slots)
+        self.rng.shuffle(slots)
+        attempts = 0
+        for day, start, end in slots:
+            blockers = set(self.board.owners(lect, day, start, end)) | set(self.board.owners(cohort, day, start, end))
+            room_id = self._free_room(task, day, start, end)
+            if room_id is None:
+                for r in task.rooms:
+                    if day in self.problem.room_closed_days.get(r, ()):
+                        continue
+                    owners = set(self.board.owners(("R", r), day, start, end))
+                    if len(owners | blockers) == 1:
+                        room_id = r
+                        blockers |= owners
+                        break
+            if room_id is None or len(blockers) != 1 or None in blockers:
+                continue
+
+            attempts += 1
+            victim = by_id[next(iter(blockers))]
+            old = self.placed[victim.key]
+            self._uncommit(victim)
+            self._commit(task, day, start, end, room_id, 0.0)
+            if self.place(victim):
+                return True
+            self._uncommit(task)
+            self._commit(victim, *old)
+            if attempts >= REPAIR_ATTEMPTS:
+                break
+        return False
+
+
+def _construct(problem: Problem, rng: random.Random) -> Solution:
+    attempt = _Attempt(problem, rng)
+    by_id = {t.key: t for t in problem.tasks}
+    # most constrained first, with jitter so restarts explore different orders
+    order = sorted(
+        problem.tasks,
+        key=lambda t: len(t.slots) * len(t.rooms) * (1.0 + 0.3 * rng.random()),
+    )
+    unplaced = []
+    for task in order:
+        if not attempt.place(task) and not attempt.repair(task, by_id):
+            unplaced.append(task.key)
+
+    placements = {oid: p[:4] for oid, p in attempt.placed.items()}
+    penalty = sum(p[4] for p in attempt.placed.values())
+    return Solution(placements=placements, unplaced=sorted(unplaced), penalty=penalty)
+
+
+def _search(problem: Problem, seed: int, time_limit: float) -> Solution:
+    deadline = time.monotonic() + time_limit
+    rng = random.Random(seed)
+    best = None
+    while True:
+        candidate = _construct(problem, rng)
+        if best is None or candidate.rank() < best.rank():
+            best = candidate
+        if not best.unplaced or time.monotonic() >= deadline:
+            return best
+
+
+def solve(problem: Problem, time_limit: float = DEFAULT_TIME_LIMIT, workers: Optional[int] = None) -> Solution:
+    time_limit = max(0.1, min(float(time_limit), MAX_TIME_LIMIT))
+    workers = max(1, min(workers or os.cpu_count() or 1, MAX_WORKERS))
+    if not problem.tasks:
+        return Solution()
+
+    if workers == 1:
+        results = [_search(problem, 0, time_limit)]
+    else:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(
+                    _search, [problem] * workers, range(workers), [time_limit] * workers
+                ))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            # serverless runtimes (no /dev/shm) cannot fork worker pools
+            results = [_search(problem, 0, time_limit)]
+
+    best = min(results, key=lambda s: s.rank())
+    best.workers = len(results)
+    return best
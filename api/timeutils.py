@@ -0,0 +1,29 @@
+# api/timeutils.py
+from typing import Optional
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_INDEX = {d.lower(): i for i, d in enumerate(DAYS)}
+
+
+def day_index(day: Optional[str]) -> Optional[int]:
+    return DAY_INDEX.get((day or "").strip().lower())
+
+
+def to_minutes(value: Optional[str]) -> Optional[int]:
+    """'HH:MM' (or 'HH:MM:SS') -> minutes after midnight, None if unparseable."""
+    if not value or not isinstance(value, str):
+        return None
+    parts = value.strip().split(":")
+    if len(parts) < 2:
+        return None
+    try:
+        h, m = int(parts[0]), int(parts[1])
+    except ValueError:
+        return None
+    if h < 0 or m < 0 or m > 59 or h > 24 or (h == 24 and m != 0):
+        return None
+    return h * 60 + m
+
+
+def fmt_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
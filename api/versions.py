@@ -0,0 +1,72 @@
+# api/versions.py
+"""
+Per-semester schedule version counters, used as ETags for GET /schedule/.
+
+Every flush that touches a ScheduleEntry or OfferedModule bumps the counter of
+its semester; changes to rooms, lecturers or modules (whose names appear in
+every semester's schedule) bump the catalogue counter "*". Core-level bulk
+statements bypass the ORM events, so their callers call bump() themselves.
+"""
+from typing import Iterable
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import models
+
+CATALOG = "*"
+_CATALOG_MODELS = (models.Room, models.Lecturer, models.Module)
+
+
+def _upsert(dialect_name: str):
+    return postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+
+
+def _bump_on(connection, semesters: Iterable[str]):
+    insert = _upsert(connection.dialect.name)
+    table = models.ScheduleVersion.__table__
+    for semester in sorted(set(semesters)):
+        stmt = insert(table).values(semester=semester, version=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.semester],
+            set_={"version": table.c.version + 1},
+        )
+        connection.execute(stmt)
+
+
+def bump(db: Session, *semesters: str):
+    _bump_on(db.connection(), semesters)
+
+
+def etag(db: Session, semester: str) -> str:
+    V = models.ScheduleVersion
+    found = dict(db.execute(select(V.semester, V.version).where(V.semester.in_([semester, CATALOG]))).all())
+    return f'W/"{found.get(semester, 0)}.{found.get(CATALOG, 0)}"'
+
+
+def matches(if_none_match: str, current: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or current in tags or current.removeprefix("W/") in [t.removeprefix("W/") for t in tags]
+
+
+def _semesters_of(obj):
+    if isinstance(obj, (models.ScheduleEntry, models.OfferedModule)):
+        yield obj.semester
+        old = inspect(obj).attrs.semester.history.deleted
+        yield from (s for s in old or () if s)
+    elif isinstance(obj, _CATALOG_MODELS):
+        yield CATALOG
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_after_flush(session: Session, flush_context):
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        touched.update(s for s in _semesters_of(obj) if s)
+    if touched:
+        _bump_on(session.connection(), touched)
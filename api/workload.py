@@ -0,0 +1,101 @@
+# api/workload.py
+"""
+Scheduled teaching time per lecturer against their teaching_load.
+
+statement() sums the weekly session minutes of every lecturer for one semester
+in a single aggregate query (lecturers LEFT JOIN offered_modules LEFT JOIN the
+semester's schedule_entries summed per offer, GROUP BY lecturer); durations are computed in SQL from the
+zero-padded "HH:MM" start/end strings. Writes store that form (booking.normalize_slot) and
+migrations.normalize_schedule_times() rewrites legacy rows like "9:00"; a time still not in that
+form counts as no duration instead of failing the cast. parse_teaching_load() turns the free-text
+Lecturer.teaching_load into a target range in weekly minutes, and status()
+compares the two.
+"""
+import re
+from typing import Optional, Tuple
+
+from sqlalchemy import Integer, case, cast, func, select
+
+from . import models
+
+# one SWS (Semesterwochenstunde) is a 45 minute teaching unit per week
+SWS_MINUTES = 45
+HOUR_UNITS = ("h", "hr", "hrs", "hour", "hours", "std", "stunden")
+# relative slack around the target before a lecturer counts as over- or under-loaded
+DEFAULT_TOLERANCE = 0.1
+
+_LOAD = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:(?:-|–|to|bis)\s*(\d+(?:[.,]\d+)?))?\s*([a-zäöü%]*)", re.IGNORECASE)
+
+
+def parse_teaching_load(text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    "18 SWS" -> (810, 810), "12-16 SWS" -> (540, 720), "20 h" -> (1200, 1200): weekly
+    minutes. A bare number counts as SWS; None when there is no number or the unit is unknown.
+    """
+    match = _LOAD.search(text or "")
+    if not match:
+        return None
+    low, high, unit = match.groups()
+    unit = unit.lower().rstrip(".")
+    if unit in ("", "sws"):
+        factor = SWS_MINUTES
+    elif unit in HOUR_UNITS:
+        factor = 60
+    else:
+        return None
+    low = float(low.replace(",", "."))
+    high = float(high.replace(",", ".")) if high else low
+    if high < low:
+        low, high = high, low
+    return round(low * factor), round(high * factor)
+
+
+def status(scheduled: int, target: Optional[Tuple[int, int]], tolerance: float = DEFAULT_TOLERANCE) -> str:
+    if target is None:
+        return "unknown"
+    low, high = target
+    if scheduled > high * (1 + tolerance):
+        return "over"
+    if scheduled < low * (1 - tolerance):
+        return "under"
+    return "ok"
+
+
+# "HH:MM", optionally followed by ":SS"; anything else would make the casts below raise on Postgres
+HHMM = r"^[0-9]{2}:[0-9]{2}(:[0-9]{2})?$"
+
+
+def _minutes(column):
+    return case(
+        (column.regexp_match(HHMM),
+         cast(func.substr(column, 1, 2), Integer) * 60 + cast(func.substr(column, 4, 2), Integer)),
+        else_=None,
+    )
+
+
+def statement(semester: str):
+    L, O, E = models.Lecturer, models.OfferedModule, models.ScheduleEntry
+    # sum the semester's entries per offer first, in one range scan of the semester index; joining the
+    # entries directly made SQLite re-scan that index once per offer (2 s instead of 30 ms at 900 lecturers)
+    per_offer = (
+        select(
+            E.offered_module_id.label("offer_id"),
+            func.sum(_minutes(E.end_time) - _minutes(E.start_time)).label("minutes"),
+            func.count(E.id).label("sessions"),
+        )
+        .where(E.semester == semester)
+        .group_by(E.offered_module_id)
+        .subquery()
+    )
+    return (
+        select(
+            L.id, L.first_name, L.last_name, L.teaching_load,
+            func.coalesce(func.sum(per_offer.c.minutes), 0).label("minutes"),
+            func.coalesce(func.sum(per_offer.c.sessions), 0).label("sessions"),
+        )
+        .select_from(L)
+        .outerjoin(O, (O.lecturer_id == L.id) & (O.semester == semester))
+        .outerjoin(per_offer, per_offer.c.offer_id == O.id)
+        .group_by(L.id, L.first_name, L.last_name, L.teaching_load)
+        .order_by(L.id)
+    )
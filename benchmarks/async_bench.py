@@ -0,0 +1,134 @@
+# benchmarks/async_bench.py
+"""
+Concurrent read throughput of the async routers against their previous sync form.
+
+Seeds one semester (offered modules + schedule entries) if it is missing, mounts
+the previous sync handlers of GET /schedule/ and GET /offered-modules/ under
+/sync/..., then fires --requests requests at --concurrency in-process for each
+path and reports requests/s and latency percentiles. Sync handlers run on the
+threadpool (40 threads by default), async ones on the event loop.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.async_bench --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy.orm import Session, joinedload  # noqa: E402
+
+from api import auth, models  # noqa: E402
+from api.database import SessionLocal, get_db  # noqa: E402
+from api.index import app  # noqa: E402
+from api.routers.schedule import _to_response, _with_names  # noqa: E402
+
+EMAIL = "bench-async@icss.com"
+PASSWORD = "password"
+SEMESTER = "Bench Semester"
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+def _seed(offers: int):
+    db = SessionLocal()
+    try:
+        if not db.query(models.User).filter(models.User.email == EMAIL).first():
+            db.add(models.User(email=EMAIL, password_hash=auth.get_password_hash(PASSWORD), role="pm"))
+        if db.query(models.OfferedModule).filter(models.OfferedModule.semester == SEMESTER).count():
+            db.commit()
+            return
+        lecturer = models.Lecturer(first_name="Bench", last_name="Lecturer", title="Dr", employment_type="Full")
+        room = models.Room(name="Bench Room", capacity=100, type="Lecture Classroom", status=True)
+        db.add_all([lecturer, room])
+        db.flush()
+        for i in range(offers):
+            code = f"ASYNC-{i:04d}"
+            db.add(models.Module(module_code=code, name=f"Async module {i}", ects=5,
+                                 room_type="Lecture Classroom", semester=1, assessment_breakdown=[]))
+            db.flush()
+            offer = models.OfferedModule(module_code=code, lecturer_id=lecturer.id, semester=SEMESTER)
+            db.add(offer)
+            db.flush()
+            slot = i % (len(DAYS) * 6)
+            start = 8 * 60 + (slot % 6) * 105
+            db.add(models.ScheduleEntry(
+                offered_module_id=offer.id, room_id=room.id if i < len(DAYS) * 6 else None,
+                day_of_week=DAYS[slot // 6], semester=SEMESTER,
+                start_time=f"{start // 60:02d}:{start % 60:02d}", end_time=f"{(start + 90) // 60:02d}:{(start + 90) % 60:02d}",
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _mount_sync_baseline():
+    @app.get("/sync/schedule/")
+    def get_schedule_sync(semester: str, db: Session = Depends(get_db)):
+        query = _with_names(db.query(models.ScheduleEntry).filter(models.ScheduleEntry.semester == semester))
+        return [_to_response(r) for r in query.all()]
+
+    @app.get("/sync/offered-modules/")
+    def get_offers_sync(semester: str, db: Session = Depends(get_db)):
+        rows = (
+            db.query(models.OfferedModule)
+            .options(joinedload(models.OfferedModule.module), joinedload(models.OfferedModule.lecturer))
+            .filter(models.OfferedModule.semester == semester)
+            .all()
+        )
+        return [{"id": r.id, "module_code": r.module_code, "module_name": r.module.name if r.module else "Unknown Module",
+                 "lecturer_name": f"{r.lecturer.first_name} {r.lecturer.last_name}" if r.lecturer else "Unassigned",
+                 "semester": r.semester, "status": r.status} for r in rows]
+
+
+def _pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run(client, path: str, headers: dict, requests: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+
+    async def one():
+        async with sem:
+            t = time.perf_counter()
+            r = await client.get(path, params={"semester": SEMESTER}, headers=headers)
+            latencies.append((time.perf_counter() - t) * 1000)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    print(f"{path:28s} {requests / elapsed:8.1f} req/s  p50={statistics.median(latencies):.1f}ms "
+          f"p99={_pct(latencies, 0.99):.1f}ms  statuses {statuses}")
+
+
+async def main_async(args):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        r = await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        for path in ("/sync/schedule/", "/schedule/", "/sync/offered-modules/", "/offered-modules/"):
+            await run(client, path, headers, args.requests, args.concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--offers", type=int, default=60)
+    args = parser.parse_args()
+
+    _seed(args.offers)
+    _mount_sync_baseline()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
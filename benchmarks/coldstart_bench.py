@@ -0,0 +1,91 @@
+# benchmarks/coldstart_bench.py
+"""
+Cold-start time of the serverless entry point, with and without schema work at import.
+
+Each run is a fresh interpreter (like a new Vercel instance) that imports api.index
+and serves one DB-backed request (GET /semesters/). "startup" is the old behaviour
+(SCHEMA_ON_STARTUP=1: ensure_schema at import); "deferred" relies on a prior
+`python -m api.manage migrate`, which this script runs once. Reported per mode:
+interpreter + import time, first-request time and total time-to-first-byte
+(medians over --runs). --importtime N also prints the N slowest imports by
+cumulative time from `python -X importtime`.
+
+    DATABASE_URL=postgresql://... python -m benchmarks.coldstart_bench --runs 10 --importtime 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+CHILD = """
+import json, time, warnings
+warnings.simplefilter("ignore")
+t0 = time.perf_counter()
+from api.index import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+r = TestClient(app).get("/semesters/")
+t2 = time.perf_counter()
+print(json.dumps({"import": (t1 - t0) * 1000, "request": (t2 - t1) * 1000, "status": r.status_code}))
+"""
+
+
+def _env(schema_on_startup: bool) -> dict:
+    env = dict(os.environ)
+    env["SCHEMA_ON_STARTUP"] = "1" if schema_on_startup else "0"
+    env["PYTHONWARNINGS"] = "ignore"
+    return env
+
+
+def cold_start(schema_on_startup: bool) -> dict:
+    started = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=_env(schema_on_startup),
+                         capture_output=True, text=True, check=True).stdout
+    total = (time.perf_counter() - started) * 1000
+    result = json.loads(out.strip().splitlines()[-1])
+    result["total"] = total
+    return result
+
+
+def slowest_imports(schema_on_startup: bool, top: int):
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import api.index"], cwd=ROOT,
+                         env=_env(schema_on_startup), capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+    print(f"\nslowest imports (SCHEMA_ON_STARTUP={int(schema_on_startup)}), ms cumulative / self:")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N")
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, "-m", "api.manage", "migrate"], cwd=ROOT, env=_env(False), check=True)
+
+    for label, flag in (("startup", True), ("deferred", False)):
+        runs = [cold_start(flag) for _ in range(args.runs)]
+        med = {k: statistics.median(r[k] for r in runs) for k in ("import", "request", "total")}
+        statuses = sorted({r["status"] for r in runs})
+        print(f"{label:9s} import={med['import']:7.1f}ms  first request={med['request']:7.1f}ms  "
+              f"time-to-first-byte={med['total']:7.1f}ms  statuses {statuses}")
+
+    if args.importtime:
+        slowest_imports(True, args.importtime)
+        slowest_imports(False, args.importtime)
+
+
+if __name__ == "__main__":
+    main()
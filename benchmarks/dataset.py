@@ -0,0 +1,290 @@
+# benchmarks/dataset.py
+"""
+Synthetic university dataset generator.
+
+Builds a deterministic (--seed) university at one of the SCALES: study programs
+with specializations, modules and student groups; domains; lecturers with domains,
+qualified modules, teaching loads and weekly availabilities; rooms of every
+standard type; semesters; scheduler constraints; offered modules for one
+semester, and schedule entries placed greedily without room or lecturer clashes.
+Rows go in through bulk INSERT ... RETURNING, so "large" takes seconds rather
+than minutes, on SQLite as well as Postgres (whatever DATABASE_URL points at).
+
+Also creates pm@bench.icss / hosp@bench.icss (head of the first program) /
+lecturer@bench.icss, password "password".
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.dataset --scale medium --reset
+
+--reset drops every table of the target database first.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from api import auth, migrations, models, room_index, versions  # noqa: E402
+from api.database import get_engine  # noqa: E402
+from api.timeutils import DAYS  # noqa: E402
+
+SEMESTER = "Bench Winter"
+PASSWORD = "password"
+ROOM_TYPES = ["Lecture Classroom", "Computer Lab", "Seminar"]
+EQUIPMENT = ["Projector", "PC", "Whiteboard", "Smartboard", "Microphone", "Camera"]
+LOCATIONS = ["Berlin", "Düsseldorf", "Munich"]
+ASSESSMENTS = ["Written Exam", "Project", "Presentation", "Oral Exam", "Portfolio"]
+SUBJECTS = ["Computer Science", "Data Science", "Business", "Design", "Engineering", "Psychology",
+            "Media", "Finance", "Marketing", "Cyber Security", "Logistics", "Health Management"]
+FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Elif", "Farid", "Greta", "Hannah", "Ivan", "Jonas",
+               "Katja", "Lukas", "Mara", "Nils", "Olga", "Paul", "Rana", "Sven", "Tara", "Yusuf"]
+LAST_NAMES = ["Becker", "Schmidt", "Yilmaz", "Novak", "Fischer", "Weber", "Kaya", "Wagner",
+              "Hoffmann", "Rossi", "Klein", "Wolf", "Brandt", "Lang", "Costa", "Meyer"]
+
+# slot grid used for placement: 08:00-18:30 in 90 minute sessions with 15 minute breaks
+SESSION = 90
+STARTS = [8 * 60 + i * (SESSION + 15) for i in range(6)]
+
+
+@dataclass(frozen=True)
+class Scale:
+    programs: int
+    specializations_per_program: int
+    modules_per_program: int
+    groups_per_program: int
+    lecturers: int
+    rooms: int
+    domains: int
+
+
+SCALES = {
+    "small": Scale(programs=3, specializations_per_program=2, modules_per_program=20, groups_per_program=3,
+                   lecturers=30, rooms=15, domains=8),
+    "medium": Scale(programs=12, specializations_per_program=3, modules_per_program=40, groups_per_program=4,
+                    lecturers=200, rooms=60, domains=20),
+    "large": Scale(programs=40, specializations_per_program=4, modules_per_program=60, groups_per_program=6,
+                   lecturers=900, rooms=250, domains=40),
+}
+
+
+def _hhmm(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _ids(db: Session, model, rows: list) -> list:
+    if not rows:
+        return []
+    return list(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows))
+
+
+def _links(db: Session, table, rows: list):
+    if rows:
+        db.execute(insert(table), rows)
+
+
+def _availability(rng: random.Random) -> dict:
+    data = {}
+    for day in DAYS[:5]:
+        if rng.random() < 0.2:
+            data[day] = {"is_available": False, "ranges": []}
+            continue
+        start = rng.choice([8, 9, 10]) * 60
+        end = rng.choice([14, 16, 18, 19]) * 60
+        data[day] = {"is_available": True, "ranges": [{"start": _hhmm(start), "end": _hhmm(end)}]}
+    for day in DAYS[5:]:
+        data[day] = {"is_available": False, "ranges": []}
+    return data
+
+
+def generate(db: Session, scale: Scale, seed: int = 1) -> dict:
+    rng = random.Random(seed)
+    counts = {}
+
+    domain_ids = _ids(db, models.Domain, [{"name": f"{SUBJECTS[i % len(SUBJECTS)]} {i // len(SUBJECTS) + 1}"}
+                                          for i in range(scale.domains)])
+
+    lecturer_rows = []
+    for i in range(scale.lecturers):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        lecturer_rows.append({
+            "first_name": first, "last_name": f"{last}-{i}",
+            "title": rng.choice(["Prof. Dr.", "Dr.", "M.Sc."]),
+            "employment_type": rng.choice(["Full time", "Full time", "Part time", "Freelancer"]),
+            "mdh_email": f"{first.lower()}.{last.lower()}{i}@bench.icss",
+            "location": rng.choice(LOCATIONS),
+            "teaching_load": f"{rng.choice([4, 8, 12, 16, 18, 20])} SWS",
+            "domain_id": rng.choice(domain_ids),
+        })
+    lecturer_ids = _ids(db, models.Lecturer, lecturer_rows)
+    _links(db, models.lecturer_domains, [
+        {"lecturer_id": lid, "domain_id": did}
+        for lid in lecturer_ids for did in rng.sample(domain_ids, k=min(len(domain_ids), rng.randint(1, 3)))
+    ])
+    _ids(db, models.LecturerAvailability, [
+        {"lecturer_id": lid, "schedule_data": _availability(rng)} for lid in lecturer_ids if rng.random() < 0.7
+    ])
+
+    program_rows = []
+    for p in range(scale.programs):
+        subject = SUBJECTS[p % len(SUBJECTS)]
+        level = "Master" if p % 3 == 2 else "Bachelor"
+        program_rows.append({
+            "name": f"{subject} {level} {p + 1}", "acronym": f"{subject[:3].upper()}{p + 1}",
+            "status": True, "start_date": "2024-10-01", "total_ects": 120 if level == "Master" else 180,
+            "location": LOCATIONS[p % len(LOCATIONS)], "level": level, "degree_type": "B.Sc." if level == "Bachelor" else "M.Sc.",
+            "head_of_program_id": lecturer_ids[p % len(lecturer_ids)],
+        })
+    program_ids = _ids(db, models.StudyProgram, program_rows)
+
+    spec_rows, module_rows, group_rows = [], [], []
+    for p, pid in enumerate(program_ids):
+        acronym = program_rows[p]["acronym"]
+        for s in range(scale.specializations_per_program):
+            spec_rows.append({"program_id": pid, "name": f"{acronym} Track {s + 1}", "acronym": f"{acronym}-T{s + 1}",
+                              "start_date": "2024-10-01", "status": True, "study_program": program_rows[p]["name"]})
+        for m in range(scale.modules_per_program):
+            parts = rng.sample(ASSESSMENTS, k=rng.choice([1, 1, 2]))
+            breakdown = [{"type": parts[0], "weight": 100}] if len(parts) == 1 else \
+                [{"type": parts[0], "weight": 60}, {"type": parts[1], "weight": 40}]
+            module_rows.append({
+                "module_code": f"{acronym}-{m + 1:03d}", "name": f"{program_rows[p]['name'].split()[0]} Module {m + 1}",
+                "ects": rng.choice([5, 5, 5, 10]), "room_type": rng.choices(ROOM_TYPES, weights=[6, 3, 2])[0],
+                "assessment_type": parts[0], "assessment_breakdown": breakdown,
+                "semester": m * 6 // scale.modules_per_program + 1, "category": rng.choice(["Core", "Core", "Elective"]),
+                "program_id": pid, "equipment": "Projector" if m % 4 == 0 else None,
+            })
+        for g in range(scale.groups_per_program):
+            group_rows.append({"name": f"{acronym}-G{g + 1}", "size": rng.randint(12, 60),
+                               "program": program_rows[p]["name"], "program_id": pid,
+                               "email": f"{acronym.lower()}-g{g + 1}@bench.icss"})
+    spec_ids = _ids(db, models.Specialization, spec_rows)
+    db.execute(insert(models.Module), module_rows)
+    _ids(db, models.Group, group_rows)
+
+    per_program = scale.specializations_per_program
+    _links(db, models.module_specializations, [
+        {"module_code": row["module_code"], "specialization_id": spec_ids[program_ids.index(row["program_id"]) * per_program + rng.randrange(per_program)]}
+        for row in module_rows if per_program and rng.random() < 0.6
+    ])
+
+    # each module gets one or two qualified lecturers; the first one teaches the offer
+    teacher = {}
+    qualified = []
+    for row in module_rows:
+        for k, lid in enumerate(rng.sample(lecturer_ids, k=min(len(lecturer_ids), rng.choice([1, 2])))):
+            qualified.append({"lecturer_id": lid, "module_code": row["module_code"]})
+            if k == 0:
+                teacher[row["module_code"]] = lid
+    _links(db, models.lecturer_modules, qualified)
+
+    room_rows = []
+    for r in range(scale.rooms):
+        room_type = ROOM_TYPES[r % len(ROOM_TYPES)]
+        room_rows.append({
+            "name": f"{LOCATIONS[r % len(LOCATIONS)][:3].upper()}-{r + 1:04d}",
+            "capacity": rng.choice([20, 30, 40, 60, 80, 120]), "type": room_type, "status": rng.random() > 0.05,
+            "equipment": ", ".join(rng.sample(EQUIPMENT, k=rng.randint(1, 3))), "location": LOCATIONS[r % len(LOCATIONS)],
+        })
+    room_ids = _ids(db, models.Room, room_rows)
+
+    _ids(db, models.Semester, [
+        {"name": SEMESTER, "acronym": "BW", "start_date": date(2026, 10, 1), "end_date": date(2027, 3, 31)},
+        {"name": "Bench Summer", "acronym": "BS", "start_date": date(2027, 4, 1), "end_date": date(2027, 9, 30)},
+    ])
+    constraint_rows = [
+        {"name": "Opening hours", "category": "University Policy", "scope": "University", "target_id": "0",
+         "rule_text": "The University is open from 08:00 to 20:00.", "is_enabled": True},
+        {"name": "Open days", "category": "University Open Days", "scope": "University", "target_id": "0",
+         "rule_text": "The University is open on: Monday, Tuesday, Wednesday, Thursday, Friday.", "is_enabled": True},
+        {"name": "Session length", "category": "Time Definition", "scope": "University", "target_id": "0",
+         "rule_text": f"Sessions are {SESSION} minutes long with a 15 minute break.", "is_enabled": True},
+    ]
+    for lid in rng.sample(lecturer_ids, k=len(lecturer_ids) // 10):
+        constraint_rows.append({"name": "Lecturer day off", "category": "Unavailable Days", "scope": "Lecturer",
+                                "target_id": str(lid), "rule_text": f"Lecturer is unavailable on {rng.choice(DAYS[:5])}s.",
+                                "is_enabled": True})
+    _ids(db, models.SchedulerConstraint, constraint_rows)
+
+    offer_ids = _ids(db, models.OfferedModule, [
+        {"module_code": row["module_code"], "lecturer_id": teacher.get(row["module_code"]), "semester": SEMESTER,
+         "status": "Confirmed"}
+        for row in module_rows
+    ])
+
+    # greedy placement, one weekly session per offer
+    rooms_by_type = {t: [rid for rid, row in zip(room_ids, room_rows) if row["type"] == t and row["status"]] for t in ROOM_TYPES}
+    busy_rooms, busy_lecturers = set(), set()
+    slots = [(day, start) for day in DAYS[:5] for start in STARTS]
+    entries = []
+    for offer_id, row in zip(offer_ids, module_rows):
+        lecturer_id = teacher.get(row["module_code"])
+        for day, start in rng.sample(slots, k=len(slots)):
+            if (lecturer_id, day, start) in busy_lecturers:
+                continue
+            room_id = next((rid for rid in rooms_by_type[row["room_type"]] if (rid, day, start) not in busy_rooms), None)
+            if room_id is None:
+                continue
+            busy_rooms.add((room_id, day, start))
+            busy_lecturers.add((lecturer_id, day, start))
+            entries.append({"offered_module_id": offer_id, "room_id": room_id, "day_of_week": day,
+                            "start_time": _hhmm(start), "end_time": _hhmm(start + SESSION), "semester": SEMESTER})
+            break
+    _ids(db, models.ScheduleEntry, entries)
+    versions.bump(db, SEMESTER, versions.CATALOG)
+    candidates = room_index.rebuild(db.connection())
+
+    password_hash = auth.get_password_hash(PASSWORD)
+    _ids(db, models.User, [
+        {"email": "pm@bench.icss", "password_hash": password_hash, "role": "pm"},
+        {"email": "hosp@bench.icss", "password_hash": password_hash, "role": "hosp", "lecturer_id": lecturer_ids[0]},
+        {"email": "lecturer@bench.icss", "password_hash": password_hash, "role": "lecturer", "lecturer_id": lecturer_ids[-1]},
+    ])
+
+    counts.update(programs=len(program_ids), specializations=len(spec_ids), modules=len(module_rows),
+                  groups=len(group_rows), lecturers=len(lecturer_ids), rooms=len(room_ids),
+                  offered_modules=len(offer_ids), schedule_entries=len(entries), constraints=len(constraint_rows),
+                  room_candidates=candidates)
+    return counts
+
+
+def reset_schema(engine):
+    models.Base.metadata.drop_all(bind=engine)
+    migrations.ensure_schema(engine)
+
+
+def build(scale: str, seed: int = 1, reset: bool = False) -> dict:
+    engine = get_engine()
+    if reset:
+        reset_schema(engine)
+    else:
+        migrations.ensure_schema(engine)
+    with Session(engine) as db:
+        if db.query(models.User).filter(models.User.email == "pm@bench.icss").first():
+            raise SystemExit("A generated dataset is already present; pass --reset to rebuild it.")
+        counts = generate(db, SCALES[scale], seed)
+        db.commit()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="drop all tables first")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = build(args.scale, args.seed, args.reset)
+    print(f"{args.scale} dataset generated in {time.perf_counter() - started:.1f}s: "
+          + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# benchmarks/endpoints_bench.py
+"""
+Latency of every list and CRUD endpoint against generated datasets of several sizes.
+
+For each --scales entry the target database is rebuilt with benchmarks.dataset
+(tables are dropped!), then every list endpoint (plain, paged and projected where
+supported) and the create / update / delete of every resource are called
+--iterations times in-process as the generated PM user. Prints median and p95
+latency per endpoint and scale. --json writes the numbers; --compare prints the
+change against an earlier --json file, so regressions show up as percentages.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.endpoints_bench --scales small,medium,large --json bench.json
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+from api import models  # noqa: E402
+from api.database import SessionLocal, db_url  # noqa: E402
+from api.index import app  # noqa: E402
+from benchmarks import dataset  # noqa: E402
+
+SEMESTER = dataset.SEMESTER
+
+LISTS = [
+    ("GET /study-programs/", "/study-programs/", {}),
+    ("GET /study-programs/?fields", "/study-programs/", {"fields": "name,acronym"}),
+    ("GET /specializations/", "/specializations/", {}),
+    ("GET /modules/", "/modules/", {}),
+    ("GET /modules/?limit=100", "/modules/", {"limit": 100}),
+    ("GET /modules/?fields", "/modules/", {"fields": "name,ects,program_id"}),
+    ("GET /lecturers/", "/lecturers/", {}),
+    ("GET /lecturers/?limit=100", "/lecturers/", {"limit": 100}),
+    ("GET /lecturers/?fields", "/lecturers/", {"fields": "first_name,last_name"}),
+    ("GET /groups/", "/groups/", {}),
+    ("GET /rooms/", "/rooms/", {}),
+    ("GET /domains/", "/domains/", {}),
+    ("GET /semesters/", "/semesters/", {}),
+    ("GET /availabilities/", "/availabilities/", {}),
+    ("GET /scheduler-constraints/", "/scheduler-constraints/", {}),
+    ("GET /offered-modules/", "/offered-modules/", {"semester": SEMESTER}),
+    ("GET /offered-modules/?fields", "/offered-modules/", {"semester": SEMESTER, "fields": "module_name,lecturer_name"}),
+    ("GET /schedule/", "/schedule/", {"semester": SEMESTER}),
+    ("GET /schedule/export", "/schedule/export", {"semester": SEMESTER, "format": "csv"}),
+]
+
+
+def _context() -> dict:
+    db = SessionLocal()
+    try:
+        return {
+            "program_id": db.query(models.StudyProgram.id).order_by(models.StudyProgram.id).first()[0],
+            "lecturer_id": db.query(models.Lecturer.id).order_by(models.Lecturer.id).first()[0],
+            "domain_id": db.query(models.Domain.id).order_by(models.Domain.id).first()[0],
+            "room_id": db.query(models.Room.id).order_by(models.Room.id).first()[0],
+            "module_code": db.query(models.Module.module_code).order_by(models.Module.module_code).first()[0],
+            "offer_id": db.query(models.OfferedModule.id).order_by(models.OfferedModule.id).first()[0],
+        }
+    finally:
+        db.close()
+
+
+# name -> (collection path, create payload, update payload or None, id field); payloads take (iteration, context)
+CRUD = {
+    "study-programs": ("/study-programs/", lambda i, c: {"name": f"Bench Program {i}", "acronym": f"BP{i}",
+                                                         "start_date": "2026-10-01", "total_ects": 180},
+                       lambda i, c: {"total_ects": 210}, "id"),
+    "specializations": ("/specializations/", lambda i, c: {"name": f"Bench Track {i}", "acronym": f"BT{i}",
+                                                           "start_date": "2026-10-01", "program_id": c["program_id"]},
+                        lambda i, c: {"name": f"Bench Track {i}b"}, "id"),
+    "modules": ("/modules/", lambda i, c: {"module_code": f"BENCH-{i}", "name": f"Bench Module {i}", "ects": 5,
+                                           "room_type": "Seminar", "semester": 1, "program_id": c["program_id"],
+                                           "assessment_breakdown": [{"type": "Project"}]},
+                lambda i, c: {"ects": 10, "assessment_breakdown": [{"type": "Project", "weight": 50}, {"type": "Oral Exam"}]},
+                "module_code"),
+    "lecturers": ("/lecturers/", lambda i, c: {"first_name": "Bench", "last_name": str(i), "title": "Dr.",
+                                               "employment_type": "Part time", "domain_ids": [c["domain_id"]]},
+                  lambda i, c: {"phone": f"+49 {i}", "domain_ids": [c["domain_id"]]}, "id"),
+    "groups": ("/groups/", lambda i, c: {"name": f"Bench Group {i}", "size": 25, "program_id": c["program_id"]},
+               lambda i, c: {"size": 30}, "id"),
+    "rooms": ("/rooms/", lambda i, c: {"name": f"Bench Room {i}", "capacity": 30, "type": "Seminar"},
+              lambda i, c: {"capacity": 40}, "id"),
+    "scheduler-constraints": ("/scheduler-constraints/",
+                              lambda i, c: {"name": f"Bench rule {i}", "category": "Unavailable Days",
+                                            "rule_text": "Lecturer is unavailable on Fridays.", "scope": "Lecturer",
+                                            "target_id": str(c["lecturer_id"])},
+                              lambda i, c: {"is_enabled": False}, "id"),
+    "offered-modules": ("/offered-modules/", lambda i, c: {"module_code": c["module_code"], "semester": "Bench Summer"},
+                        lambda i, c: {"lecturer_id": c["lecturer_id"]}, "id"),
+    "schedule": ("/schedule/", lambda i, c: {"offered_module_id": c["offer_id"], "room_id": c["room_id"],
+                                             "day_of_week": "Saturday", "start_time": "09:00", "end_time": "10:30",
+                                             "semester": SEMESTER},
+                 None, "id"),
+}
+
+
+def _timed(call) -> tuple:
+    started = time.perf_counter()
+    response = call()
+    return (time.perf_counter() - started) * 1000, response
+
+
+def _summary(latencies: list, statuses: dict, rows=None) -> dict:
+    ordered = sorted(latencies)
+    out = {"p50_ms": round(statistics.median(ordered), 2),
+           "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+           "statuses": {str(k): v for k, v in sorted(statuses.items())}}
+    if rows is not None:
+        out["rows"] = rows
+    return out
+
+
+def bench_lists(client, headers, iterations: int) -> dict:
+    results = {}
+    for name, path, params in LISTS:
+        latencies, statuses, rows = [], {}, None
+        for _ in range(iterations + 1):
+            ms, r = _timed(lambda: client.get(path, params=params, headers=headers))
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+            latencies.append(ms)
+            if rows is None and r.headers.get("content-type", "").startswith("application/json"):
+                rows = len(r.json())
+        results[name] = _summary(latencies[1:], statuses, rows)  # first call warms caches
+    return results
+
+
+def bench_crud(client, headers, iterations: int, ctx: dict) -> dict:
+    results = {}
+    for name, (path, create, update, id_field) in CRUD.items():
+        timings = {"POST": [], "PUT": [], "DELETE": []}
+        statuses = {"POST": {}, "PUT": {}, "DELETE": {}}
+        for i in range(iterations):
+            ms, r = _timed(lambda: client.post(path, json=create(i, ctx), headers=headers))
+            timings["POST"].append(ms)
+            statuses["POST"][r.status_code] = statuses["POST"].get(r.status_code, 0) + 1
+            if r.status_code != 200:
+                continue
+            item = f"{path}{r.json()[id_field]}"
+            steps = [("PUT", lambda: client.put(item, json=update(i, ctx), headers=headers))] if update else []
+            steps.append(("DELETE", lambda: client.delete(item, headers=headers)))
+            for method, call in steps:
+                ms, r = _timed(call)
+                timings[method].append(ms)
+                statuses[method][r.status_code] = statuses[method].get(r.status_code, 0) + 1
+        for method, latencies in timings.items():
+            if latencies:
+                results[f"{method} /{name}/"] = _summary(latencies, statuses[method])
+    return results
+
+
+def run_scale(scale: str, iterations: int) -> dict:
+    started = time.perf_counter()
+    counts = dataset.build(scale, reset=True)
+    print(f"\n== {scale}: generated in {time.perf_counter() - started:.1f}s "
+          f"({', '.join(f'{k}={v}' for k, v in counts.items())})")
+
+    with TestClient(app) as client:
+        r = client.post("/auth/login", json={"email": "pm@bench.icss", "password": dataset.PASSWORD})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        results = bench_lists(client, headers, iterations)
+        results.update(bench_crud(client, headers, iterations, _context()))
+    return results
+
+
+def _print(scale: str, results: dict, baseline: dict):
+    print(f"{'endpoint':36s} {'p50 ms':>9s} {'p95 ms':>9s} {'rows':>6s}  statuses")
+    for name, r in results.items():
+        line = f"{name:36s} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {str(r.get('rows', '')):>6s}  {r['statuses']}"
+        before = baseline.get(scale, {}).get(name)
+        if before:
+            line += f"  p50 {(r['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100:+.0f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", default="small,medium", help=f"comma separated, from {sorted(dataset.SCALES)}")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json output to compare against")
+    parser.add_argument("--drop", action="store_true", help="required to run against a non-SQLite database")
+    args = parser.parse_args()
+
+    if make_url(db_url).get_backend_name() != "sqlite" and not args.drop:
+        raise SystemExit("This drops every table of DATABASE_URL; pass --drop to confirm.")
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in dataset.SCALES]
+    if unknown:
+        raise SystemExit(f"Unknown scale(s): {', '.join(unknown)}")
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = {}
+    for scale in scales:
+        report[scale] = run_scale(scale, args.iterations)
+        _print(scale, report[scale], baseline)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/login_bench.py
+"""
+Login throughput and its effect on other endpoints.
+
+Fires a burst of concurrent logins at the app in-process while a second client
+keeps polling a cheap endpoint (GET /version), then reports login throughput and
+the latency percentiles of the poller. --baseline mounts the previous
+synchronous login handler under /auth/login-sync for comparison.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.login_bench --logins 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+import httpx  # noqa: E402
+from fastapi import Depends, HTTPException  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from api import auth, models, schemas  # noqa: E402
+from api.database import SessionLocal, get_db  # noqa: E402
+from api.index import app  # noqa: E402
+
+EMAIL = "bench-login@icss.com"
+PASSWORD = "password"
+
+
+def _ensure_user():
+    db = SessionLocal()
+    try:
+        if not db.query(models.User).filter(models.User.email == EMAIL).first():
+            db.add(models.User(email=EMAIL, password_hash=auth.get_password_hash(PASSWORD), role="pm"))
+            db.commit()
+    finally:
+        db.close()
+
+
+def _mount_baseline():
+    @app.post("/auth/login-sync", response_model=schemas.Token)
+    def login_sync(form_data: schemas.LoginRequest, db: Session = Depends(get_db)):
+        user = db.query(models.User).filter(models.User.email == form_data.email).first()
+        if not user or not auth.verify_password(form_data.password, user.password_hash):
+            raise HTTPException(status_code=400, detail="Incorrect email/password")
+        return {"access_token": auth.create_access_token(auth.token_claims(user)),
+                "token_type": "bearer", "role": user.role, "lecturer_id": user.lecturer_id}
+
+
+def _pct(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run(path: str, logins: int, concurrency: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        sem = asyncio.Semaphore(concurrency)
+        statuses = {}
+        done = asyncio.Event()
+        latencies = []
+
+        async def one_login():
+            async with sem:
+                r = await client.post(path, json={"email": EMAIL, "password": PASSWORD})
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        async def poll():
+            while not done.is_set():
+                t = time.perf_counter()
+                await client.get("/version")
+                latencies.append((time.perf_counter() - t) * 1000)
+                await asyncio.sleep(0.005)
+
+        poller = asyncio.create_task(poll())
+        started = time.perf_counter()
+        await asyncio.gather(*(one_login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await poller
+
+    ok = statuses.get(200, 0)
+    print(f"{path}: {logins} logins in {elapsed:.2f}s -> {ok / elapsed:.1f} ok/s, statuses {statuses}")
+    if latencies:
+        print(f"  GET /version during burst: n={len(latencies)} "
+              f"p50={statistics.median(latencies):.1f}ms p99={_pct(latencies, 0.99):.1f}ms max={max(latencies):.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--baseline", action="store_true", help="also run the old synchronous handler")
+    args = parser.parse_args()
+
+    _ensure_user()
+    if args.baseline:
+        _mount_baseline()
+        asyncio.run(run("/auth/login-sync", args.logins, args.concurrency))
+    asyncio.run(run("/auth/login", args.logins, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
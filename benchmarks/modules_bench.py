@@ -0,0 +1,114 @@
+# benchmarks/modules_bench.py
+"""
+GET /modules/ on a large module catalogue.
+
+Seeds --modules modules whose assessment breakdown is stored in the legacy JSON
+text format, runs the schema backfill, then times GET /modules/ against the
+stored JSON column. --baseline also mounts the previous handler, which parses
+assessment_type with json.loads and builds a ModuleResponse per row, under
+/modules-legacy for comparison.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.modules_bench --modules 2000 --baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+
+from fastapi import Depends  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import Session, joinedload  # noqa: E402
+
+from api import auth, migrations, models, schemas  # noqa: E402
+from api.database import SessionLocal, engine, get_db  # noqa: E402
+from api.index import app  # noqa: E402
+
+EMAIL = "bench-modules@icss.com"
+PASSWORD = "password"
+PREFIX = "BENCH-"
+
+
+LEGACY_TEXT = json.dumps({
+    "assessments": [{"type": "Written Exam", "weight": 60}, {"type": "Project", "weight": 40}],
+    "lecturer_assignments": [],
+})
+
+
+def _seed(n: int):
+    db = SessionLocal()
+    try:
+        db.query(models.Module).filter(models.Module.module_code.like(f"{PREFIX}%")).delete(synchronize_session=False)
+        db.bulk_insert_mappings(models.Module, [
+            {"module_code": f"{PREFIX}{i:05d}", "name": f"Module {i}", "ects": 5, "room_type": "Lecture Classroom",
+             "assessment_type": LEGACY_TEXT, "semester": 1 + i % 6, "category": "Core"}
+            for i in range(n)
+        ])
+        if not db.query(models.User).filter(models.User.email == EMAIL).first():
+            db.add(models.User(email=EMAIL, password_hash=auth.get_password_hash(PASSWORD), role="pm"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _mount_baseline():
+    def legacy_response(row):
+        # every row parses its assessment text, as before the backfill
+        try:
+            parsed = json.loads(LEGACY_TEXT)
+        except ValueError:
+            parsed = None
+        assessments = parsed.get("assessments") or [] if isinstance(parsed, dict) else []
+        return schemas.ModuleResponse(
+            module_code=row.module_code, name=row.name, ects=row.ects, room_type=row.room_type,
+            assessment_type=LEGACY_TEXT, semester=row.semester, category=row.category,
+            program_id=row.program_id, specializations=row.specializations or [],
+            assessment_breakdown=assessments,
+        )
+
+    @app.get("/modules-legacy", response_model=list[schemas.ModuleResponse])
+    def read_modules_legacy(db: Session = Depends(get_db)):
+        rows = db.query(models.Module).options(joinedload(models.Module.specializations)).all()
+        return [legacy_response(r) for r in rows]
+
+
+def _time(client, path, headers, runs):
+    client.get(path, headers=headers)  # warm up
+    samples = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        r = client.get(path, headers=headers)
+        samples.append((time.perf_counter() - t) * 1000)
+        r.raise_for_status()
+    print(f"GET {path}: {len(r.json())} modules, median {statistics.median(samples):.1f}ms "
+          f"min {min(samples):.1f}ms over {runs} runs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--baseline", action="store_true", help="also time the json.loads-per-row handler")
+    args = parser.parse_args()
+
+    _seed(args.modules)
+    t = time.perf_counter()
+    migrations.backfill_module_assessments(engine)
+    print(f"backfill: {(time.perf_counter() - t) * 1000:.0f}ms")
+
+    if args.baseline:
+        _mount_baseline()
+    client = TestClient(app)
+    token = client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    if args.baseline:
+        _time(client, "/modules-legacy", headers, args.runs)
+    _time(client, "/modules/", headers, args.runs)
+
+
+if __name__ == "__main__":
+    main()
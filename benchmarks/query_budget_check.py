@@ -0,0 +1,191 @@
+# benchmarks/query_budget_check.py
+"""
+Checks the SQL statement budget of every route against generated datasets.
+
+Runs each route (lists, CRUD and the one-off endpoints) in-process with
+QUERY_BUDGET_MODE=enforce against the "small" and the "medium" dataset of
+benchmarks.dataset (tables are dropped!) and fails when
+  * a request runs more statements than its budget in api/query_budget.py,
+  * a route's statement count grows with the data set (an N+1 in the making), or
+  * a route has no budget, or was never exercised.
+The token-version cache is disabled so every authenticated request pays its
+worst case. Exit status is non-zero on failure; --report prints every count.
+
+    DATABASE_URL=sqlite:///./bench.db python -m benchmarks.query_budget_check --report
+
+tests/test_query_budgets.py runs the budget and coverage checks against the
+small data set on a temporary SQLite file as part of `python -m pytest`.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ["QUERY_BUDGET_MODE"] = "enforce"
+os.environ["TOKEN_VERSION_TTL"] = "0"
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import func  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+from api import metrics, models, query_budget  # noqa: E402
+from api.database import SessionLocal, db_url  # noqa: E402
+from api.index import app  # noqa: E402
+from benchmarks import dataset  # noqa: E402
+from benchmarks.endpoints_bench import CRUD, LISTS, _context  # noqa: E402
+
+SCALES = ("small", "medium")
+SEMESTER = dataset.SEMESTER
+WEEK = {day: {"is_available": True, "ranges": [{"start": "09:00", "end": "17:00"}]}
+        for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")}
+
+
+class Recorder:
+    """Highest statement count of a request per (method, route template), read from the metrics counters."""
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.counts = {}
+        self.failures = []
+
+    def call(self, method: str, path: str, headers=None, **kwargs):
+        before = {key: (r.count, r.statements) for key, r in metrics._routes.items()}
+        try:
+            response = self.client.request(method, path, headers=headers, **kwargs)
+        except query_budget.QueryBudgetExceeded as e:
+            self.failures.append(str(e))
+            response = None
+        for key, r in metrics._routes.items():
+            count, statements = before.get(key, (0, 0))
+            if r.count != count:
+                self.counts[key] = max(self.counts.get(key, 0), r.statements - statements)
+        if response is not None and response.status_code >= 400:
+            self.failures.append(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+        return response
+
+
+def _login(rec: Recorder, email: str) -> dict:
+    r = rec.call("POST", "/auth/login", json={"email": email, "password": dataset.PASSWORD})
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def exercise(rec: Recorder):
+    pm = _login(rec, "pm@bench.icss")
+    lecturer = _login(rec, "lecturer@bench.icss")
+    ctx = _context()
+    db = SessionLocal()
+    try:
+        lecturer_id = db.query(models.User.lecturer_id).filter(models.User.email == "lecturer@bench.icss").scalar()
+        codes = [c for (c,) in db.query(models.Module.module_code).order_by(models.Module.module_code).limit(3)]
+        placeable = db.query(func.min(models.RoomCandidate.offered_module_id)).scalar()
+    finally:
+        db.close()
+
+    for path in ("/", "/version", "/health/db-pool", "/metrics"):
+        rec.call("GET", path)
+    for _, path, params in LISTS:
+        rec.call("GET", path, headers=pm, params=params)
+
+    for path, create, update, id_field in CRUD.values():
+        r = rec.call("POST", path, headers=pm, json=create(0, ctx))
+        item = f"{path}{r.json()[id_field]}"
+        if update:
+            rec.call("PUT", item, headers=pm, json=update(0, ctx))
+        rec.call("DELETE", item, headers=pm)
+
+    rec.call("GET", "/auth/me", headers=lecturer)
+    rec.call("GET", "/lecturers/me", headers=lecturer)
+    rec.call("GET", "/lecturers/workload", headers=pm, params={"semester": SEMESTER})
+    rec.call("GET", "/lecturers/workload", headers=lecturer, params={"semester": SEMESTER})
+    rec.call("PATCH", "/lecturers/me", headers=lecturer, json={"phone": "+49 1"})
+    rec.call("GET", f"/lecturers/{lecturer_id}/modules", headers=pm)
+    rec.call("PUT", f"/lecturers/{lecturer_id}/modules", headers=pm, json={"module_codes": codes})
+    rec.call("POST", "/availabilities/update", headers=pm, json={"lecturer_id": lecturer_id, "schedule_data": WEEK})
+    rec.call("GET", "/schedule/invalid", headers=pm, params={"semester": SEMESTER, "lecturer_id": lecturer_id})
+    # the generated schedule ignores availability, so the whole semester has entries to move at every scale
+    rec.call("POST", "/schedule/repair", headers=pm, params={"semester": SEMESTER})
+    rec.call("DELETE", f"/availabilities/lecturer/{lecturer_id}", headers=pm)
+    rec.call("GET", "/scheduler-constraints/compiled", headers=pm)
+    rec.call("GET", "/workspace/", headers=pm)
+    rec.call("GET", "/workspace/", headers=pm, params={"semester": SEMESTER})
+    rec.call("GET", "/workspace/", headers=lecturer, params={"semester": SEMESTER})
+    rec.call("GET", f"/offered-modules/{ctx['offer_id']}/candidate-rooms", headers=pm)
+    rec.call("GET", "/schedule/free-slots", headers=pm, params={"offered_module_id": placeable})
+    rec.call("POST", "/domains/", headers=pm, json={"name": "Budget Domain"})
+    r = rec.call("POST", "/semesters/", headers=pm,
+                 json={"name": "Budget Semester", "acronym": "BU", "start_date": "2027-10-01", "end_date": "2028-03-31"})
+    rec.call("DELETE", f"/semesters/{r.json()['id']}", headers=pm)
+    rec.call("GET", "/schedule/export", headers=pm, params={"semester": SEMESTER, "format": "ics"})
+    rec.call("POST", "/schedule/bulk", headers=pm, json=[
+        {"offered_module_id": ctx["offer_id"], "room_id": ctx["room_id"], "day_of_week": "Sunday",
+         "start_time": f"{9 + 2 * i:02d}:00", "end_time": f"{10 + 2 * i:02d}:30", "semester": SEMESTER}
+        for i in range(4)
+    ])
+    # free one session so the solver has something to place
+    entry = rec.call("GET", "/schedule/", params={"semester": SEMESTER}).json()[0]
+    rec.call("DELETE", f"/schedule/{entry['id']}", headers=pm)
+    rec.call("POST", "/schedule/solve", headers=pm, params={"semester": SEMESTER, "time_limit": 1})
+    rec.call("GET", "/seed")
+    rec.call("POST", "/auth/logout-all", headers=lecturer)
+
+
+def run(scale: str):
+    """Build the `scale` data set and exercise every route; returns (statement counts, failures)."""
+    dataset.build(scale, reset=True)
+    with TestClient(app) as client:
+        rec = Recorder(client)
+        exercise(rec)
+    return rec.counts, rec.failures
+
+
+def routes() -> set:
+    # the OpenAPI paths are the route templates the metrics are keyed by
+    return {(method.upper(), path) for path, operations in app.openapi()["paths"].items() for method in operations}
+
+
+def coverage_failures(counts: dict) -> list:
+    """Routes without a budget, and routes exercise() never reached."""
+    failures = []
+    for key in sorted(routes()):
+        if query_budget.BUDGETS.get(key) is None:
+            failures.append(f"{key[0]} {key[1]} has no budget")
+        if key not in counts:
+            failures.append(f"{key[0]} {key[1]} was not exercised")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--report", action="store_true", help="print the statement count of every route")
+    parser.add_argument("--drop", action="store_true", help="required to run against a non-SQLite database")
+    args = parser.parse_args()
+    if make_url(db_url).get_backend_name() != "sqlite" and not args.drop:
+        raise SystemExit("This drops every table of DATABASE_URL; pass --drop to confirm.")
+
+    counts, failures = {}, []
+    for scale in SCALES:
+        counts[scale], scale_failures = run(scale)
+        failures += [f"[{scale}] {f}" for f in scale_failures]
+
+    small, medium = (counts[s] for s in SCALES)
+    failures += coverage_failures(medium)
+    all_routes = routes()
+    for key in sorted(all_routes):
+        budget = query_budget.BUDGETS.get(key)
+        # one statement of slack: a write may be skipped when there is nothing to write (e.g. no room
+        # candidates on the small data set), while an N+1 grows with the row count
+        if key in medium and medium[key] > small.get(key, 0) + 1:
+            failures.append(f"{key[0]} {key[1]} grows with the data: {small.get(key)} -> {medium[key]} statements")
+        if args.report:
+            print(f"{key[0]:7s} {key[1]:42s} small={small.get(key, '-')!s:>3s} medium={medium.get(key, '-')!s:>3s} "
+                  f"budget={budget if budget is not None else '-'}")
+
+    for f in failures:
+        print("FAIL", f)
+    print(f"{len(all_routes)} routes, {len(failures)} failure(s)")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
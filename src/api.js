@@ -83,6 +83,12 @@ const api = {
   deleteLecturer(id) { return request(`/lecturers/${id}`, { method: "DELETE" }); },
 
   // LECTURER MODULE ASSIGNMENT
+  // scheduled weekly minutes vs. teaching_load; status is over | under | ok | unknown
+  getLecturerWorkload(semester, status) {
+    const params = new URLSearchParams({ semester });
+    if (status) params.set("status", status);
+    return request(`/lecturers/workload?${params.toString()}`);
+  },
   getLecturerModules(id) {
     return request(`/lecturers/${id}/modules`);
   },
@@ -94,7 +100,10 @@ const api = {
   },
 
   // ---------- GROUPS ----------
-  getGroups() { return request("/groups/"); },
+  getGroups(programId) {
+    const query = programId ? `?program_id=${encodeURIComponent(programId)}` : "";
+    return request(`/groups/${query}`);
+  },
   createGroup(payload) { return request("/groups/", { method: "POST", body: JSON.stringify(payload) }); },
   updateGroup(id, payload) { return request(`/groups/${id}`, { method: "PUT", body: JSON.stringify(payload) }); },
   deleteGroup(id) { return request(`/groups/${id}`, { method: "DELETE" }); },
@@ -126,6 +135,10 @@ const api = {
     const query = semester ? `?semester=${encodeURIComponent(semester)}` : "";
     return request(`/offered-modules/${query}`);
   },
+  // rooms that fit the offer (type, capacity, equipment), best fit first
+  getCandidateRooms(offeredModuleId) {
+    return request(`/offered-modules/${offeredModuleId}/candidate-rooms`);
+  },
   createOfferedModule(payload) {
     return request("/offered-modules/", { method: "POST", body: JSON.stringify(payload) });
   },
@@ -136,6 +149,19 @@ const api = {
     return request(`/offered-modules/${id}`, { method: "PUT", body: JSON.stringify(payload) });
   },
   //  SCHEDULE
+  // everything the timetable planner needs in one request; without semester the newest one is opened
+  getWorkspace(semester) {
+    const query = semester ? `?semester=${encodeURIComponent(semester)}` : "";
+    return request(`/workspace/${query}`);
+  },
+  // ranked free (day, start, room) placements for an offered module
+  getFreeSlots({ offeredModuleId, semester, duration, limit }) {
+    const params = new URLSearchParams({ offered_module_id: offeredModuleId });
+    if (semester) params.set("semester", semester);
+    if (duration) params.set("duration", duration);
+    if (limit) params.set("limit", limit);
+    return request(`/schedule/free-slots?${params.toString()}`);
+  },
   getSchedule(semester) {
     const query = semester ? `?semester=${encodeURIComponent(semester)}` : "";
     return request(`/schedule/${query}`);
@@ -146,6 +172,25 @@ const api = {
   deleteScheduleEntry(id) {
     return request(`/schedule/${id}`, { method: "DELETE" });
   },
+  solveSchedule(semester, { timeLimit, replace } = {}) {
+    const params = new URLSearchParams({ semester });
+    if (timeLimit) params.set("time_limit", timeLimit);
+    if (replace) params.set("replace", "true");
+    return request(`/schedule/solve?${params.toString()}`, { method: "POST" });
+  },
+  getInvalidEntries(semester, { lecturerId, constraintId } = {}) {
+    const params = new URLSearchParams({ semester });
+    if (lecturerId) params.set("lecturer_id", lecturerId);
+    if (constraintId) params.set("constraint_id", constraintId);
+    return request(`/schedule/invalid?${params.toString()}`);
+  },
+  repairSchedule(semester, { lecturerId, constraintId, timeLimit } = {}) {
+    const params = new URLSearchParams({ semester });
+    if (lecturerId) params.set("lecturer_id", lecturerId);
+    if (constraintId) params.set("constraint_id", constraintId);
+    if (timeLimit) params.set("time_limit", timeLimit);
+    return request(`/schedule/repair?${params.toString()}`, { method: "POST" });
+  },
 };
 
 export default api;
@@ -113,6 +113,7 @@ export default function ModuleOverview({ onNavigate }) {
     assessments: [{ type: "Written Exam", weight: 100 }],
     category: "Core",
     program_id: "",
+    equipment: "",
     specialization_ids: []
   });
 
@@ -198,6 +199,7 @@ export default function ModuleOverview({ onNavigate }) {
       assessments: [{ type: "Written Exam", weight: 100 }],
       category: "Core",
       program_id: "",
+      equipment: "",
       specialization_ids: []
     });
     setFormMode("add");
@@ -232,6 +234,7 @@ export default function ModuleOverview({ onNavigate }) {
       assessments: normalized,
       category: m.category || "Core",
       program_id: m.program_id ? String(m.program_id) : "",
+      equipment: m.equipment || "",
       specialization_ids: (m.specializations || []).map(s => s.id)
     });
 
@@ -363,6 +366,7 @@ export default function ModuleOverview({ onNavigate }) {
       assessment_type: (draft.assessments?.[0]?.type || draft.assessment_type || "Written Exam"),
       category: draft.category,
       program_id: draft.program_id ? safeInt(draft.program_id, null) : null,
+      equipment: draft.equipment.trim() || null,
       specialization_ids: draft.specialization_ids
     };
 
@@ -607,6 +611,15 @@ export default function ModuleOverview({ onNavigate }) {
                   )}
                 </select>
               </div>
+              <div style={{ ...styles.formGroup, flex: 1, minWidth: 240 }}>
+                <label style={styles.label}>Required Equipment</label>
+                <input
+                  style={styles.input}
+                  value={draft.equipment}
+                  onChange={(e) => setDraft({ ...draft, equipment: e.target.value })}
+                  placeholder="Projector, PC..."
+                />
+              </div>
             </div>
 
             <div style={styles.sectionBox}>
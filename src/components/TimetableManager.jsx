@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from "react";
+import React, { useState, useEffect, useCallback, useRef } from "react";
 import api from "../api";
 
 export default function TimetableManager() {
@@ -30,6 +30,8 @@ export default function TimetableManager() {
   const [semesterType, setSemesterType] = useState("Winter");
 
   const [newEntry, setNewEntry] = useState({ day: "", time: "", offered_module_id: "", room_id: "" });
+  const [candidateRooms, setCandidateRooms] = useState([]);
+  const [freeSlots, setFreeSlots] = useState([]);
 
   const daysOfWeek = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"];
   const hours = [
@@ -64,37 +66,29 @@ export default function TimetableManager() {
     setLoading(false);
   }, [selectedSemester]);
 
-  const loadDropdowns = useCallback(async () => {
-    if (!selectedSemester) return;
-    try {
-      const mods = await api.getOfferedModules(selectedSemester);
-      setOfferedModules(mods);
-      const r = await api.getRooms();
-      setRooms(r);
-    } catch (e) { console.error(e); }
-  }, [selectedSemester]);
+  // semester whose workspace is already on screen, so opening the default one doesn't fetch twice
+  const loadedSemester = useRef(null);
 
   useEffect(() => {
-    async function loadInitialData() {
+    if (selectedSemester && selectedSemester === loadedSemester.current) return;
+    async function loadWorkspace() {
+      setLoading(true);
       try {
-        const s = await api.getSemesters();
-        setSemesters(s);
-        if (s.length > 0) setSelectedSemester(s[0].name);
-        const l = await api.getLecturers();
-        setLecturers(l);
-        const g = await api.getGroups();
-        setGroups(g);
+        // one round-trip: semesters, schedule, offered modules, rooms, lecturers and groups
+        const w = await api.getWorkspace(selectedSemester);
+        loadedSemester.current = w.semester;
+        setSemesters(w.semesters);
+        setScheduleData(w.schedule);
+        setOfferedModules(w.offered_modules);
+        setRooms(w.rooms);
+        setLecturers(w.lecturers);
+        setGroups(w.groups);
+        if (!selectedSemester && w.semester) setSelectedSemester(w.semester);
       } catch (e) { console.error(e); }
+      setLoading(false);
     }
-    loadInitialData();
-  }, []);
-
-  useEffect(() => {
-    if (selectedSemester) {
-      loadSchedule();
-      loadDropdowns();
-    }
-  }, [selectedSemester, loadSchedule, loadDropdowns]);
+    loadWorkspace();
+  }, [selectedSemester]);
 
   // --- FILTRADO ---
   const getFilteredSchedule = () => {
@@ -129,15 +123,39 @@ export default function TimetableManager() {
   // --- HANDLERS ---
   const handleCellClick = (day, time) => {
     setNewEntry({ day, time, offered_module_id: "", room_id: "" });
+    setCandidateRooms([]);
+    setFreeSlots([]);
     setShowModal(true);
   };
 
+  // suitable rooms come first, preselecting the best fit
+  const selectModule = async (offeredModuleId) => {
+    setNewEntry(prev => ({ ...prev, offered_module_id: offeredModuleId, room_id: "" }));
+    setCandidateRooms([]);
+    setFreeSlots([]);
+    if (!offeredModuleId) return;
+    try {
+      const [candidates, slots] = await Promise.all([
+        api.getCandidateRooms(offeredModuleId),
+        // sessions on this grid are one hour long
+        api.getFreeSlots({ offeredModuleId, semester: selectedSemester, duration: 60, limit: 5 }),
+      ]);
+      setCandidateRooms(candidates);
+      setFreeSlots(slots);
+      if (candidates.length > 0) setNewEntry(prev => ({ ...prev, room_id: String(candidates[0].id) }));
+    } catch (e) { console.error(e); }
+  };
+
+  const pickFreeSlot = (slot) => {
+    setNewEntry(prev => ({ ...prev, day: slot.day_of_week, time: slot.start_time, end: slot.end_time, room_id: String(slot.room_id) }));
+  };
+
   const handleSave = async () => {
     if (!newEntry.offered_module_id || !newEntry.room_id) return alert("Select module and room");
     try {
       const startHour = parseInt(newEntry.time.split(":")[0]);
       const endHour = startHour + 1;
-      const endTime = `${endHour < 10 ? '0' : ''}${endHour}:00`;
+      const endTime = newEntry.end || `${endHour < 10 ? '0' : ''}${endHour}:00`;
       await api.createScheduleEntry({
         offered_module_id: newEntry.offered_module_id,
         room_id: newEntry.room_id,
@@ -472,9 +490,21 @@ export default function TimetableManager() {
             <h3 style={{ marginTop: 0, marginBottom: "20px", color: "#343a40" }}>Schedule Class</h3>
             <p style={{marginBottom:"20px", color: "#6c757d"}}><strong>{newEntry.day}</strong> at <strong>{newEntry.time}</strong></p>
             <label style={{display:"block", marginBottom:"6px", fontWeight:"600"}}>Module</label>
-            <select style={{width:"100%", padding:"10px", marginBottom:"20px", borderRadius:"6px", border:"1px solid #ced4da"}} value={newEntry.offered_module_id} onChange={e => setNewEntry({...newEntry, offered_module_id: e.target.value})}><option value="">-- Select Module --</option>{offeredModules.map(m => <option key={m.id} value={m.id}>{m.module_name} ({m.lecturer_name})</option>)}</select>
+            <select style={{width:"100%", padding:"10px", marginBottom:"20px", borderRadius:"6px", border:"1px solid #ced4da"}} value={newEntry.offered_module_id} onChange={e => selectModule(e.target.value)}><option value="">-- Select Module --</option>{offeredModules.map(m => <option key={m.id} value={m.id}>{m.module_name} ({m.lecturer_name})</option>)}</select>
+            {freeSlots.length > 0 && (
+              <div style={{ marginBottom: "20px" }}>
+                <label style={{display:"block", marginBottom:"6px", fontWeight:"600"}}>Free Slots</label>
+                <div style={{ display: "flex", flexWrap: "wrap", gap: "6px" }}>
+                  {freeSlots.map(s => (
+                    <button key={`${s.day_of_week}-${s.start_time}-${s.room_id}`} onClick={() => pickFreeSlot(s)} title={s.cohort_conflict ? "Clashes with another session of this cohort" : ""} style={{ padding: "4px 8px", fontSize: "0.8rem", background: s.cohort_conflict ? "#fff3cd" : "#e7f1ff", border: "1px solid #ced4da", borderRadius: "4px", cursor: "pointer" }}>
+                      {s.day_of_week.slice(0, 3)} {s.start_time} · {s.room_name}
+                    </button>
+                  ))}
+                </div>
+              </div>
+            )}
             <label style={{display:"block", marginBottom:"6px", fontWeight:"600"}}>Room</label>
-            <select style={{width:"100%", padding:"10px", marginBottom:"30px", borderRadius:"6px", border:"1px solid #ced4da"}} value={newEntry.room_id} onChange={e => setNewEntry({...newEntry, room_id: e.target.value})}><option value="">-- Select Room --</option>{rooms.map(r => <option key={r.id} value={r.id}>{r.name}</option>)}</select>
+            <select style={{width:"100%", padding:"10px", marginBottom:"30px", borderRadius:"6px", border:"1px solid #ced4da"}} value={newEntry.room_id} onChange={e => setNewEntry({...newEntry, room_id: e.target.value})}><option value="">-- Select Room --</option>{candidateRooms.length > 0 ? (<><optgroup label="Suitable">{candidateRooms.map(r => <option key={r.id} value={r.id}>{r.name} ({r.capacity})</option>)}</optgroup><optgroup label="Other">{rooms.filter(r => !candidateRooms.some(c => c.id === r.id)).map(r => <option key={r.id} value={r.id}>{r.name}</option>)}</optgroup></>) : rooms.map(r => <option key={r.id} value={r.id}>{r.name}</option>)}</select>
             <div style={{ textAlign: "right", display: "flex", justifyContent: "flex-end", gap: "10px" }}><button onClick={() => setShowModal(false)} style={{ padding: "10px 20px", background: "white", border: "1px solid #ced4da", borderRadius:"6px", cursor: "pointer" }}>Cancel</button><button onClick={handleSave} style={{ padding: "10px 24px", background: "#2b4a8e", color: "white", border: "none", borderRadius:"6px", cursor: "pointer", fontWeight: "600" }}>Save Class</button></div>
           </div>
         </div>
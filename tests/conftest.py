@@ -0,0 +1,42 @@
+# tests/conftest.py
+"""
+Set before any api module is imported, since they read the environment once:
+every test runs against a throwaway SQLite file (the query budget test drops
+every table of DATABASE_URL), with statement budgets enforced and the
+token-version cache off, as in benchmarks/query_budget_check.py.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='icss-tests-'), 'test.db')}"
+os.environ["QUERY_BUDGET_MODE"] = "enforce"
+os.environ["TOKEN_VERSION_TTL"] = "0"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def client():
+    """A TestClient on a freshly generated small data set (benchmarks/dataset.py), rebuilt per test module."""
+    from fastapi.testclient import TestClient
+
+    from api.index import app
+    from benchmarks import dataset
+
+    dataset.build("small", reset=True)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def login(client):
+    """login(email) -> Authorization headers for one of the generated users."""
+    from benchmarks import dataset
+
+    def _login(email: str) -> dict:
+        r = client.post("/auth/login", json={"email": email, "password": dataset.PASSWORD})
+        assert r.status_code == 200, r.text
+        return {"Authorization": f"Bearer {r.json()['access_token']}"}
+    return _login
@@ -0,0 +1,56 @@
+# tests/test_availability.py
+"""WeekMask (api/availability.py) and its per-row, per-version cache."""
+from types import SimpleNamespace
+
+from api.availability import WeekMask, mask_for, forget
+
+MONDAY, TUESDAY = 0, 1
+
+
+def _week(**days):
+    return {day: {"is_available": True, "ranges": [{"start": s, "end": e} for s, e in ranges]}
+            for day, ranges in days.items()}
+
+
+def test_no_data_means_no_restriction():
+    assert WeekMask.from_schedule(None) == WeekMask.full()
+    assert WeekMask.from_schedule({}) == WeekMask.full()
+
+
+def test_only_fully_covered_quarter_hours_count():
+    mask = WeekMask.from_schedule(_week(Monday=[("08:10", "10:00")]))
+    assert mask.contains(WeekMask.slot(MONDAY, 8 * 60 + 15, 10 * 60))
+    assert not mask.contains(WeekMask.slot(MONDAY, 8 * 60, 9 * 60))
+    assert not mask.overlaps(WeekMask.slot(TUESDAY, 8 * 60 + 15, 10 * 60))
+
+
+def test_slot_covers_every_touched_quarter_hour():
+    assert WeekMask.slot(MONDAY, 9 * 60 + 5, 9 * 60 + 20) == WeekMask.slot(MONDAY, 9 * 60, 9 * 60 + 30)
+
+
+def test_unavailable_days_and_bad_ranges_are_skipped():
+    data = _week(Monday=[("09:00", "12:00"), ("nonsense", "13:00")])
+    data["Tuesday"] = {"is_available": False, "ranges": [{"start": "09:00", "end": "12:00"}]}
+    mask = WeekMask.from_schedule(data)
+    assert mask == WeekMask.slot(MONDAY, 9 * 60, 12 * 60)
+
+
+def test_set_operations():
+    morning, late = WeekMask.slot(MONDAY, 8 * 60, 12 * 60), WeekMask.slot(MONDAY, 11 * 60, 14 * 60)
+    assert (morning & late) == WeekMask.slot(MONDAY, 11 * 60, 12 * 60)
+    assert (morning | late) == WeekMask.slot(MONDAY, 8 * 60, 14 * 60)
+    assert not (morning & ~morning)
+    assert (morning | ~morning) == WeekMask.full()
+
+
+def test_cache_follows_the_row_version():
+    row = SimpleNamespace(id=-1, version=1, schedule_data=_week(Monday=[("09:00", "10:00")]))
+    try:
+        first = mask_for(row)
+        row.schedule_data = _week(Tuesday=[("09:00", "10:00")])
+        assert mask_for(row) is first  # same version: the cached mask, without re-parsing
+        row.version = 2
+        assert mask_for(row) == WeekMask.slot(TUESDAY, 9 * 60, 10 * 60)
+    finally:
+        forget(row.id)
+    assert mask_for(None) == WeekMask.full()
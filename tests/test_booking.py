@@ -0,0 +1,46 @@
+# tests/test_booking.py
+"""SlotIndex (api/booking.py) against a brute-force overlap check."""
+import random
+
+from api.booking import SlotIndex
+from api.timeutils import fmt_minutes
+
+SEMESTER = "Test Winter"
+
+
+def _random_slot(rng):
+    start = rng.randrange(8 * 60, 19 * 60, 15)
+    return start, start + rng.choice((15, 45, 90, 180))
+
+
+def test_conflict_matches_brute_force():
+    rng = random.Random(7)
+    index = SlotIndex()
+    booked = []
+    for _ in range(2000):
+        room_id, day = rng.randrange(3), rng.choice(("Monday", "Tuesday"))
+        start, end = _random_slot(rng)
+        expected = any(r == room_id and d == day and s < end and start < e for r, d, s, e in booked)
+        found = index.conflict(SEMESTER, day, fmt_minutes(start), fmt_minutes(end), room_id=room_id)
+        assert (found == "room") == expected
+        # stored data may already overlap, so add every interval, not just the free ones
+        index.add(SEMESTER, day, fmt_minutes(start), fmt_minutes(end), room_id=room_id)
+        booked.append((room_id, day, start, end))
+
+
+def test_touching_sessions_do_not_conflict():
+    index = SlotIndex()
+    index.add(SEMESTER, "Monday", "08:00", "09:30", room_id=1, lecturer_id=5)
+    index.add(SEMESTER, "Monday", "09:30", "11:00", room_id=1)
+    assert index.conflict(SEMESTER, "Monday", "11:00", "12:00", room_id=1) is None
+    assert index.conflict(SEMESTER, "Monday", "07:00", "08:00", room_id=1) is None
+    assert index.conflict(SEMESTER, "Monday", "10:45", "11:15", room_id=1) == "room"
+    assert index.conflict(SEMESTER, "Monday", "09:00", "09:15", room_id=2, lecturer_id=5) == "lecturer"
+    assert index.conflict(SEMESTER, "Tuesday", "09:00", "09:15", room_id=1, lecturer_id=5) is None
+
+
+def test_intervals_stay_merged():
+    index = SlotIndex()
+    for start, end in (("10:00", "11:00"), ("08:00", "09:00"), ("08:30", "10:00"), ("12:00", "13:00")):
+        index.add(SEMESTER, "Monday", start, end, room_id=1)
+    assert index._intervals[("room", 1, SEMESTER, "Monday")] == [("08:00", "11:00"), ("12:00", "13:00")]
@@ -0,0 +1,32 @@
+# tests/test_dbpool.py
+"""The per-instance connection budget split between the sync and async engines (api/dbpool.py)."""
+import pytest
+
+from api import dbpool
+
+URL = "postgresql://user@localhost/icss"
+
+
+def _budget(label):
+    options = dbpool.engine_options(URL, label, {})
+    return options["pool_size"], options["max_overflow"]
+
+
+@pytest.mark.parametrize("size,overflow", [(2, 0), (3, 1), (5, 5), (10, 3)])
+def test_engines_never_exceed_the_instance_budget(monkeypatch, size, overflow):
+    monkeypatch.setattr(dbpool, "POOL_MODE", "queue")
+    monkeypatch.setattr(dbpool, "POOL_SIZE", size)
+    monkeypatch.setattr(dbpool, "MAX_OVERFLOW", overflow)
+    sync, async_ = _budget("sync"), _budget("async")
+    assert sync[0] >= 1 and async_[0] >= 1
+    assert sync[0] + async_[0] == size
+    assert sync[1] + async_[1] == overflow
+
+
+@pytest.mark.parametrize("size,overflow", [(1, 5), (0, 0), (5, -1)])
+def test_budgets_that_cannot_be_split_are_rejected(monkeypatch, size, overflow):
+    monkeypatch.setattr(dbpool, "POOL_MODE", "queue")
+    monkeypatch.setattr(dbpool, "POOL_SIZE", size)
+    monkeypatch.setattr(dbpool, "MAX_OVERFLOW", overflow)
+    with pytest.raises(ValueError):
+        dbpool.engine_options(URL, "sync", {})
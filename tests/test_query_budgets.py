@@ -0,0 +1,17 @@
+# tests/test_query_budgets.py
+"""
+SQL statement budgets (api/query_budget.py) on the small generated data set.
+
+Runs benchmarks.query_budget_check.exercise() in QUERY_BUDGET_MODE=enforce against
+the temporary SQLite file set up in tests/conftest.py, so a route that goes over
+its budget, has no budget or is never exercised fails the test run. The growth
+check between data set sizes stays in the script (python -m
+benchmarks.query_budget_check).
+"""
+from benchmarks import query_budget_check as check
+
+
+def test_routes_stay_within_their_statement_budget():
+    counts, failures = check.run("small")
+    failures += check.coverage_failures(counts)
+    assert not failures, "\n".join(failures)
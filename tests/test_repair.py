@@ -0,0 +1,94 @@
+# tests/test_repair.py
+"""Re-validation and local repair after an availability change (api/repair.py)."""
+import time
+
+import pytest
+from sqlalchemy import func
+
+from api import models, repair
+from api.availability import WeekMask
+from api.database import SessionLocal
+from benchmarks import dataset
+
+MORNINGS = {day: {"is_available": True, "ranges": [{"start": "08:00", "end": "12:00"}]}
+            for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday")}
+
+
+@pytest.fixture
+def db(client):
+    session = SessionLocal()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def lecturer_id(db):
+    """The lecturer with the most sessions, restricted to weekday mornings."""
+    E, O = models.ScheduleEntry, models.OfferedModule
+    lecturer_id = (
+        db.query(O.lecturer_id).join(E, E.offered_module_id == O.id)
+        .filter(E.semester == dataset.SEMESTER, O.lecturer_id.isnot(None))
+        .group_by(O.lecturer_id).order_by(func.count(E.id).desc()).first()[0]
+    )
+    db.query(models.LecturerAvailability).filter(models.LecturerAvailability.lecturer_id == lecturer_id).delete()
+    db.add(models.LecturerAvailability(lecturer_id=lecturer_id, schedule_data=MORNINGS))
+    db.flush()
+    return lecturer_id
+
+
+def _rows(found):
+    return {row.id: row for row in found.rows}
+
+
+def test_check_reports_exactly_the_entries_outside_availability(db, lecturer_id):
+    found = repair.check(db, dataset.SEMESTER, lecturer_id=lecturer_id)
+    mornings = WeekMask.from_schedule(MORNINGS)
+    for row in found.rows:
+        if row.lecturer_id != lecturer_id:
+            assert row.id not in found.invalid
+            continue
+        day, start, end = repair._slot(row)
+        outside = not mornings.contains(WeekMask.slot(day, start, end))
+        assert (row.id in found.invalid) == outside, row
+    assert found.invalid
+
+
+def test_repair_moves_entries_into_free_valid_slots(db, lecturer_id):
+    found = repair.check(db, dataset.SEMESTER, lecturer_id=lecturer_id)
+    placements, unplaced = repair.repair(db, found, time_limit=5)
+    assert set(placements) | set(unplaced) == set(found.invalid)
+    assert placements
+    assert not set(placements) & set(unplaced)
+
+    rows = _rows(found)
+    mornings = WeekMask.from_schedule(MORNINGS)
+    busy = {}  # (lecturer or room, day) -> intervals of every entry that stays or moves
+    for row in found.rows:
+        day, start, end = placements.get(row.id, repair._slot(row))[:3]
+        room_id = placements[row.id][3] if row.id in placements else row.room_id
+        for key in (("L", row.lecturer_id), ("R", room_id)):
+            if key[1] is not None:
+                busy.setdefault((key, day), []).append((start, end, row.id))
+    for entry_id, (day, start, end, room_id) in placements.items():
+        row = rows[entry_id]
+        old_day, old_start, old_end = repair._slot(row)
+        assert end - start == old_end - old_start
+        assert mornings.contains(WeekMask.slot(day, start, end))
+        for key in (("L", row.lecturer_id), ("R", room_id)):
+            assert not any(s < end and start < e and other != entry_id
+                           for s, e, other in busy.get((key, day), ())), (entry_id, key)
+
+
+def test_repair_stops_at_the_deadline(db, lecturer_id):
+    found = repair.check(db, dataset.SEMESTER, lecturer_id=lecturer_id)
+    started = time.monotonic()
+    placements, unplaced = repair.repair(db, found, time_limit=0.1)
+    assert time.monotonic() - started < 2
+    assert set(placements) | set(unplaced) == set(found.invalid)
+
+
+def test_nothing_to_repair_without_a_change(db):
+    found = repair.check(db, dataset.SEMESTER, lecturer_id=-1)
+    assert not found.invalid
+    assert repair.repair(db, found) == ({}, {})
@@ -0,0 +1,50 @@
+# tests/test_solver.py
+"""Constraint handling of the solver (api/solver.py) on compiled rules, without a database."""
+import itertools
+
+from api import constraint_compiler as cc
+from api import solver
+from api.availability import WeekMask
+
+
+_ids = itertools.count(1)
+
+
+def _rule(kind, scope, target=None, **fields):
+    return kind(id=next(_ids), category=kind.__name__, scope=scope, target=target,
+                valid_from=None, valid_to=None, **fields)
+
+
+def _slots(rules, module_code="M1", lecturer_id=7, program_id=3):
+    policy = solver.read_policy(rules)
+    duration = policy.duration_for(module_code, lecturer_id, program_id)
+    return duration, solver.candidate_slots(policy, duration, WeekMask.full(), solver.slot_constraints(rules),
+                                            lecturer_id, module_code, program_id)
+
+
+def test_specific_duration_overrides_the_global_rule():
+    everyone = _rule(cc.FixedDuration, "module", minutes=180)
+    for override in (_rule(cc.FixedDuration, "module", "M1", minutes=90),
+                     _rule(cc.FixedDuration, "lecturer", "7", minutes=90),
+                     _rule(cc.FixedDuration, "program", "3", minutes=90)):
+        duration, slots = _slots([everyone, override])
+        assert duration == 90
+        assert slots and all(end - start == 90 for _, start, end in slots)
+
+
+def test_duration_precedence():
+    rules = [_rule(cc.FixedDuration, "module", minutes=180), _rule(cc.FixedDuration, "program", "3", minutes=120),
+             _rule(cc.FixedDuration, "lecturer", "7", minutes=60)]
+    policy = solver.read_policy(rules + [_rule(cc.FixedDuration, "module", "M1", minutes=45)])
+    assert policy.duration_for("M1", 7, 3) == 45
+    policy = solver.read_policy(rules)
+    assert policy.duration_for("M1", 7, 3) == 60
+    assert policy.duration_for("M1", 8, 3) == 120
+    assert policy.duration_for("M1", 8, 4) == 180
+    assert solver.read_policy([]).duration_for("M1") == solver.DEFAULT_SLOT_MINUTES
+
+
+def test_slot_rules_still_apply():
+    rules = [_rule(cc.UnavailableDays, "lecturer", "7", days=frozenset({0, 1}))]
+    _, slots = _slots(rules)
+    assert slots and {day for day, _, _ in slots} == {2, 3, 4}
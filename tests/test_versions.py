@@ -0,0 +1,80 @@
+# tests/test_versions.py
+"""Schedule version counters (api/versions.py) as the ETag of GET /schedule/."""
+import pytest
+
+from api import models, versions
+from api.database import SessionLocal
+from benchmarks import dataset
+
+OTHER_SEMESTER = "Versions Test Semester"
+
+
+@pytest.fixture(scope="module")
+def ids(client):
+    db = SessionLocal()
+    try:
+        return {
+            "offer": db.query(models.OfferedModule.id).filter(models.OfferedModule.semester == dataset.SEMESTER).first()[0],
+            "room": db.query(models.Room.id).first()[0],
+        }
+    finally:
+        db.close()
+
+
+def _tag(client, semester=dataset.SEMESTER):
+    r = client.get("/schedule/", params={"semester": semester})
+    assert r.status_code == 200
+    return r.headers["ETag"]
+
+
+def _entry(ids, start, semester=dataset.SEMESTER):
+    return {"offered_module_id": ids["offer"], "day_of_week": "Sunday", "start_time": start,
+            "end_time": f"{int(start[:2]) + 1:02d}:00", "semester": semester}
+
+
+def test_unchanged_schedule_answers_304(client):
+    tag = _tag(client)
+    r = client.get("/schedule/", params={"semester": dataset.SEMESTER}, headers={"If-None-Match": tag})
+    assert r.status_code == 304 and r.headers["ETag"] == tag
+    assert _tag(client) == tag
+
+
+def test_orm_writes_bump_the_semester(client, login, ids):
+    tag = _tag(client)
+    r = client.post("/schedule/", json=_entry(ids, "07:00"))
+    assert r.status_code == 200, r.text
+    assert _tag(client) != tag
+    tag = _tag(client)
+    assert client.delete(f"/schedule/{r.json()['id']}", headers=login("pm@bench.icss")).status_code in (200, 204)
+    assert _tag(client) != tag
+
+
+def test_bulk_insert_bumps_the_semester(client, login, ids):
+    tag = _tag(client)
+    r = client.post("/schedule/bulk", headers=login("pm@bench.icss"), json=[_entry(ids, "18:00")])
+    assert r.json()["created"] == 1, r.text
+    assert _tag(client) != tag
+
+
+def test_writes_to_another_semester_keep_the_tag(client, ids):
+    tag = _tag(client)
+    assert client.post("/schedule/", json=_entry(ids, "07:00", OTHER_SEMESTER)).status_code == 200
+    assert _tag(client) == tag
+    assert _tag(client, OTHER_SEMESTER) != tag
+
+
+def test_catalogue_changes_bump_every_semester(client, login, ids):
+    tags = _tag(client), _tag(client, OTHER_SEMESTER)
+    r = client.put(f"/rooms/{ids['room']}", headers=login("pm@bench.icss"), json={"name": "Renamed Room"})
+    assert r.status_code == 200, r.text
+    assert _tag(client) != tags[0] and _tag(client, OTHER_SEMESTER) != tags[1]
+
+
+def test_matches():
+    assert versions.matches('W/"3.1"', 'W/"3.1"')
+    assert versions.matches('"3.1"', 'W/"3.1"')
+    assert versions.matches('W/"2.1", W/"3.1"', 'W/"3.1"')
+    assert versions.matches("*", 'W/"3.1"')
+    assert not versions.matches('W/"2.1"', 'W/"3.1"')
+    assert not versions.matches(None, 'W/"3.1"')
+
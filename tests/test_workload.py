@@ -0,0 +1,62 @@
+# tests/test_workload.py
+"""Teaching load parsing and the scheduled minutes per lecturer (api/workload.py)."""
+import pytest
+from sqlalchemy import insert, select
+
+from api import migrations, models, workload
+from api.database import SessionLocal, get_engine
+from benchmarks import dataset
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("18 SWS", (810, 810)),
+    ("12-16 SWS", (540, 720)),
+    ("16 bis 12 sws", (540, 720)),
+    ("20 h", (1200, 1200)),
+    ("7,5 Stunden", (450, 450)),
+    ("9", (405, 405)),
+    ("50 %", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_teaching_load(text, expected):
+    assert workload.parse_teaching_load(text) == expected
+
+
+def test_status_allows_the_tolerance_around_the_target():
+    target = (600, 600)
+    assert workload.status(660, target) == "ok"
+    assert workload.status(661, target) == "over"
+    assert workload.status(539, target) == "under"
+    assert workload.status(0, None) == "unknown"
+
+
+def _minutes_of(db, lecturer_id):
+    return next(r.minutes for r in db.execute(workload.statement(dataset.SEMESTER)) if r.id == lecturer_id)
+
+
+def test_legacy_and_malformed_times(client):
+    db = SessionLocal()
+    try:
+        offer_id, lecturer_id = db.execute(
+            select(models.OfferedModule.id, models.OfferedModule.lecturer_id)
+            .where(models.OfferedModule.semester == dataset.SEMESTER, models.OfferedModule.lecturer_id.isnot(None))
+        ).first()
+        before = _minutes_of(db, lecturer_id)
+        entry = {"offered_module_id": offer_id, "day_of_week": "Sunday", "semester": dataset.SEMESTER}
+        db.execute(insert(models.ScheduleEntry), [
+            {**entry, "start_time": "9:00", "end_time": "10:30"},
+            {**entry, "start_time": "noon", "end_time": "13:00"},
+        ])
+        db.commit()
+        # neither time is in the HH:MM form yet: both rows count as no duration instead of raising
+        assert _minutes_of(db, lecturer_id) == before
+
+        migrations.normalize_schedule_times(get_engine())
+        assert _minutes_of(db, lecturer_id) == before + 90
+        times = db.execute(select(models.ScheduleEntry.start_time).where(
+            models.ScheduleEntry.day_of_week == "Sunday", models.ScheduleEntry.offered_module_id == offer_id
+        )).scalars().all()
+        assert sorted(times) == ["09:00", "noon"]
+    finally:
+        db.close()
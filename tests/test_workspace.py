@@ -0,0 +1,46 @@
+# tests/test_workspace.py
+"""GET /workspace/ shows lecturers and groups with the same role rules as GET /lecturers/."""
+import pytest
+
+from api import auth, models
+from api.database import SessionLocal
+from benchmarks import dataset
+
+
+@pytest.fixture(scope="module")
+def student(client):
+    db = SessionLocal()
+    try:
+        db.add(models.User(email="student@bench.icss", password_hash=auth.get_password_hash(dataset.PASSWORD),
+                           role="student"))
+        db.commit()
+    finally:
+        db.close()
+    return "student@bench.icss"
+
+
+def _workspace(client, headers):
+    r = client.get("/workspace/", headers=headers, params={"semester": dataset.SEMESTER})
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def test_planners_see_every_lecturer_and_group(client, login):
+    for email in ("pm@bench.icss", "hosp@bench.icss"):
+        data = _workspace(client, login(email))
+        assert len(data["lecturers"]) == len(client.get("/lecturers/", headers=login(email)).json())
+        assert data["groups"]
+
+
+def test_lecturer_sees_only_their_own_entry(client, login):
+    headers = login("lecturer@bench.icss")
+    data = _workspace(client, headers)
+    own = client.get("/lecturers/", headers=headers).json()
+    assert [l["id"] for l in data["lecturers"]] == [l["id"] for l in own] and len(own) == 1
+    assert data["groups"] == []
+
+
+def test_other_roles_get_no_lecturers_or_groups(client, login, student):
+    data = _workspace(client, login(student))
+    assert data["lecturers"] == [] and data["groups"] == []
+    assert data["schedule"]  # the timetable itself stays readable